@@ -2,10 +2,9 @@
 """Data Analysis"""
 import datetime as dt
 import tkinter as tk
-from functools import singledispatchmethod
 from os import path
 from tkinter import filedialog
-from typing import Iterator, Literal, Union
+from typing import Iterator, Literal
 
 import matplotlib.backends.backend_tkagg as tkagg
 import matplotlib.dates as mdates
@@ -18,15 +17,15 @@ import ttkbootstrap as ttk
 import yaml
 from matplotlib import rcParams
 from matplotlib.widgets import SpanSelector
-from scipy.signal import savgol_filter
 from tksheet import Sheet
 from ttkbootstrap import font
 # from ttkbootstrap.constants import *
 from ttkbootstrap.dialogs import Messagebox
 
-import func_numba as fnb
+from analysis import Model
+from reader import clean_name
 from utils import (APP_PATH, Checklist, CollapsingFrame, Menubar, MyTree, PlaceholderEntry,
-                   ScrollFrame, Slider, Statusbar, all_children, read_functions, retag)
+                   ScrollFrame, Slider, Statusbar, all_children, retag)
 
 # plt.style.use('seaborn')
 rcParams["date.epoch"] = "2022-01-01T00:00:00"
@@ -36,6 +35,35 @@ rcParams["date.autoformatter.minute"] = "%d-%H:%M:%S"
 rcParams["date.autoformatter.second"] = "%d-%H:%M:%S"
 rcParams["axes.autolimit_mode"] = "round_numbers"
 
+FOLLOW_MS = 2000  # follow mode polling period
+
+
+def parse_threshold(text: str) -> float | tuple[float, float, float]:
+    """Return the cycle threshold typed by the user (also fractional):
+    "on", "on/off" (hysteresis) or "on/off/dwell" (dwell in seconds)\n
+    Raises:
+        TypeError: if not finite numbers"""
+    values = []
+    for value in text.split("/"):
+        try:
+            values.append(float(value.strip().replace(",", ".")))
+        except ValueError:
+            raise TypeError("Inserire valori numerici")
+    if len(values) > 3 or not np.isfinite(values).all():
+        raise TypeError("Inserire valori numerici")
+    if len(values) == 1:
+        return values[0]
+    return values[0], values[1], values[2] if len(values) == 3 else 0
+
+
+def format_threshold(cycle: dict) -> str:
+    """Cycle threshold of 'Model.cycle_data' as typed by the user"""
+    if cycle["min_dwell"] > 0:
+        return f"{cycle['threshold']:g}/{cycle['off_threshold']:g}/{cycle['min_dwell']:g}"
+    if cycle["off_threshold"] != cycle["threshold"]:
+        return f"{cycle['threshold']:g}/{cycle['off_threshold']:g}"
+    return f"{cycle['threshold']:g}"
+
 
 class DataAnalysis(ttk.Window):
     """# GUI generale dell'applicazione"""
@@ -383,7 +411,7 @@ class View(ttk.Frame):
 
         self.col_frm = Checklist(option_tab, filter=True)
         self.col_frm.grid(row=0, column=0, rowspan=2, pady=5, padx=5, sticky="nsew")
-        ttk.Label(option_tab, text="Soglie:", anchor="nw").grid(
+        ttk.Label(option_tab, text="Soglie (on/off/s):", anchor="nw").grid(
             row=0, column=1, sticky="new", pady=5, padx=5
         )
         self.soglie_txt = ttk.Text(option_tab, width=10, height=13)
@@ -413,6 +441,14 @@ class View(ttk.Frame):
             state="disabled",
         )
         self.analysis_btn.grid(row=2, column=2, rowspan=2, ipady=15, padx=60)
+        self.sweep_btn = ttk.Button(
+            option_tab,
+            text="SWEEP SOGLIA",
+            command=self._sweep_btn_click,
+            width=18,
+            bootstyle="info-bold",
+        )
+        self.sweep_btn.grid(row=4, column=2, ipady=15, padx=60)
 
         # ## ----- DISTRIBUTION TAB ----- ## #
         self.distr_tab = DataDistribution(lifetest)
@@ -431,6 +467,10 @@ class View(ttk.Frame):
         if self.controller:
             self.controller.cicli()
 
+    def _sweep_btn_click(self):
+        if self.controller:
+            self.controller.threshold_sweep()
+
     def _analysis_lt_click(self):
         # TODO ttk.Floodgauge()
         if self.controller:
@@ -840,7 +880,7 @@ class LT_ExportOpt(ttk.Toplevel):
         cicli_frm.grid(row=2, column=0, columnspan=5, pady=(10, 0), padx=5, sticky="ew")
 
         ttk.Label(cicli_frm, text="Colonna calcolo cicli (str)").grid(row=0, column=0)
-        ttk.Label(cicli_frm, text="Valore soglia cicli (int)").grid(
+        ttk.Label(cicli_frm, text="Valore soglia cicli (on/off/s)").grid(
             row=1, column=0, sticky="ew", pady=2
         )
         row_ = self.parent.cicli_result_tv.selection()
@@ -848,7 +888,7 @@ class LT_ExportOpt(ttk.Toplevel):
         selected_col: str = val_[0] if val_ != "" else None
         if selected_col is not None:
             cycle_data = self.parent.controller.model.cycle_data
-            selected_soglia = cycle_data[selected_col]["threshold"]
+            selected_soglia = format_threshold(cycle_data[selected_col])
         else:
             selected_soglia = None
         self.col_cicli = tk.StringVar(value=selected_col)
@@ -887,6 +927,14 @@ class LT_ExportOpt(ttk.Toplevel):
         self.module_cmb["state"] = "disabled"
         self.module_cmb.grid(row=3, column=1, pady=5)
 
+        self.cycle_table = tk.BooleanVar(value=False)
+        ttk.Checkbutton(
+            merge_frm,
+            text="Cycles table (stats of data option)",
+            variable=self.cycle_table,
+            bootstyle="round-toggle",
+        ).grid(row=4, column=0, columnspan=4, sticky="w", pady=5)
+
         # ##----------------Distribution option----------------
         distr_frm = ttk.Labelframe(self, padding="5", text="Distribution Option")
         distr_frm.grid(row=4, column=0, columnspan=5, pady=(10, 0), padx=5, sticky="ew")
@@ -954,6 +1002,7 @@ class TH_TimeSerie(ttk.Frame):
         self.span = None
         self.x_data = None
         self.x_index = None
+        self.smooth = False
         self.fixed_span = False
         self.graph_option = Graph_Option(self.fig, self.ax1, self.ax2)
 
@@ -1082,6 +1131,7 @@ class TH_TimeSerie(ttk.Frame):
         self.span = None
         self.x_data = None
         self.x_index = None
+        self.smooth = False
         self.graph_option = Graph_Option(self.fig, self.ax1, self.ax2)
 
     def update(self):
@@ -1090,610 +1140,6 @@ class TH_TimeSerie(ttk.Frame):
         # fig.canvas.flush_events()
 
 
-class Model:
-    """Classe Model\n
-    interagisce (r/w) con il database/data,
-    verifica che i dati di ingresso siano corretti"""
-
-    def __init__(self, filename: str | None):
-        self.filenames = filename
-        self.df: pd.DataFrame | None = None  # read data
-        self.df_rev: pd.DataFrame | None = None  # read revision data
-        self.df_lt: pd.DataFrame | None = None  # clean cycle data
-        self.cycle_data: dict = {}
-        self.lifetest_analyzed: dict = {"distr": {}, "NaN": {}, "timeseries": {}}
-        self.span_data = {}
-
-    def file_to_read(self, revision: bool = False) -> tuple[str] | None:
-        """Get files names from directory\n
-        - Args: revision (bool, optional): Defaults to False.
-            - 'False' ask for a RAW file
-            - 'True' ask for an elaborated file\n
-        Returns:
-            tuple(str): iterator of file path"""
-        if revision:
-            fileoption = dict(
-                title="Please select elaborated file:",
-                filetypes=[
-                    ("Output file", [".xlsx", ".parquet"]),
-                    ("Data Distribution (Excel)", "*.xlsx"),
-                    ("Time Series (parquet)", "*.parquet"),
-                    ("All files", "*.*"),
-                ],
-            )
-        else:
-            fileoption = dict(
-                title="Please select a RAW file:",
-                defaultextension="*.xl*",
-                filetypes=[
-                    ("All files", "*.*"),
-                    ("Text File", ["*.txt", "*.log"]),
-                    ("CVS (tab separator)", ["*.cvs", ".xls"]),
-                    ("CVS (comma separator)", "*.cvs"),
-                    ("All Excel files", "*.xl*"),
-                ],
-            )
-
-        files = filedialog.askopenfilenames(**fileoption)
-        self.filenames = files if isinstance(files, tuple) else (files,)
-        return self.filenames
-
-    def file_typectrl(self, filepath: str, revision: bool = False):
-        """Check if the selected file has the correct extension\n
-        Args:
-            - filepath (str): str filepath
-            - revision (bool, optional): Defaults to None.
-                - 'False' RAW file
-                - 'True' elaborated file"""
-        if revision:
-            filextension = ("xlsx", "parquet")
-        else:
-            filextension = ("xls", "xlsx", "xlsm", "xlsb", "odf", "ods", "odt", "txt", "csv", "log")
-
-        if filepath.lower().endswith(filextension):
-            pass
-        else:
-            self.filenames = None
-            raise ValueError(
-                "Invalid file extension\n" + "Select from:\n" + ", ".join(filextension)
-            )
-
-    def read_file(self, filepath: str, revision: bool = False):
-        """Return pandas.Dataframe from a file in filepath\n
-        - Args: revision (bool, optional): Defaults to False.
-            - 'False' apre un file grezzo.
-            - 'True' open a revision file based on its extension"""
-        if revision:
-            try:
-                if filepath.endswith(".xlsx"):
-                    temp_df = pd.read_excel(
-                        io=filepath,
-                        sheet_name=0,
-                        index_col=0,
-                        skipfooter=1,
-                    )
-                elif filepath.endswith(".parquet"):
-                    temp_df = pd.read_parquet(filepath, engine="fastparquet")
-            except Exception as e:
-                raise e
-        else:
-            errors = []
-            temp_df = None
-            for func_ in read_functions:
-                try:
-                    temp_df = func_(filepath)
-                    temp_df.Condition  # Check correct reading
-                    break
-                except Exception as e:
-                    errors.append(e)
-            if temp_df is None:
-                raise Exception(errors)
-
-        return temp_df
-
-    def rearrange_file(self, data: pd.DataFrame, revision: bool = False):
-        """### Preparation of data import\n
-        - Update column name (no ' ', '_', '(', ')')
-        - Extract correct Data column and sort it
-        - Drop not useful column and all NaN column
-        - Try to infer to float all object columns
-        - interpolate columns with NaN, max 3, with backward value
-        - Report NaN and Obj_Col\n
-        Args:
-            data (pd.DataFrame): data
-            revision (bool, optional): Inform if data is raw. Defaults to False
-        """
-        temp_data = data.copy()
-        # update column names
-        temp_data.columns = (
-            temp_data.columns.str.strip()
-            .str.replace(" ", "_", regex=True)
-            .str.replace("(", "", regex=True)
-            .str.replace(")", "", regex=True)
-            .str.replace(",", "", regex=True)
-        )
-
-        # Extract correct Date column data
-        if {"Date", "Time"}.issubset(set(temp_data.columns)):
-            # old monitor file
-            # temp_data.Date = pd.to_datetime(
-            #     temp_data['Date'].astype(str) + " " + temp_data['Time'].astype(str)  # noqa: E501
-            #     )
-            temp_data.Date = pd.to_datetime(temp_data["Date"].astype(str), dayfirst=True)
-        else:  # new monitor file
-            temp_data.DateTime = pd.to_datetime(temp_data["DateTime"])
-            temp_data.rename(columns={"DateTime": "Date"}, inplace=True)
-
-        temp_data.sort_values("Date", axis=0, ignore_index=True, inplace=True)
-
-        # drop non functional column and all NaN columns
-        [
-            temp_data.drop(i, axis=1, inplace=True, errors="ignore")
-            for i in ("Time", "RelTime", "Condition")
-        ]
-        temp_data.dropna(axis=1, how="all", inplace=True)
-
-        # replace value equal to 0 value with bfill, limit 1 consecutive
-        temp_data.replace(0, None, method="bfill", limit=1, inplace=True)
-        # replace str value in object columns (mixed type) to float (or NaN)
-        obj_col = temp_data.select_dtypes("object").columns.to_list()
-        for col in obj_col:
-            temp_data[col] = temp_data[col].apply(pd.to_numeric, errors="coerce").astype(float)
-
-        # interpolate columns NaN, max 3, with backward value
-        temp_data.interpolate(axis=0, method="pad", limit=3, inplace=True)
-        nan_col = temp_data.columns[temp_data.isna().any()].tolist()
-
-        self.df = temp_data
-
-        # warning
-        if obj_col != [] or nan_col != []:
-            Messagebox.show_warning(
-                title="Import file warning",
-                message="OBJECT COLUMNS: the following columns "
-                f"contain mixed value\n{', '.join(obj_col)}\n\n"
-                "NAN COLUMNS: the following columns"
-                f"contain multiple NAN value\n{', '.join(nan_col)}\n",
-            )
-
-    def module_check_jit(self, df: pd.DataFrame) -> tuple[list, list]:
-        """Controlla se ci sono errori nei moduli\n
-        Args:
-            f_xl (pd.DataFrame): dataframe da analizzare\n
-        Returns:
-            tuple[list, list]: moduli con errori, indici di errore di
-            quei moduli"""
-        matches = ["Iout_PM"]
-        modul_current = [col for col in df.columns[2:] if any(x in col for x in matches)]
-        iteration = df.shape[0]
-        num_pompe = int(len(modul_current) / 3)
-        error_col = {}
-        for col in modul_current:
-            error_col[col] = []
-        n = 1
-        for num in range(num_pompe):
-            mod1 = modul_current[(num * 3 + 0)]
-            mod2 = modul_current[(num * 3 + 1)]
-            mod3 = modul_current[(num * 3 + 2)]
-            data1 = df[mod1].to_numpy()
-            data2 = df[mod2].to_numpy()
-            data3 = df[mod3].to_numpy()
-            (
-                error_col[mod1],
-                error_col[mod2],
-                error_col[mod3],
-            ) = fnb.module_check_index_jit(data1, data2, data3, iteration, n)
-        module_error = [keys for keys in error_col.keys() if len(error_col[keys]) > 0]
-        for mod in module_error:
-            data = np.array(error_col[mod])
-            error_col[mod] = fnb.correct_index_jit(data)
-        if module_error == []:
-            return module_error, []
-        else:
-            return module_error, [error_col[mod] for mod in module_error]
-
-    ##########################################
-    # ########### LIFETEST FUNCT ########### #
-    ##########################################
-    @singledispatchmethod
-    def find_cycle(self, arg) -> dict[str, list[int | dt.timedelta]]:
-        """Find all ON and OFF based on specified threshold. Then count the
-        cycle and time during these
-
-        Args:
-            column (str | None, optional): _description_. Defaults to None.
-            threshold (int | None, optional): _description_. Defaults to None.
-
-        Returns:
-            dict[str, list[int | dt.timedelta]]: _description_
-        """
-        raise NotImplementedError("Cannot Find Cycle")
-
-    @find_cycle.register
-    def _(self, arg: tuple):
-        cicli_rslt = {}
-        col, threshold = arg
-        cicli_rslt[col] = self.__find_cycle(col, threshold)
-        return cicli_rslt
-
-    @find_cycle.register
-    def _(self, arg: dict):
-        cicli_rslt = {}
-        for col, threshold in arg.items():
-            cicli_rslt[col] = self.__find_cycle(col, threshold)
-        return cicli_rslt
-
-    def __find_cycle(self, col: str, threshold: int):
-        spegnimenti, accensioni = fnb.speg_acc_index(self.df[col].to_numpy(), threshold)
-        result = self.__cicli_time_jit(accensioni, spegnimenti, self.df.Date.to_numpy())
-
-        self.cycle_data[col] = {
-            "threshold": threshold,
-            "on_index": accensioni,
-            "off_index": spegnimenti,
-            "cycle": result[0],
-            "time_on": result[1],
-        }
-
-        return result
-
-    def __cicli_time_jit(
-        self, P_on: np.ndarray, P_off: np.ndarray, time: np.ndarray
-    ) -> Union[int, dt.timedelta]:
-        """Calcolo del numero di cicli e del tempo di on.
-        Considera anche i cicli non completi\n
-        Args:
-            P_on (np.ndarray): indici di inizio ciclo
-            P_off (np.ndarray): indici di fine di ciclo
-            time (np.ndarray): array dei tempi
-        Returns:
-            Union[int,dt.timedelta]: cicli e tempo totale in secondi"""
-        cicli = 0
-        time_on = 0
-        time_on_cicli = 0
-        sec = np.timedelta64(1, "s")
-
-        if len(P_off) == 0 | len(P_on) == 0:
-            return [0, 0]
-
-        elif P_off[0] < P_on[0] and P_on[-1] > P_off[-1]:
-            cicli = len(P_on) - 1
-            for i in range(cicli):
-                time_on_cicli += fnb.delta_time(time[P_off[i + 1]], time[P_on[i]])
-            time_on = (
-                time_on_cicli
-                + fnb.delta_time(time[P_off[0]], time[0])
-                + fnb.delta_time(time[-1], time[P_on[-1]])
-            )
-            cicli += 2
-
-        elif P_off[0] < P_on[0] and P_on[-1] < P_off[-1]:
-            cicli = len(P_on)
-            for i in range(cicli):
-                time_on_cicli += fnb.delta_time(time[P_off[i + 1]], time[P_on[i]])
-            time_on = time_on_cicli + fnb.delta_time(time[P_off[0]], time[0])
-            cicli += 1
-
-        elif P_off[0] > P_on[0] and P_on[-1] > P_off[-1]:
-            cicli = len(P_on) - 1
-            for i in range(cicli):
-                time_on_cicli += fnb.delta_time(time[P_off[i]], time[P_on[i]])
-            time_on = time_on_cicli + fnb.delta_time(time[-1], time[P_on[-1]])
-            cicli += 1
-
-        elif P_off[0] > P_on[0] and P_on[-1] < P_off[-1]:
-            cicli = len(P_on)
-            for i in range(cicli):
-                time_on_cicli += fnb.delta_time(time[P_off[i]], time[P_on[i]])
-            time_on = time_on_cicli
-        time_on_hms = dt.timedelta(seconds=time_on / sec)
-
-        return [cicli, time_on_hms]
-
-    def clean_cycle(self, column_name: str):
-        """Remove not cycle time from data base on column passed\n
-        Args:
-            column_name (str): column for cycle identification
-        """
-        self.df_lt = self.df.copy()
-        date = self.df_lt.Date.to_numpy().astype(dtype="timedelta64[ns]")
-        column_data = self.cycle_data[column_name]
-        threshold = column_data["threshold"]
-        spegnimenti = np.array(column_data["off_index"], dtype=np.int64)
-        accensioni = np.array(column_data["on_index"], dtype=np.int64)
-
-        self.df_lt.Date = fnb.retime_jit2(date, spegnimenti, accensioni)
-
-        self.df_lt.drop(
-            index=self.df_lt[np.isnan(self.df_lt[column_name])].index,
-            inplace=True,
-        )
-        self.df_lt.drop(
-            index=self.df_lt[self.df_lt[column_name] < threshold].index,
-            inplace=True,
-        )
-
-    def data_distribution(
-        self,
-        column_name: str,
-        current_mod: str = None,
-        x_min: float = 0,
-        x_max: float = 150,
-        n_bins: float = 150,
-    ):
-        """Calculates the distribution of values ​​over time of the selected
-        column. By default the column width is 1 and the range is 150"""
-        data = self.df_lt
-
-        current_column = data[column_name].replace(0, np.nan).to_numpy()
-        if current_mod:
-            current_mod = data[current_mod].replace(0, np.nan).to_numpy()
-        time = data.Date.to_numpy()
-        iteration = data.shape[0] - 1
-
-        x_range = int(x_max) - int(x_min)
-        n_bins = int(n_bins)
-        bar_width = x_range / n_bins
-        sec = np.timedelta64(1, "s")
-        y, y_nan = fnb.distribution_jit2(
-            current_column,
-            current_mod,
-            time,
-            iteration,
-            x_min,
-            n_bins,
-            bar_width,
-            sec,
-        )
-
-        self.lifetest_analyzed["distr"][column_name] = y
-        self.lifetest_analyzed["NaN"][column_name] = y_nan / sec
-
-        return y
-
-    def data_smoothing(self, column_name: str, revision=False):
-        """Calculate rolling window data of column passed\n
-        Args:
-            column_name (str): column data name
-            revision (bool, optional): tell if its not raw file. Defaults to
-            False.
-        """
-        if revision:
-            current_column = self.df_rev[column_name]
-        else:
-            current_column = self.df_lt[column_name]
-        y = current_column.dropna().replace(0, np.nan)
-        y = y.rolling(
-            1000,
-            min_periods=250,
-            win_type="kaiser",
-            center=True,
-            closed="neither",
-        ).mean(beta=8)
-
-        self.lifetest_analyzed["timeseries"][column_name] = y
-
-    def create_export_file(
-        self,
-        cicli_rslt: list[int],
-        merge: bool = False,
-        module: str = None,
-        smooth: bool = False,
-        x_max: int = 150,
-        n_bin: int = 150,
-    ):
-        """Crea file excel di report con le distribuzioni di temperatura\n
-        Args:
-            cicli_rslt (list[int]): cycle result for selected column and
-            threshold
-            merge (bool, optional): if merge file. Defaults to False.
-            module (str, optional): Module to reset. Defaults to None.
-            smooth (bool, optional): if export timeseries too. Defaults to
-            False.
-            x_max (int, optional): X max value. Defaults to 150.
-            n_bin (int, optional): Number of histogram bins. Defaults to 150.
-        """
-        try:
-            cicli_df = pd.DataFrame([cicli_rslt], columns=["Cicli", "Time_on(s)"])
-            step = int(x_max / n_bin)
-            export_data = pd.DataFrame(
-                data=self.lifetest_analyzed["distr"], index=list(range(0, x_max, step))
-            )
-            export_nan = pd.DataFrame(data=self.lifetest_analyzed["NaN"], index=["NotANumber"])
-            export_distr = pd.concat([export_data, export_nan])
-            if smooth:
-                export_timeseries = pd.DataFrame(data=self.lifetest_analyzed["timeseries"])
-                export_timeseries.insert(0, "Date", self.df_lt.Date)
-
-            if merge is False:
-                export_mean = self.__data_distr_mean_jit(export_distr)
-                export_df = pd.concat([export_distr, export_mean])
-
-                new_file = filedialog.asksaveasfilename(
-                    initialfile="output.xlsx",
-                    defaultextension=".xlsx",
-                    filetypes=[
-                        ("Tutti i file", "*.*"),
-                        ("Cartella excel (.xlsx)", "*.xlsx"),
-                    ],
-                )
-                if new_file == "":
-                    return
-
-                if new_file.endswith(".xlsx") is True:
-                    with pd.ExcelWriter(new_file) as writer:
-                        export_df.to_excel(writer, sheet_name="Distribution")
-                        cicli_df.to_excel(writer, sheet_name="Cicli")
-                elif new_file.endswith(".xls") is True:
-                    new_file = new_file.replace(".xls", ".xlsx")
-                    with pd.ExcelWriter(new_file) as writer:
-                        export_df.to_excel(
-                            writer,
-                            sheet_name="Distribution",
-                            engine="xlsxwriter",
-                        )
-                        cicli_df.to_excel(writer, sheet_name="Cicli")
-                    Messagebox.show_info(
-                        title="Info",
-                        message="Il formato xls non è più supportato\n"
-                        "E' stato salvato in formato xlxs",
-                    )
-                if smooth:
-                    new_file = new_file.replace(".xlsx", ".parquet")
-                    export_timeseries.to_parquet(new_file, engine="fastparquet")
-
-            # ----- MERGE ----- #
-            elif merge is True:
-                merge_filename = filedialog.askopenfilename(
-                    title="Select a cumulation file to merge",
-                    defaultextension="*.xlsx",
-                    filetypes=[
-                        ("Tutti i File Excel", "*.xl*"),
-                        ("Tutti i file", "*.*"),
-                    ],
-                )
-                merged_filename = filedialog.asksaveasfilename(
-                    title="Select a new file name",
-                    defaultextension="*.xlsx",
-                    filetypes=[
-                        ("Tutti i File Excel", "*.xlsx"),
-                        ("Tutti i file", "*.*"),
-                    ],
-                )
-                try:
-                    sheet = 0
-                    to_merge_f_xl = pd.read_excel(
-                        io=merge_filename,
-                        sheet_name=sheet,
-                        index_col=0,
-                        skipfooter=2,
-                    )
-                    to_merge_cicli = pd.read_excel(
-                        io=merge_filename, sheet_name=sheet + 1, index_col=0
-                    )
-                    columns_1 = to_merge_f_xl.columns.to_list()
-                    columns_2 = export_distr.columns.to_list()
-                    if module.isnumeric():
-                        module_matches = [
-                            "Vout_PM",
-                            "Iout_PM",
-                            "Vout_SP_PM",
-                            "Iout_SP_PM",
-                            "Tinlet_PM",
-                            "T_PFC_PM",
-                            "T_DCDC1_PM",
-                            "T_DCDC2_PM",
-                            "Fan_Voltage_PM",
-                            "Vin1_PM",
-                            "Vin2_PM",
-                            "Vin3_PM",
-                            "Status_PM",
-                        ]
-                        module_match = [f"{x}{int(module)}" for x in module_matches]
-                        col_to_drop = [
-                            col
-                            for col in to_merge_f_xl.columns
-                            if any(x in col for x in module_match)
-                        ]
-                        to_merge_f_xl.drop(col_to_drop, axis=1, inplace=True)
-                    columns = list(set(columns_2) - set(columns_1)) + columns_1
-                    df_merge = to_merge_f_xl.add(export_distr, fill_value=0)
-                    export_mean = self.__data_distr_mean_jit(df_merge)
-                    df_merge = pd.concat([df_merge, export_mean])
-                    df_merge = df_merge[columns]
-                    cicli_merge = to_merge_cicli.add(cicli_df, fill_value=0)
-
-                    with pd.ExcelWriter(merged_filename) as writer:
-                        df_merge.to_excel(writer, sheet_name="Distribution", columns=columns)
-                        cicli_merge.to_excel(writer, sheet_name="Cicli")
-                except Exception:
-                    raise Warning("Nessun file xlsx unito")
-
-                if smooth:
-                    try:
-                        to_merge_timeseries = pd.read_parquet(
-                            merge_filename.replace(".xlsx", ".parquet"),
-                            engine="fastparquet",
-                        )
-                        if module.isnumeric():
-                            module_match = [f"PM{int(module)}"]
-                            col_to_drop = [
-                                col
-                                for col in to_merge_f_xl.columns
-                                if any(x in col for x in module_match)
-                            ]
-                            to_merge_timeseries.drop(col_to_drop, axis=1, inplace=True)
-                        delta_t = to_merge_timeseries.Date.values[-1] + np.timedelta64(15, "s")
-                        export_timeseries.Date = export_timeseries.Date + delta_t  # noqa: E501
-                        merge_timeseries = pd.concat(
-                            [to_merge_timeseries, export_timeseries],
-                            ignore_index=True,
-                        )
-                        merge_timeseries.to_parquet(
-                            merged_filename.replace(".xlsx", ".parquet"),
-                            engine="fastparquet",
-                        )
-                    except Exception:
-                        raise Warning("Nessun file parquet unito")
-
-        except Exception as e:
-            raise (e)
-
-    def __data_distr_mean_jit(self, data: pd.DataFrame) -> pd.DataFrame:
-        """Return new Dataframe with Mean and total time in hours of data
-        passed\n
-        Args:
-            data (pd.DataFrame): data to used"""
-        means = {}
-        time = {}
-        iteration = data.shape[0] - 1
-        for column in data.columns:
-            means[column], time[column] = fnb.ponderate_mean(data[column].to_numpy(), iteration)
-        data = [means, time]
-        distr_mean = pd.DataFrame(data=data, index=["mean", "time"])
-        return distr_mean
-
-    ##########################################
-    # ########### THERMAL FUNCT ########### #
-    ##########################################
-    def smoothing(self, y: pd.Series | np.ndarray) -> np.ndarray:
-        """Smoothing dei dati tramite 'savgol_filter'\n
-        Args:
-            y (pd.Series|np.ndarray): Dati su cui eseguire lo smooothing
-
-        Returns:
-            np.ndarray: smoothing data"""
-        y = savgol_filter(y, 53, 3)  # window size used for filtering  # order of fitted polynomial
-        return y
-
-    def data_elaboration(self, data: str, index: list[int] = None) -> None:
-        """Elabora i dati\n
-        Args:
-            data (str): Nome della serie da elaborare
-            index (list[int], optional): lista con indice di partenza e indice
-            di fine per calcoli su zona specifica. Defaults to None.\n
-        Returns:
-            tuple[float,tuple[float],float,tuple[float]]: restituisce
-            'mean, max-min, mean(spec), max-min(spec)'"""
-        # mean = self.df[data][decim:].mean()
-        # max = self.df[data].max()
-        # min = self.df[data].min()
-
-        subdf = self.df.loc[:, self.df.columns != "Date"].copy()
-        subdf.replace(0, np.NaN, inplace=True)
-        subdf.interpolate(axis=0, method="linear", limit=3, inplace=True)
-        if index is not None:
-            mean_p = subdf[data][index[0] : index[1]].mean()
-            max_p = subdf[data][index[0] : index[1]].max()
-            min_p = subdf[data][index[0] : index[1]].min()
-        else:
-            mean_p = np.nan
-            max_p = np.nan
-            min_p = np.nan
-
-        self.span_data[data] = [mean_p, max_p, min_p]
-
-
 class Ctrl_Thermal:
     model: Model
     view: View
@@ -1709,11 +1155,15 @@ class Ctrl_Thermal:
 
         col_slc2 = set(self.view.twin_y.get())
         col_slc1 = set(self.view.frm_option.get()) - col_slc2
+        self._load_selected(list(col_slc1 | col_slc2))
+        col_slc1 &= set(self.model.df.columns)  # all NaN channels are not loaded
+        col_slc2 &= set(self.model.df.columns)
 
         n_graph = len(col_slc1) + len(col_slc2)
         color_c = iter(plt.cm.rainbow(np.linspace(0, 1, n_graph)))
         timedelta = self.model.df.Date.values[0] - np.datetime64("2021-01-01")
         frame.x_data = x = self.model.df.Date - timedelta
+        frame.smooth = smooth
 
         for data in col_slc1:
             self._plot(frame, x, data, color_c, smooth, 1)
@@ -1929,45 +1379,10 @@ class Ctrl_Thermal:
             )
 
         if filename:
-            sub_data, data_mean, data_ptp = self.__exp_data()
-
-            if merge:
-                sheet = 0
-                to_merge_data = pd.read_excel(io=filename, sheet_name=sheet, index_col=0)
-                to_merge_mean = pd.read_excel(io=filename, sheet_name=sheet + 1, index_col=0)
-                to_merge_ptp = pd.read_excel(io=filename, sheet_name=sheet + 2, index_col=0)
-                data_merge = pd.concat([to_merge_data, sub_data])
-                mean_merge = pd.concat([to_merge_mean, data_mean])
-                ptp_merge = pd.concat([to_merge_ptp, data_ptp])
-
-                with pd.ExcelWriter(filename, engine="openpyxl") as writer:
-                    data_merge.to_excel(writer, sheet_name="Data")
-                    mean_merge.to_excel(writer, sheet_name="Mean")
-                    ptp_merge.to_excel(writer, sheet_name="PtP")
-
-            else:
-                with pd.ExcelWriter(filename, engine="openpyxl") as writer:
-                    sub_data.to_excel(writer, sheet_name="Data")
-                    data_mean.to_excel(writer, sheet_name="Mean")
-                    data_ptp.to_excel(writer, sheet_name="PtP")
+            self.model.export_thermal_data(filename, self.view.th_plot_frm.x_index, merge)
 
         self.statusbar.update_status(True, "Export complete")
 
-    def __exp_data(self):
-        """Return the correct data to export\n"""
-        index = self.view.th_plot_frm.x_index
-        try:
-            sub_data = self.model.df[index[0] : index[1]].copy()
-        except Exception:
-            sub_data = self.model.df.copy()
-        finally:
-            sub_data.set_index("Date", inplace=True)
-        data_mean = sub_data.mean().to_frame().transpose()
-        data_mean.set_index(pd.Series(sub_data.index.array[0]), inplace=True)
-        data_ptp = (sub_data.max() - sub_data.min()).to_frame().transpose()
-        data_ptp.set_index(pd.Series(sub_data.index.array[0]), inplace=True)
-        return sub_data, data_mean, data_ptp
-
     def update_th_fig(self, redraw=False, columns=[{""}, {""}]):
         frame = self.view.th_plot_frm
 
@@ -2007,6 +1422,7 @@ class Ctrl_LifeTest:  # TODO compare
 
             if len(cln_slct) == 0:
                 raise BufferError("Selezionare almeno una colonna")
+            self._load_selected(cln_slct)
             if self.view.soglie_txt.compare("end-1c", "==", "1.0"):
                 raise ValueError("Inserire almeno un valore di soglia")
 
@@ -2014,10 +1430,7 @@ class Ctrl_LifeTest:  # TODO compare
             for i in range(len(cln_slct)):
                 a = i + 1
                 soglia = self.view.soglie_txt.get(f"{a}.0", f"{a}.0 lineend")
-                if soglia.isnumeric():
-                    cln_soglia.append(int(soglia))
-                else:
-                    raise TypeError("Inserire valori numerici")
+                cln_soglia.append(parse_threshold(soglia))
 
             cicli_opt = {col: soglia for col, soglia in zip(cln_slct, cln_soglia)}
 
@@ -2032,18 +1445,7 @@ class Ctrl_LifeTest:  # TODO compare
             #           "time": time_}
             #     for col, soglia in zip(cln_slct, cln_soglia)}
             # ----- UPDATE VIEW ----- #
-            t = self.view.cicli_result_tv
-            t.clear()
-            for keys in cicli_rslt.keys():
-                t.insert(
-                    parent="",
-                    index="end",
-                    values=(
-                        f"{keys}",
-                        f"{cicli_rslt[keys][0]}",
-                        f"{str(cicli_rslt[keys][1])}",
-                    ),
-                )
+            self._show_cycles(cicli_rslt)
             self.view.analysis_btn["state"] = "normal"
             self.view.lifetest.tab(1, state="normal")
             self.view.lifetest.tab(2, state="normal")
@@ -2056,6 +1458,51 @@ class Ctrl_LifeTest:  # TODO compare
         except TypeError as error:
             self.view.show_error(error)
 
+    def threshold_sweep(self):
+        """Plot cycles and ON time versus threshold of the selected columns
+        (Model.threshold_sweep), to choose the thresholds"""
+        try:
+            cln_slct = self.view.col_frm.get()
+            if len(cln_slct) == 0:
+                raise BufferError("Selezionare almeno una colonna")
+            self._load_selected(cln_slct)
+            sweeps = {col: self.model.threshold_sweep(col) for col in cln_slct}
+            wd = ttk.Toplevel(title="Threshold sweep")
+            fig, (ax1, ax2) = plt.subplots(2, 1, sharex=True, figsize=(7, 6), dpi=100)
+            for col, sweep in sweeps.items():
+                ax1.plot(sweep.Threshold, sweep.Cicli, label=col)
+                ax2.plot(sweep.Threshold, sweep["Time_on(s)"] / 3600, label=col)
+            ax1.set_ylabel("Cicli")
+            ax2.set_ylabel("Time on (h)")
+            ax2.set_xlabel("Soglia")
+            ax1.legend()
+            canvas = tkagg.FigureCanvasTkAgg(fig, wd)
+            tkagg.NavigationToolbar2Tk(canvas, wd).update()
+            canvas.draw_idle()
+            canvas.get_tk_widget().pack(side=tk.TOP, fill="both", expand=1)
+            self.statusbar.update_status(True, "Sweep soglie completato")
+        except BufferError as warning:
+            self.view.show_warning(warning)
+        except ValueError as warning:
+            self.view.show_warning(warning)
+        except TypeError as error:
+            self.view.show_error(error)
+
+    def _show_cycles(self, cicli_rslt: dict[str, list[int | dt.timedelta]]):
+        """Show cycles and ON time of each column in the result Treeview"""
+        t = self.view.cicli_result_tv
+        t.clear()
+        for keys in cicli_rslt.keys():
+            t.insert(
+                parent="",
+                index="end",
+                values=(
+                    f"{keys}",
+                    f"{cicli_rslt[keys][0]}",
+                    f"{str(cicli_rslt[keys][1])}",
+                ),
+            )
+
     def analysis(self):
         """Cleans data based on selected column with its threshold. Then it
         calculates the distributions and the timeseries"""
@@ -2232,7 +1679,7 @@ class Ctrl_LifeTest:  # TODO compare
         self.view.option_wd.match = matches
         self.view.option_wd.file_cmb["value"] = list(matches.keys())
 
-    def export_all_option_control(self) -> tuple[str, int, int, int]:
+    def export_all_option_control(self) -> tuple[str, float, int, int]:
         """Controlla se le opzioni di export inserite sono corrette"""
         # colonna cicli
         col_cicli = self.view.option_wd.col_text.get()
@@ -2245,10 +1692,7 @@ class Ctrl_LifeTest:  # TODO compare
         soglia_cicli = self.view.option_wd.soglia_text.get()
         if soglia_cicli == "":
             raise Exception("Inserire nome di una colonna e un valore di soglia")
-        elif soglia_cicli.isnumeric() is False:
-            raise TypeError("Inserire un valore numerico")
-        elif soglia_cicli.isnumeric() is True:
-            soglia_cicli = int(soglia_cicli)
+        soglia_cicli = parse_threshold(soglia_cicli)
 
         # width bin
         bar_width = self.view.option_wd.width_.get()
@@ -2269,47 +1713,54 @@ class Ctrl_LifeTest:  # TODO compare
         """Comanda il processo di creazione del file di report"""
         try:
             col_cicli, soglia_cicli, x_max, n_bin = self.export_all_option_control()  # noqa: E501
-            self.statusbar.update_status(True, "Calcoli per export in corso...")
-            self.view.parent.update()
-            self.model.lifetest_analyzed = {"distr": {}, "NaN": {}, "timeseries": {}}
-            cicli_rslt = self.model.find_cycle((col_cicli, soglia_cicli))
-            cicli_rslt[col_cicli][1] = cicli_rslt[col_cicli][1].total_seconds()
-
             distr_col: list[str] = list(self.view.option_wd.col_frm.get())
 
-            self.model.clean_cycle(col_cicli)
-            module_matches = [
-                "Vout_PM",
-                "Iout_PM",
-                "Vout_SP_PM",
-                "Iout_SP_PM",
-                "Tinlet_PM",
-                "T_PFC_PM",
-                "T_DCDC1_PM",
-                "T_DCDC2_PM",
-                "Fan_Voltage_PM",
-                "Vin1_PM",
-                "Vin2_PM",
-                "Vin3_PM",
-                "Status_PM",
-            ]
-            for column in distr_col:
-                if any(x in column for x in module_matches):
-                    mod = column[-3:]
-                    self.model.data_distribution(column, f"Iout_{mod}", x_max=x_max, n_bins=n_bin)
-                else:
-                    self.model.data_distribution(column, x_max=x_max, n_bins=n_bin)
-                if all_:
-                    self.model.data_smoothing(column)
+            merge_filename = None
+            if self.view.option_wd.merge_option.get():
+                merge_filename = filedialog.askopenfilename(
+                    title="Select a cumulation file to merge",
+                    defaultextension="*.xlsx",
+                    filetypes=[
+                        ("Tutti i File Excel", "*.xl*"),
+                        ("Tutti i file", "*.*"),
+                    ],
+                )
+                new_file = filedialog.asksaveasfilename(
+                    title="Select a new file name",
+                    defaultextension="*.xlsx",
+                    filetypes=[
+                        ("Tutti i File Excel", "*.xlsx"),
+                        ("Tutti i file", "*.*"),
+                    ],
+                )
+            else:
+                new_file = filedialog.asksaveasfilename(
+                    initialfile="output.xlsx",
+                    defaultextension=".xlsx",
+                    filetypes=[
+                        ("Tutti i file", "*.*"),
+                        ("Cartella excel (.xlsx)", "*.xlsx"),
+                    ],
+                )
+                if new_file == "":
+                    return
 
-            self.model.create_export_file(
-                cicli_rslt=cicli_rslt[col_cicli],
-                merge=self.view.option_wd.merge_option.get(),
-                module=self.view.option_wd.module.get(),
-                smooth=all_,
+            self.statusbar.update_status(True, "Calcoli per export in corso...")
+            self.view.parent.update()
+            messages = self.model.lifetest_export(
+                new_file,
+                col_cicli,
+                soglia_cicli,
+                distr_col,
                 x_max=x_max,
                 n_bin=n_bin,
+                smooth=all_,
+                merge_filename=merge_filename,
+                module=self.view.option_wd.module.get(),
+                cycle_channels=distr_col if self.view.option_wd.cycle_table.get() else None,
             )
+            for message in messages:
+                Messagebox.show_info(title="Info", message=message)
             self.statusbar.update_status(True, "File esportato correttamente")
 
         except Warning as warning:
@@ -2341,20 +1792,54 @@ class Controller(Ctrl_Thermal, Ctrl_LifeTest):
         self.model = model
         self.view = view
         self.statusbar = statusbar
+        self.__follow_job: str | None = None
+
+    def __ask_files(self, revision: bool = False) -> tuple[str]:
+        """Get files names from directory\n
+        - Args: revision (bool, optional): Defaults to False.
+            - 'False' ask for a RAW file
+            - 'True' ask for an elaborated file\n
+        Returns:
+            tuple(str): iterator of file path"""
+        if revision:
+            fileoption = dict(
+                title="Please select elaborated file:",
+                filetypes=[
+                    ("Output file", [".xlsx", ".parquet"]),
+                    ("Data Distribution (Excel)", "*.xlsx"),
+                    ("Time Series (parquet)", "*.parquet"),
+                    ("All files", "*.*"),
+                ],
+            )
+        else:
+            fileoption = dict(
+                title="Please select a RAW file:",
+                defaultextension="*.xl*",
+                filetypes=[
+                    ("All files", "*.*"),
+                    ("Text File", ["*.txt", "*.log"]),
+                    ("CVS (tab separator)", ["*.cvs", ".xls"]),
+                    ("CVS (comma separator)", "*.cvs"),
+                    ("All Excel files", "*.xl*"),
+                ],
+            )
+
+        files = filedialog.askopenfilenames(**fileoption)
+        return files if isinstance(files, tuple) else (files,)
 
     def select_files(self):
         """Seleziona file e resetta View and Model"""
         try:
-            files = self.model.file_to_read()
+            files = self.__ask_files()
             for file in files:
                 self.model.file_typectrl(file)
             if files:
+                self.follow_file(False)
                 # ----- READ FILE ----- #
-                file_df = pd.DataFrame()
-                for file in files:
-                    temp_df = self.model.read_file(file)
-                    file_df = pd.concat((file_df, temp_df))
-                self.model.rearrange_file(file_df)
+                from_cache = self.model.load_files(files, self.__read_progress)
+                message = self.model.import_warning_message()
+                if message:
+                    Messagebox.show_warning(title="Import file warning", message=message)
 
                 # if is a LifeTest file should run correctly
                 try:
@@ -2362,11 +1847,11 @@ class Controller(Ctrl_Thermal, Ctrl_LifeTest):
                 except Exception:
                     pass
 
-                columns = list(self.model.df.columns[1:])
+                columns = self.model.columns_available  # also not loaded channels
 
                 with open(f"{APP_PATH}\\preset.yaml", "r") as f:
                     preset = yaml.safe_load(f)
-                def_col = preset["thermal"]["DEFAULT"]
+                def_col = self.model.projection or preset["thermal"]["DEFAULT"]
                 def_col = [
                     i.strip().replace(" ", "_").replace("(", "").replace(")", "").replace(",", "")
                     for i in def_col
@@ -2392,13 +1877,148 @@ class Controller(Ctrl_Thermal, Ctrl_LifeTest):
                 self.model.span_data = {}
 
                 self.view.parent.title(f"DataAnalysis - {path.basename(file)}")
-                self.statusbar.update_status(True, "File importato correttamente")
+                rows, seconds = self.model.read_stats.values()
+                if from_cache:
+                    rate = " - cache"
+                else:
+                    rate = f" - {rows / seconds:,.0f} rows/s" if seconds > 0 else ""
+                self.statusbar.update_status(True, f"File importato correttamente{rate}")
+                if self.model.profile and self.model.import_profile is not None:
+                    Messagebox.show_info(
+                        title="Import profile", message=self.model.import_profile.report()
+                    )
 
         except ValueError as error:
             self.view.show_error(error)
         except Exception as error:
             self.view.show_error(error)
 
+    def preset_names(self) -> list[str]:
+        """Return all preset.yaml sets as 'mode/name'"""
+        with open(f"{APP_PATH}\\preset.yaml", "r") as f:
+            preset = yaml.safe_load(f)
+        return [f"{mode}/{name}" for mode, sets in preset.items() for name in sets]
+
+    def import_preset(self, preset_name: str):
+        """Import only Date and the channels of a preset.yaml set, the other
+        channels are loaded when selected\n
+        Args:
+            preset_name (str): 'mode/name' (e.g. 'lifetest/THOR'), empty
+            string to import all columns
+        """
+        if preset_name == "":
+            self.model.projection = None
+            self.statusbar.update_status(True, "Import di tutte le colonne")
+            return
+        mode, name = preset_name.split("/", 1)
+        with open(f"{APP_PATH}\\preset.yaml", "r") as f:
+            preset = yaml.safe_load(f)
+        self.model.projection = [clean_name(col) for col in preset[mode][name]]
+        self.statusbar.update_status(True, f"Import solo colonne del preset {name}")
+
+    def _load_selected(self, columns: list[str]):
+        """Load in the Model selected channels skipped by the import preset"""
+        if all(col in self.model.df.columns for col in columns):
+            return
+        self.statusbar.update_status(True, "Caricamento colonne in corso...")
+        self.view.parent.update()
+        loaded = self.model.load_columns(columns)
+        self.statusbar.update_status(True, f"Colonne caricate: {', '.join(loaded)}")
+
+    def follow_file(self, state: bool):
+        """Start (or stop) following the active log, the last selected file:
+        every FOLLOW_MS new rows are imported and results updated\n
+        Args:
+            state (bool): True to start, False to stop
+        """
+        if self.__follow_job is not None:
+            self.view.after_cancel(self.__follow_job)
+            self.__follow_job = None
+        if self.model.follower is not None:
+            self.model.follow_stop()
+            self.statusbar.update_status(True, "Follow mode disattivato")
+        self.view.parent.menubar.follow.set(state)
+        if not state:
+            return
+        try:
+            if self.model.df is None:
+                raise BufferError("Importare prima un file")
+            self.model.follow_start(self.model.filenames[-1])
+        except (BufferError, ValueError) as warning:
+            self.view.parent.menubar.follow.set(False)
+            self.view.show_warning(warning)
+            return
+        self.statusbar.update_status(
+            True, f"Follow mode: {path.basename(self.model.filenames[-1])}"
+        )
+        self.__follow_job = self.view.after(FOLLOW_MS, self.__follow_poll)
+
+    def __follow_poll(self):
+        """Import the new rows of the followed log and update the view"""
+        try:
+            n_rows = self.model.follow_update()
+        except Exception as error:
+            self.follow_file(False)
+            self.view.show_error(error)
+            return
+        if n_rows > 0:
+            self.__follow_refresh(n_rows)
+        self.__follow_job = self.view.after(FOLLOW_MS, self.__follow_poll)
+
+    def __follow_refresh(self, n_rows: int):
+        """Update cycles, thermal plot and distribution plot after
+        'follow_update'"""
+        cycle_data = self.model.cycle_data
+        if cycle_data:
+            self._show_cycles(
+                {col: [data["cycle"], data["time_on"]] for col, data in cycle_data.items()}
+            )
+
+        frame = self.view.th_plot_frm
+        if frame.line:
+            timedelta = self.model.df.Date.values[0] - np.datetime64("2021-01-01")
+            frame.x_data = x = self.model.df.Date - timedelta
+            for line in frame.line:
+                y = self.model.df[line.get_label()]
+                line.set_data(x, self.model.smoothing(y) if frame.smooth else y)
+            for ax in (frame.ax1, frame.ax2):
+                ax.relim()
+                ax.autoscale_view()
+            frame.canvas.draw_idle()
+
+        distr_tab = self.view.distr_tab
+        column_slct = distr_tab.col_slc_cmb.get()
+        if (
+            self.model.df_lt is not None
+            and column_slct in self.model.lifetest_analyzed["distr"]
+            and self.model.distr_params[column_slct][1:] == (0, 150, 150)  # default plot
+        ):
+            self.distr_plot(distr_tab)
+
+        self.statusbar.update_status(
+            True, f"Follow mode: +{n_rows} righe ({self.model.df.shape[0]:,} totali)"
+        )
+
+    def compact_import(self, state: bool):
+        """Enable (or disable) compact dtypes for the next imports"""
+        self.model.compact = state
+        mode = "attivo" if state else "disattivato"
+        self.statusbar.update_status(True, f"Import compatto (float32/int16) {mode}")
+
+    def profile_import(self, state: bool):
+        """Enable (or disable) peak memory tracing of the import stages and
+        the profile report after each import"""
+        self.model.profile = state
+        mode = "attivo" if state else "disattivato"
+        self.statusbar.update_status(True, f"Profilo import {mode}")
+
+    def __read_progress(self, n_read: int, n_files: int, filepath: str):
+        """Show file reading progress in the Statusbar"""
+        self.statusbar.update_status(
+            True, f"Lettura file {n_read}/{n_files}: {path.basename(filepath)}"
+        )
+        self.view.parent.update()
+
     def __clear_view_lt(self):
         """Clear Lifetest Tab"""
         self.view.col_frm.clear_list()
@@ -0,0 +1,1206 @@
+#!/usr/bin/env python
+"""
+Analisi dei dati senza GUI: import, controllo moduli, cicli, distribuzioni,
+smoothing ed export. Usato dalla GUI (Test_Analysis) e dai job batch
+"""
+import datetime as dt
+import hashlib
+import json
+import os
+import time
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
+from functools import singledispatchmethod
+from os import path
+from pathlib import Path
+from typing import Callable
+
+import numpy as np
+import pandas as pd
+from scipy.signal import savgol_filter
+
+import func_numba as fnb
+from channel_store import ChannelBuffer, MaskedFrame
+from file_cache import FileCache
+from pipeline import ImportProfiler, normalize_raw
+from rainflow import RainflowCount
+from reader import TailReader, compact_series, header_channels, read_raw_file, stream_raw_files
+
+APP_PATH = f"{Path(__file__).parent}"
+APP_VERSION = "1.0"
+STREAM_MIN_BYTES = 1024**3  # files bigger than this are imported chunk by chunk
+CYCLE_CACHE_BYTES = 128 * 1024**2  # ON/OFF indexes kept by the cycle cache
+RAW_EXTENSIONS = ("xls", "xlsx", "xlsm", "xlsb", "odf", "ods", "odt", "txt", "csv", "log")
+MODULE_CHANNELS = (  # module channels, their distribution is weighted on 'Iout_PMx'
+    "Vout_PM",
+    "Iout_PM",
+    "Vout_SP_PM",
+    "Iout_SP_PM",
+    "Tinlet_PM",
+    "T_PFC_PM",
+    "T_DCDC1_PM",
+    "T_DCDC2_PM",
+    "Fan_Voltage_PM",
+    "Vin1_PM",
+    "Vin2_PM",
+    "Vin3_PM",
+    "Status_PM",
+)
+
+
+def cycle_option(threshold: float | tuple) -> tuple[float, float, float]:
+    """Return ON threshold, OFF threshold and minimum dwell (seconds) of a
+    'find_cycle' threshold: a number (same ON/OFF threshold, no dwell) or
+    (on, off) or (on, off, min_dwell)\n
+    Raises:
+        ValueError: if the OFF threshold is above the ON one or the dwell
+        is negative"""
+    if not isinstance(threshold, (tuple, list)):
+        return threshold, threshold, 0
+    soglia_on, soglia_off, *min_dwell = threshold
+    min_dwell = min_dwell[0] if min_dwell else 0
+    if soglia_off > soglia_on:
+        raise ValueError(f"Soglia OFF ({soglia_off}) maggiore della soglia ON ({soglia_on})")
+    if min_dwell < 0:
+        raise ValueError("Tempo minimo negativo")
+    return soglia_on, soglia_off, min_dwell
+
+
+class Model:
+    """Classe Model\n
+    interagisce (r/w) con il database/data,
+    verifica che i dati di ingresso siano corretti.\n
+    Headless: takes paths and parameters, returns results and warnings,
+    no dialog (GUI in Test_Analysis.Controller)"""
+
+    def __init__(self, filename: str | None, cache_dir: str | None = None):
+        """Args:
+            filename (str | None): files to analyse (set by 'load_files')
+            cache_dir (str | None, optional): import cache folder. Defaults
+            to None: APP_PATH/cache.
+        """
+        self.filenames = filename
+        self.df: pd.DataFrame | None = None  # read data
+        self.df_rev: pd.DataFrame | None = None  # read revision data
+        self.df_lt: MaskedFrame | None = None  # clean cycle data (ON rows of 'df')
+        self.cycle_data: dict = {}
+        # LRU of 'cycle_data' entries by data, column and thresholds
+        self.cycle_cache: OrderedDict[tuple, dict] = OrderedDict()
+        self.cycle_cache_bytes = CYCLE_CACHE_BYTES
+        self.data_key: str | None = None  # import cache key of 'df', None: not cacheable
+        self.lifetest_analyzed: dict = {"distr": {}, "NaN": {}, "timeseries": {}}
+        self.span_data = {}
+        self.read_stats: dict = {"rows": 0, "seconds": 0.0}  # raw read throughput
+        self.read_runs: list[int] = []  # rows of each file of the last read
+        self.read_workers: int | None = None  # read processes, None: one per file
+        self.import_warnings: dict = {
+            "obj_col": [], "obj_nan": {}, "nan_col": [], "date_rows": 0, "date_values": [],
+            "overlap_files": [], "dup_rows": 0,
+        }
+        self.compact = False  # store channels as int8/int16/float32 when safe
+        self.profile = False  # trace peak memory of each import stage
+        self.import_profile: ImportProfiler | None = None  # stages of the last import
+        self.projection: list[str] | None = None  # channels to import, None: all
+        self.columns_available: list[str] = []  # all channels, loaded or not
+        self.cache = FileCache(cache_dir or f"{APP_PATH}/cache", APP_VERSION)
+        self.file_sizes: dict[str, int] = {}  # imported bytes of each file
+        self.distr_params: dict[str, tuple] = {}  # current_mod, x_min, x_max, n_bins
+        self.lt_column: str | None = None  # column used by 'clean_cycle'
+        self.lt_offset = None  # retime offset of the last ON period of 'df_lt'
+        self.follower: TailReader | None = None
+        self.df_buffer: ChannelBuffer | None = None
+
+    def file_typectrl(self, filepath: str, revision: bool = False):
+        """Check if the selected file has the correct extension\n
+        Args:
+            - filepath (str): str filepath
+            - revision (bool, optional): Defaults to None.
+                - 'False' RAW file
+                - 'True' elaborated file"""
+        if revision:
+            filextension = ("xlsx", "parquet")
+        else:
+            filextension = RAW_EXTENSIONS
+
+        if filepath.lower().endswith(filextension):
+            pass
+        else:
+            self.filenames = None
+            raise ValueError(
+                "Invalid file extension\n" + "Select from:\n" + ", ".join(filextension)
+            )
+
+    def read_file(self, filepath: str, revision: bool = False, columns: list[str] | None = None):
+        """Return pandas.Dataframe from a file in filepath\n
+        - Args: revision (bool, optional): Defaults to False.
+            - 'False' apre un file grezzo.
+            - 'True' open a revision file based on its extension
+        - Args: columns (list[str] | None, optional): RAW file channels to
+        read (see 'projection'). Defaults to None: all columns."""
+        if revision:
+            try:
+                if filepath.endswith(".xlsx"):
+                    temp_df = pd.read_excel(
+                        io=filepath,
+                        sheet_name=0,
+                        index_col=0,
+                        skipfooter=1,
+                    )
+                elif filepath.endswith(".parquet"):
+                    temp_df = pd.read_parquet(filepath, engine="fastparquet")
+            except Exception as e:
+                raise e
+        else:
+            temp_df, seconds = read_raw_file(filepath, columns)
+            self.read_stats = {"rows": temp_df.shape[0], "seconds": seconds}
+
+        return temp_df
+
+    def read_files(
+        self,
+        filepaths: tuple[str],
+        callback: Callable[[int, int, str], None] | None = None,
+        columns: list[str] | None = None,
+    ) -> pd.DataFrame:
+        """Read RAW files in parallel (one process per file, at most
+        'read_workers') and concatenate them once, in the selection order
+        (rows of each file in 'read_runs')\n
+        Args:
+            filepaths (tuple[str]): raw files path
+            callback (Callable[[int, int, str], None] | None, optional):
+            called as callback(n_read, n_files, filepath) every time a file
+            is read. Defaults to None.
+            columns (list[str] | None, optional): channels to read. Defaults
+            to None: all columns.\n
+        Returns:
+            pd.DataFrame: all files data"""
+        n_files = len(filepaths)
+        workers = min(n_files, self.read_workers or os.cpu_count() or 1)
+        start = time.perf_counter()
+        if workers == 1:  # no process pool overhead
+            frames = []
+            for n_read, file in enumerate(filepaths, start=1):
+                frames.append(self.read_file(file, columns=columns))
+                if callback:
+                    callback(n_read, n_files, file)
+        else:
+            frames: list[pd.DataFrame | None] = [None] * n_files
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                futures = {
+                    pool.submit(read_raw_file, file, columns): i for i, file in enumerate(filepaths)
+                }
+                for n_read, future in enumerate(as_completed(futures), start=1):
+                    i = futures[future]
+                    frames[i], _ = future.result()
+                    if callback:
+                        callback(n_read, n_files, filepaths[i])
+        file_df = pd.concat(frames, ignore_index=True)
+        self.read_runs = [frame.shape[0] for frame in frames]
+        self.read_stats = {"rows": file_df.shape[0], "seconds": time.perf_counter() - start}
+        return file_df
+
+    def load_files(
+        self,
+        filepaths: tuple[str],
+        callback: Callable[[int, int, str], None] | None = None,
+        stream: bool | None = None,
+    ) -> bool:
+        """Import RAW files in 'df': from cache if the same files (path,
+        size and mtime) were already imported, otherwise with 'read_files'
+        and 'rearrange_file' (or chunk by chunk with 'stream_raw_files') and
+        then saved in cache. 'df' columns are memmap views of the cache
+        ChannelStore, read from disk only when used. With 'compact' every
+        channel gets its narrowest safe dtype (see 'compact_dtype'). With a
+        'projection' only Date and those channels are read, the others are
+        listed in 'columns_available' (see 'load_columns')\n
+        Args:
+            filepaths (tuple[str]): raw files path
+            callback (Callable[[int, int, str], None] | None, optional):
+            see 'read_files'. Defaults to None.
+            stream (bool | None, optional): import chunk by chunk, with
+            bounded memory. Defaults to None: only if files are bigger than
+            STREAM_MIN_BYTES.\n
+        Returns:
+            bool: True if data come from cache (import warnings in
+            'import_warnings', see 'import_warning_message')"""
+        self.filenames = tuple(filepaths)
+        self.file_sizes = {file: path.getsize(file) for file in filepaths}
+        self.import_profile = None
+        self.data_key = None
+        projection = None if self.projection is None else sorted(self.projection)
+        key = self.cache.key(filepaths, {"compact": self.compact, "columns": projection})
+        cached = self.cache.get(key)
+        if cached is not None:
+            self.df, self.import_warnings = cached
+            self.__set_columns_available(filepaths)
+            self.data_key = key
+            return True
+
+        if stream is None:
+            stream = sum(path.getsize(file) for file in filepaths) > STREAM_MIN_BYTES
+        if stream:
+            start = time.perf_counter()
+            try:
+                columns, warnings = stream_raw_files(
+                    filepaths, self.cache.path(key), callback=callback, columns=self.projection
+                )
+                self.cache.commit(
+                    key, warnings, columns, compact_series if self.compact else None
+                )
+            except Exception:
+                self.cache.remove(key)
+                raise
+            self.df, self.import_warnings = self.cache.get(key)
+            self.read_stats = {"rows": self.df.shape[0], "seconds": time.perf_counter() - start}
+        else:
+            self.rearrange_file(self.read_files(filepaths, callback, self.projection))
+            self.cache.put(key, self.df, self.import_warnings)
+            cached = self.cache.get(key)
+            if cached is not None:  # release the in memory copy
+                self.df = cached[0]
+        self.__set_columns_available(filepaths)
+        self.data_key = key
+        return False
+
+    def __set_columns_available(self, filepaths: tuple[str]):
+        """Loaded channels followed by the header channels not loaded"""
+        columns = self.df.columns[1:].to_list()
+        for filepath in filepaths:
+            columns += [col for col in header_channels(filepath) if col not in columns]
+        self.columns_available = columns
+
+    def load_columns(self, columns: list[str]) -> list[str]:
+        """Load in 'df' channels skipped by the import 'projection' (read
+        and normalised as the import)\n
+        Args:
+            columns (list[str]): channels to load (already loaded are
+            skipped)\n
+        Raises:
+            ValueError: if files changed since import or in follow mode\n
+        Returns:
+            list[str]: loaded channels (all NaN channels are not loaded)"""
+        missing = [col for col in columns if col not in self.df.columns]
+        if missing == []:
+            return []
+        if self.follower is not None:
+            raise ValueError("Disattivare Follow mode per caricare nuove colonne")
+        data, _ = self.__normalize(self.read_files(self.filenames, columns=missing))
+        if data.shape[0] != self.df.shape[0]:
+            raise ValueError("File modificati dopo l'import: importare di nuovo i file")
+        loaded = [col for col in missing if col in data.columns]
+        df = self.df.copy(deep=False)  # loaded channels stay memmap views
+        for col in loaded:
+            df[col] = data[col].to_numpy()
+        self.df = df
+        if self.df_lt is not None:
+            self.df_lt.data = self.df  # same rows, new channels visible
+        return loaded
+
+    def rearrange_file(self, data: pd.DataFrame, revision: bool = False):
+        """### Preparation of data import\n
+        - Update column name (no ' ', '_', '(', ')')
+        - Extract correct Data column (format inferred once, unparsable
+          rows removed and reported) and merge the files by date (time
+          overlaps and duplicated timestamps reported)
+        - Drop not useful column and all NaN column
+        - Try to infer to float all object columns
+        - interpolate columns with NaN, max 3, with backward value
+        - Report NaN and Obj_Col (in 'import_warnings')
+        - Cast channels to narrowest safe dtype (only 'compact' mode)\n
+        Args:
+            data (pd.DataFrame): data
+            revision (bool, optional): Inform if data is raw. Defaults to False
+        """
+        self.data_key = None  # not the cached import: no cycle cache
+        self.df, self.import_warnings = self.__normalize(data)
+
+    def __normalize(self, data: pd.DataFrame) -> tuple[pd.DataFrame, dict]:
+        """'rearrange_file' steps (see 'normalize_raw'), return normalised
+        data and import warnings. Stage times (and peak memory) of the last
+        import are in 'import_profile'"""
+        profiler = ImportProfiler(memory=self.profile)
+        profiler.add("read", self.read_stats["seconds"])
+        self.import_profile = profiler
+        return normalize_raw(data, self.compact, profiler, self.read_runs)
+
+    def import_warning_message(self) -> str:
+        """Return the message of mixed value and NaN columns, removed rows
+        (unparsable timestamps) and overlapping files found during the last
+        import, empty if none"""
+        obj_col = self.import_warnings["obj_col"]
+        obj_nan = self.import_warnings.get("obj_nan", {})
+        obj_count = [f"{col} ({obj_nan.get(col, '?')})" for col in obj_col]
+        nan_col = self.import_warnings["nan_col"]
+        date_rows = self.import_warnings.get("date_rows", 0)
+        overlap = [
+            path.basename(self.filenames[i]) for i in self.import_warnings.get("overlap_files", [])
+        ]
+        if obj_col == [] and nan_col == [] and date_rows == 0 and overlap == []:
+            return ""
+        message = (
+            "OBJECT COLUMNS: the following columns "
+            "contain mixed value (cells coerced to NaN)\n"
+            f"{', '.join(obj_count)}\n\n"
+            "NAN COLUMNS: the following columns"
+            f"contain multiple NAN value\n{', '.join(nan_col)}\n"
+        )
+        if date_rows > 0:
+            message += (
+                f"\nDATE: {date_rows} rows removed, timestamp not valid\n"
+                f"{', '.join(self.import_warnings['date_values'])}\n"
+            )
+        if overlap != []:
+            message += (
+                "\nOVERLAP: the following files overlap in time "
+                f"({self.import_warnings['dup_rows']} duplicated timestamps)\n"
+                f"{', '.join(overlap)}\n"
+            )
+        return message
+
+    def module_check_jit(self, df: pd.DataFrame) -> tuple[list, list]:
+        """Controlla se ci sono errori nei moduli\n
+        Args:
+            f_xl (pd.DataFrame): dataframe da analizzare\n
+        Returns:
+            tuple[list, list]: moduli con errori, indici di errore di
+            quei moduli"""
+        matches = ["Iout_PM"]
+        modul_current = [col for col in df.columns[2:] if any(x in col for x in matches)]
+        iteration = df.shape[0]
+        num_pompe = int(len(modul_current) / 3)
+        error_col = {}
+        for col in modul_current:
+            error_col[col] = []
+        n = 1
+        for num in range(num_pompe):
+            mod1 = modul_current[(num * 3 + 0)]
+            mod2 = modul_current[(num * 3 + 1)]
+            mod3 = modul_current[(num * 3 + 2)]
+            data1 = df[mod1].to_numpy()
+            data2 = df[mod2].to_numpy()
+            data3 = df[mod3].to_numpy()
+            (
+                error_col[mod1],
+                error_col[mod2],
+                error_col[mod3],
+            ) = fnb.module_check_index_jit(data1, data2, data3, iteration, n)
+        module_error = [keys for keys in error_col.keys() if len(error_col[keys]) > 0]
+        for mod in module_error:
+            data = np.array(error_col[mod])
+            error_col[mod] = fnb.correct_index_jit(data)
+        if module_error == []:
+            return module_error, []
+        else:
+            return module_error, [error_col[mod] for mod in module_error]
+
+    ##########################################
+    # ########### LIFETEST FUNCT ########### #
+    ##########################################
+    @singledispatchmethod
+    def find_cycle(self, arg) -> dict[str, list[int | dt.timedelta]]:
+        """Find all ON and OFF based on specified threshold. Then count the
+        cycle and time during these. A threshold can also be (on, off) for
+        hysteresis or (on, off, min_dwell) to drop ON/OFF shorter than
+        'min_dwell' seconds (see 'cycle_option')
+
+        Args:
+            column (str | None, optional): _description_. Defaults to None.
+            threshold (float | tuple | None, optional): _description_.
+            Defaults to None.
+
+        Returns:
+            dict[str, list[int | dt.timedelta]]: _description_
+        """
+        raise NotImplementedError("Cannot Find Cycle")
+
+    @find_cycle.register
+    def _(self, arg: tuple):
+        col, threshold = arg
+        return self.find_cycle({col: threshold})
+
+    @find_cycle.register
+    def _(self, arg: dict):
+        # thresholds checked before changing 'cycle_data', known results
+        # from 'cycle_cache', the others in parallel threads (the kernels
+        # release the GIL)
+        options = {col: cycle_option(threshold) for col, threshold in arg.items()}
+        todo = [col for col, option in options.items() if not self.__cached_cycle(col, option)]
+        for col in todo:
+            self.__new_cycle(col, *options[col])
+        time = self.df.Date.to_numpy().view(np.int64)
+        jobs = [(self.cycle_data[col], self.df[col].to_numpy(), time) for col in todo]
+        workers = min(len(jobs), os.cpu_count() or 1)
+        if workers > 1:
+            with ThreadPoolExecutor(max_workers=workers) as pool:
+                edges = list(pool.map(lambda job: self.__column_edges(*job), jobs))
+        else:
+            edges = [self.__column_edges(*job) for job in jobs]
+        for col, col_edges in zip(todo, edges):
+            self.__cycle_result(col, *col_edges)
+            self.__store_cycle(col, options[col])
+        return {col: [self.cycle_data[col]["cycle"], self.cycle_data[col]["time_on"]] for col in options}
+
+    def __cycle_key(self, col: str, option: tuple[float, float, float]) -> tuple | None:
+        """'cycle_cache' key: imported files (and options), rows, column and
+        thresholds. None if 'df' was not imported with 'load_files'"""
+        if self.data_key is None:
+            return None
+        return (self.data_key, self.df.shape[0], col, *option)
+
+    @staticmethod
+    def __cycle_name(key: tuple) -> str:
+        """File name of a 'cycle_cache' entry in the import cache entry"""
+        return "cycle_" + hashlib.sha1(json.dumps(key[1:], default=float).encode()).hexdigest()
+
+    def __cached_cycle(self, col: str, option: tuple[float, float, float]) -> bool:
+        """Restore 'cycle_data' of 'col' from 'cycle_cache' or, saved by
+        another Model, from the import cache entry. True if found"""
+        key = self.__cycle_key(col, option)
+        if key is None:
+            return False
+        if key not in self.cycle_cache:
+            saved = self.cache.get_result(self.data_key, self.__cycle_name(key))
+            if saved is None:
+                return False
+            arrays, info = saved
+            time_on = 0 if info["cycle"] == 0 else dt.timedelta(microseconds=info["time_on_us"])
+            self.__new_cycle(col, *option)
+            self.cycle_data[col].update(arrays, cycle=info["cycle"], time_on=time_on)
+            self.__remember_cycle(key, col)
+            return True
+        self.cycle_cache.move_to_end(key)
+        self.cycle_data[col] = dict(self.cycle_cache[key])  # arrays are never changed in place
+        return True
+
+    def __store_cycle(self, col: str, option: tuple[float, float, float]):
+        """Add 'cycle_data' of 'col' to 'cycle_cache' and to the import
+        cache entry (used by the next Models on the same files)"""
+        key = self.__cycle_key(col, option)
+        if key is None:
+            return
+        cycle = self.cycle_data[col]
+        time_on_us = 0 if cycle["cycle"] == 0 else cycle["time_on"] // dt.timedelta(microseconds=1)
+        self.cache.put_result(
+            self.data_key,
+            self.__cycle_name(key),
+            {"on_index": cycle["on_index"], "off_index": cycle["off_index"]},
+            {"cycle": int(cycle["cycle"]), "time_on_us": time_on_us},
+        )
+        self.__remember_cycle(key, col)
+
+    def __remember_cycle(self, key: tuple, col: str):
+        """Add 'cycle_data' of 'col' to 'cycle_cache', the least recently
+        used entries are dropped over 'cycle_cache_bytes'"""
+        self.cycle_cache[key] = dict(self.cycle_data[col])
+        size = sum(
+            cycle["on_index"].nbytes + cycle["off_index"].nbytes
+            for cycle in self.cycle_cache.values()
+        )
+        while size > self.cycle_cache_bytes and len(self.cycle_cache) > 1:
+            _, cycle = self.cycle_cache.popitem(last=False)
+            size -= cycle["on_index"].nbytes + cycle["off_index"].nbytes
+
+    def __new_cycle(self, col: str, soglia_on: float, soglia_off: float, min_dwell: float):
+        """Reset 'cycle_data' of 'col' with its thresholds"""
+        self.cycle_data[col] = {
+            "threshold": soglia_on,
+            "off_threshold": soglia_off,
+            "min_dwell": min_dwell,
+        }
+
+    def __cycle_result(self, col: str, spegnimenti: np.ndarray, accensioni: np.ndarray):
+        """Store ON/OFF of 'col' in 'cycle_data' with cycles and ON time"""
+        result = self.__cicli_time(accensioni, spegnimenti)
+        self.cycle_data[col].update(
+            on_index=accensioni,
+            off_index=spegnimenti,
+            cycle=result[0],
+            time_on=result[1],
+        )
+        return result
+
+    @staticmethod
+    def __debounced(cycle: dict) -> bool:
+        """True if cycles use hysteresis or minimum dwell"""
+        return cycle["off_threshold"] != cycle["threshold"] or cycle["min_dwell"] > 0
+
+    def __cycle_edges(self, col: str) -> tuple[np.ndarray, np.ndarray]:
+        """OFF and ON indexes of 'col' with its 'cycle_data' thresholds"""
+        return self.__column_edges(
+            self.cycle_data[col], self.df[col].to_numpy(), self.df.Date.to_numpy().view(np.int64)
+        )
+
+    @classmethod
+    def __column_edges(
+        cls, cycle: dict, data: np.ndarray, time: np.ndarray
+    ) -> tuple[np.ndarray, np.ndarray]:
+        """OFF and ON indexes of 'data' with 'cycle' thresholds ('time' in
+        int64 ns). Thread safe: no DataFrame access"""
+        if not cls.__debounced(cycle):
+            return fnb.speg_acc_index(data, cycle["threshold"])
+        return fnb.cycle_edges_jit(
+            data,
+            time,
+            cycle["threshold"],
+            cycle["off_threshold"],
+            int(cycle["min_dwell"] * 1e9),  # ns
+        )
+
+    def __on_rows(self, col: str, start: int = 0) -> np.ndarray:
+        """Mask of the rows from 'start' in ON state (NaN excluded): above
+        the threshold or, with hysteresis or dwell, inside an ON period"""
+        cycle = self.cycle_data[col]
+        data = self.df[col].to_numpy()
+        values = data[start:]
+        if not self.__debounced(cycle):
+            return ~np.isnan(values) & (values >= cycle["threshold"])
+        accensioni, spegnimenti = cycle["on_index"], cycle["off_index"]
+        if len(accensioni) + len(spegnimenti) > 0:
+            first_on = len(spegnimenti) > 0 and (
+                len(accensioni) == 0 or spegnimenti[0] < accensioni[0]
+            )
+        else:  # state of the first value outside the hysteresis band
+            known = (data > cycle["threshold"]) | ~(data >= cycle["off_threshold"])
+            first_on = known.any() and data[known.argmax()] > cycle["threshold"]
+        # ON/OFF alternate: the state changes at every edge
+        rows = np.arange(start, data.shape[0])
+        n_edges = np.searchsorted(accensioni, rows, side="right") + np.searchsorted(
+            spegnimenti, rows, side="right"
+        )
+        return ~np.isnan(values) & ((n_edges % 2 == 1) != first_on)
+
+    def __cicli_time(self, P_on: np.ndarray, P_off: np.ndarray) -> list[int | dt.timedelta]:
+        """Calcolo del numero di cicli e del tempo di on (cicli_time_jit,
+        nanosecondi interi). Considera anche i cicli non completi\n
+        Args:
+            P_on (np.ndarray): indici di inizio ciclo
+            P_off (np.ndarray): indici di fine di ciclo
+        Returns:
+            list[int | dt.timedelta]: cicli e tempo totale ([0, 0] senza
+            cicli)"""
+        cicli, time_on = fnb.cicli_time_jit(P_on, P_off, self.df.Date.to_numpy().view(np.int64))
+        return self.__cicli_result(cicli, time_on)
+
+    @staticmethod
+    def __cicli_result(cicli: int, time_on: int) -> list[int | dt.timedelta]:
+        """Cycles and ON time (ns, exact to the microsecond) as returned by
+        'find_cycle'"""
+        if cicli == 0:
+            return [0, 0]
+        return [cicli, dt.timedelta(microseconds=int(time_on) // 1000)]
+
+    def __follow_cicli_time(self, cycle: dict) -> list[int | dt.timedelta]:
+        """'__cicli_time' of a cycle whose edges were only appended: the
+        ON/OFF pairs already summed are kept in cycle['paired'] (pairs, ns),
+        only the new pairs and the incomplete cycles at the bounds are added"""
+        accensioni, spegnimenti = cycle["on_index"], cycle["off_index"]
+        n_on, n_off = len(accensioni), len(spegnimenti)
+        if n_on + n_off == 0:
+            return [0, 0]
+        time = self.df.Date.to_numpy().view(np.int64)
+        # as cicli_time_jit
+        start_on = n_on == 0 or (n_off > 0 and spegnimenti[0] < accensioni[0])
+        end_on = n_off == 0 or (n_on > 0 and accensioni[-1] > spegnimenti[-1])
+        n_pair = min(n_on - end_on, n_off - start_on)
+        paired, paired_ns = cycle.get("paired", (0, 0))
+        paired_ns += int(
+            (time[spegnimenti[paired + start_on : n_pair + start_on]]
+             - time[accensioni[paired:n_pair]]).sum()
+        )
+        cycle["paired"] = (n_pair, paired_ns)
+        time_on = paired_ns
+        if start_on:
+            time_on += int(time[spegnimenti[0]] - time[0])
+        if end_on:
+            time_on += int(time[-1] - time[accensioni[-1]])
+        return self.__cicli_result(n_on + start_on, time_on)
+
+    def threshold_sweep(
+        self, column: str, thresholds: np.ndarray | list[float] | None = None, n: int = 100
+    ) -> pd.DataFrame:
+        """Cycles and ON time of 'column' for many thresholds in one pass
+        (curve to choose the 'find_cycle' threshold). Same results of
+        'find_cycle' with a single threshold, except the ON time where the
+        data are exactly equal to a threshold\n
+        Args:
+            column (str): column for cycle identification
+            thresholds (np.ndarray | list[float] | None, optional): thresholds
+            to try. Defaults to None: 'n' thresholds between min and max.
+            n (int, optional): thresholds without 'thresholds'. Defaults to
+            100.
+        Returns:
+            pd.DataFrame: Threshold, Cicli and Time_on(s), by threshold"""
+        data = self.df[column].to_numpy()
+        if thresholds is None:
+            thresholds = np.linspace(np.nanmin(data), np.nanmax(data), n + 2)[1:-1]
+        soglie = np.unique(np.asarray(thresholds, dtype=np.float64))
+        soglie = soglie[np.isfinite(soglie)]
+        cicli, time_on = fnb.threshold_sweep_jit(
+            data, self.df.Date.to_numpy().view(np.int64), soglie
+        )
+        return pd.DataFrame({"Threshold": soglie, "Cicli": cicli, "Time_on(s)": time_on / 1e9})
+
+    def cycle_table(self, column: str, channels: list[str] | None = None) -> pd.DataFrame:
+        """Per-cycle table of 'column' (after 'find_cycle'): first and last
+        ON row, start date, duration and min/mean/max of each channel during
+        the cycle. Incomplete cycles at the data bounds are included\n
+        Args:
+            column (str): column for cycle identification
+            channels (list[str] | None, optional): channels for statistics.
+            Defaults to None: no statistics.
+        Returns:
+            pd.DataFrame: one row per cycle"""
+        cycle = self.cycle_data[column]
+        n = self.df.shape[0]
+        starts, ends = fnb.cycle_bounds_jit(cycle["on_index"], cycle["off_index"], n)
+        date = self.df.Date.to_numpy()
+        duration = date[np.minimum(ends, n - 1)] - date[starts]  # as 'cicli_time_jit'
+        table = {
+            "Start": starts,
+            "End": ends - 1,
+            "Date": date[starts],
+            "Duration(s)": duration / np.timedelta64(1, "s"),
+        }
+        for channel in channels or []:
+            c_min, c_mean, c_max = fnb.cycle_stats_jit(self.df[channel].to_numpy(), starts, ends)
+            table.update({f"{channel}_min": c_min, f"{channel}_mean": c_mean, f"{channel}_max": c_max})
+        return pd.DataFrame(table)
+
+    def clean_cycle(self, column_name: str):
+        """Remove not cycle time from data base on column passed. 'df_lt'
+        is a lazy view of the ON rows: only the retimed Date is computed,
+        the channels are compressed when used (see 'MaskedFrame')\n
+        Args:
+            column_name (str): column for cycle identification
+        """
+        date = self.df.Date.to_numpy().view(np.int64)
+        column_data = self.cycle_data[column_name]
+        spegnimenti = np.asarray(column_data["off_index"], dtype=np.int64)
+        accensioni = np.asarray(column_data["on_index"], dtype=np.int64)
+
+        retimed = fnb.retime_jit(date, spegnimenti, accensioni).view("timedelta64[ns]")
+        # used by follow mode to retime new rows
+        self.lt_column = column_name
+        if len(accensioni) > 0:  # offset of the last ON period
+            self.lt_offset = date[accensioni[-1]].view("timedelta64[ns]") - retimed[accensioni[-1]]
+        else:  # no ON (always ON or OFF): rows retimed from the first one
+            self.lt_offset = date[0].view("timedelta64[ns]")
+
+        keep = self.__on_rows(column_name)
+        self.df_lt = MaskedFrame(self.df, keep, retimed[keep])
+
+    def data_distribution(
+        self,
+        column_name: str,
+        current_mod: str = None,
+        x_min: float = 0,
+        x_max: float = 150,
+        n_bins: float = 150,
+    ):
+        """Calculates the distribution of values ​​over time of the selected
+        column. By default the column width is 1 and the range is 150"""
+        y, y_nan = self.__distribution(self.df_lt, column_name, current_mod, x_min, x_max, n_bins)
+        sec = np.timedelta64(1, "s")
+
+        self.lifetest_analyzed["distr"][column_name] = y
+        self.lifetest_analyzed["NaN"][column_name] = y_nan / sec
+        self.distr_params[column_name] = (current_mod, x_min, x_max, n_bins)
+
+        return y
+
+    def __distribution(
+        self,
+        data: MaskedFrame,
+        column_name: str,
+        current_mod: str | None,
+        x_min: float,
+        x_max: float,
+        n_bins: float,
+        start: int = 0,
+    ) -> tuple[np.ndarray, np.timedelta64]:
+        """Return seconds for each bin and NaN time of the rows of 'data'
+        from 'start'"""
+        current_column = data[column_name].iloc[start:].replace(0, np.nan).to_numpy()
+        if current_mod:
+            current_mod = data[current_mod].iloc[start:].replace(0, np.nan).to_numpy()
+        time = data.Date.to_numpy()[start:]
+        iteration = data.shape[0] - start - 1
+
+        x_range = int(x_max) - int(x_min)
+        n_bins = int(n_bins)
+        bar_width = x_range / n_bins
+        sec = np.timedelta64(1, "s")
+        return fnb.distribution_jit2(
+            current_column,
+            current_mod,
+            time,
+            iteration,
+            x_min,
+            n_bins,
+            bar_width,
+            sec,
+        )
+
+    def data_smoothing(self, column_name: str, revision=False) -> pd.Series:
+        """Calculate rolling window data of column passed\n
+        Args:
+            column_name (str): column data name
+            revision (bool, optional): tell if its not raw file. Defaults to
+            False.\n
+        Returns:
+            pd.Series: smoothed data (also in 'lifetest_analyzed')"""
+        if revision:
+            current_column = self.df_rev[column_name]
+        else:
+            current_column = self.df_lt[column_name]
+        y = current_column.dropna().replace(0, np.nan)
+        y = y.rolling(
+            1000,
+            min_periods=250,
+            win_type="kaiser",
+            center=True,
+            closed="neither",
+        ).mean(beta=8)
+
+        self.lifetest_analyzed["timeseries"][column_name] = y
+        return y
+
+    def create_export_file(
+        self,
+        new_file: str,
+        cicli_rslt: list[int],
+        merge_filename: str | None = None,
+        module: str = None,
+        smooth: bool = False,
+        x_max: int = 150,
+        n_bin: int = 150,
+        cycles: pd.DataFrame | None = None,
+    ) -> list[str]:
+        """Crea file excel di report con le distribuzioni di temperatura\n
+        Args:
+            new_file (str): report file (merged report with
+            'merge_filename'), timeseries in the '.parquet' with same name
+            cicli_rslt (list[int]): cycle result for selected column and
+            threshold
+            merge_filename (str | None, optional): cumulation file to merge
+            with. Defaults to None: no merge.
+            module (str, optional): Module to reset. Defaults to None.
+            smooth (bool, optional): if export timeseries too. Defaults to
+            False.
+            x_max (int, optional): X max value. Defaults to 150.
+            n_bin (int, optional): Number of histogram bins. Defaults to 150.
+            cycles (pd.DataFrame | None, optional): per-cycle table
+            ('cycle_table') for the 'Cycles' sheet, appended to the one of
+            'merge_filename'. Defaults to None: no sheet.\n
+        Returns:
+            list[str]: info messages"""
+        messages = []
+        try:
+            cicli_df = pd.DataFrame([cicli_rslt], columns=["Cicli", "Time_on(s)"])
+            step = int(x_max / n_bin)
+            export_data = pd.DataFrame(
+                data=self.lifetest_analyzed["distr"], index=list(range(0, x_max, step))
+            )
+            export_nan = pd.DataFrame(data=self.lifetest_analyzed["NaN"], index=["NotANumber"])
+            export_distr = pd.concat([export_data, export_nan])
+            if smooth:
+                export_timeseries = pd.DataFrame(data=self.lifetest_analyzed["timeseries"])
+                export_timeseries.insert(0, "Date", self.df_lt.Date)
+
+            if merge_filename is None:
+                export_mean = self.__data_distr_mean_jit(export_distr)
+                export_df = pd.concat([export_distr, export_mean])
+
+                if new_file.endswith(".xlsx") is True:
+                    with pd.ExcelWriter(new_file) as writer:
+                        export_df.to_excel(writer, sheet_name="Distribution")
+                        cicli_df.to_excel(writer, sheet_name="Cicli")
+                        if cycles is not None:
+                            cycles.to_excel(writer, sheet_name="Cycles", index=False)
+                elif new_file.endswith(".xls") is True:
+                    new_file = new_file.replace(".xls", ".xlsx")
+                    with pd.ExcelWriter(new_file) as writer:
+                        export_df.to_excel(
+                            writer,
+                            sheet_name="Distribution",
+                            engine="xlsxwriter",
+                        )
+                        cicli_df.to_excel(writer, sheet_name="Cicli")
+                        if cycles is not None:
+                            cycles.to_excel(writer, sheet_name="Cycles", index=False)
+                    messages.append(
+                        "Il formato xls non è più supportato\nE' stato salvato in formato xlxs"
+                    )
+                if smooth:
+                    new_file = new_file.replace(".xlsx", ".parquet")
+                    export_timeseries.to_parquet(new_file, engine="fastparquet")
+
+            # ----- MERGE ----- #
+            else:
+                merged_filename = new_file
+                try:
+                    sheet = 0
+                    to_merge_f_xl = pd.read_excel(
+                        io=merge_filename,
+                        sheet_name=sheet,
+                        index_col=0,
+                        skipfooter=2,
+                    )
+                    to_merge_cicli = pd.read_excel(
+                        io=merge_filename, sheet_name=sheet + 1, index_col=0
+                    )
+                    columns_1 = to_merge_f_xl.columns.to_list()
+                    columns_2 = export_distr.columns.to_list()
+                    if module.isnumeric():
+                        module_match = [f"{x}{int(module)}" for x in MODULE_CHANNELS]
+                        col_to_drop = [
+                            col
+                            for col in to_merge_f_xl.columns
+                            if any(x in col for x in module_match)
+                        ]
+                        to_merge_f_xl.drop(col_to_drop, axis=1, inplace=True)
+                    columns = list(set(columns_2) - set(columns_1)) + columns_1
+                    df_merge = to_merge_f_xl.add(export_distr, fill_value=0)
+                    export_mean = self.__data_distr_mean_jit(df_merge)
+                    df_merge = pd.concat([df_merge, export_mean])
+                    df_merge = df_merge[columns]
+                    cicli_merge = to_merge_cicli.add(cicli_df, fill_value=0)
+                    if cycles is not None:
+                        sheets = pd.ExcelFile(merge_filename).sheet_names
+                        if "Cycles" in sheets:
+                            to_merge_cycles = pd.read_excel(merge_filename, sheet_name="Cycles")
+                            cycles = pd.concat([to_merge_cycles, cycles], ignore_index=True)
+
+                    with pd.ExcelWriter(merged_filename) as writer:
+                        df_merge.to_excel(writer, sheet_name="Distribution", columns=columns)
+                        cicli_merge.to_excel(writer, sheet_name="Cicli")
+                        if cycles is not None:
+                            cycles.to_excel(writer, sheet_name="Cycles", index=False)
+                except Exception:
+                    raise Warning("Nessun file xlsx unito")
+
+                if smooth:
+                    try:
+                        to_merge_timeseries = pd.read_parquet(
+                            merge_filename.replace(".xlsx", ".parquet"),
+                            engine="fastparquet",
+                        )
+                        if module.isnumeric():
+                            module_match = [f"PM{int(module)}"]
+                            col_to_drop = [
+                                col
+                                for col in to_merge_f_xl.columns
+                                if any(x in col for x in module_match)
+                            ]
+                            to_merge_timeseries.drop(col_to_drop, axis=1, inplace=True)
+                        delta_t = to_merge_timeseries.Date.values[-1] + np.timedelta64(15, "s")
+                        export_timeseries.Date = export_timeseries.Date + delta_t  # noqa: E501
+                        merge_timeseries = pd.concat(
+                            [to_merge_timeseries, export_timeseries],
+                            ignore_index=True,
+                        )
+                        merge_timeseries.to_parquet(
+                            merged_filename.replace(".xlsx", ".parquet"),
+                            engine="fastparquet",
+                        )
+                    except Exception:
+                        raise Warning("Nessun file parquet unito")
+
+        except Exception as e:
+            raise (e)
+        return messages
+
+    def lifetest_export(
+        self,
+        new_file: str,
+        column: str,
+        threshold: float | tuple,
+        distr_columns: list[str],
+        x_max: int = 150,
+        n_bin: int = 150,
+        smooth: bool = False,
+        merge_filename: str | None = None,
+        module: str = None,
+        cycle_channels: list[str] | None = None,
+    ) -> list[str]:
+        """LifeTest report: cycles of 'column' ('find_cycle'), clean cycle
+        data ('clean_cycle'), distribution (and smoothing) of each column,
+        export ('create_export_file')\n
+        Args:
+            new_file (str): report file, see 'create_export_file'
+            column (str): column for cycle identification
+            threshold (float | tuple): threshold of 'column', see 'find_cycle'
+            distr_columns (list[str]): columns to export
+            x_max (int, optional): X max value. Defaults to 150.
+            n_bin (int, optional): Number of histogram bins. Defaults to 150.
+            smooth (bool, optional): export timeseries too. Defaults to False.
+            merge_filename (str | None, optional): see 'create_export_file'.
+            Defaults to None.
+            module (str, optional): see 'create_export_file'. Defaults to
+            None.
+            cycle_channels (list[str] | None, optional): export also the
+            per-cycle table ('cycle_table') with these channels. Defaults to
+            None: no table.\n
+        Returns:
+            list[str]: info messages"""
+        self.lifetest_analyzed = {"distr": {}, "NaN": {}, "timeseries": {}}
+        cicli_rslt = self.find_cycle((column, threshold))[column]
+        if isinstance(cicli_rslt[1], dt.timedelta):  # 0 without cycles
+            cicli_rslt[1] = cicli_rslt[1].total_seconds()
+
+        self.clean_cycle(column)
+        for distr_column in distr_columns:
+            if any(x in distr_column for x in MODULE_CHANNELS):
+                mod = distr_column[-3:]
+                self.data_distribution(distr_column, f"Iout_{mod}", x_max=x_max, n_bins=n_bin)
+            else:
+                self.data_distribution(distr_column, x_max=x_max, n_bins=n_bin)
+            if smooth:
+                self.data_smoothing(distr_column)
+
+        return self.create_export_file(
+            new_file,
+            cicli_rslt=cicli_rslt,
+            merge_filename=merge_filename,
+            module=module,
+            smooth=smooth,
+            x_max=x_max,
+            n_bin=n_bin,
+            cycles=None if cycle_channels is None else self.cycle_table(column, cycle_channels),
+        )
+
+    def __data_distr_mean_jit(self, data: pd.DataFrame) -> pd.DataFrame:
+        """Return new Dataframe with Mean and total time in hours of data
+        passed\n
+        Args:
+            data (pd.DataFrame): data to used"""
+        means = {}
+        time = {}
+        iteration = data.shape[0] - 1
+        for column in data.columns:
+            means[column], time[column] = fnb.ponderate_mean(data[column].to_numpy(), iteration)
+        data = [means, time]
+        distr_mean = pd.DataFrame(data=data, index=["mean", "time"])
+        return distr_mean
+
+    ##########################################
+    # ############ FOLLOW FUNCT ############ #
+    ##########################################
+    def follow_start(self, filepath: str):
+        """Follow a growing log: next 'follow_update' read only the bytes
+        written after the import\n
+        Args:
+            filepath (str): active log file (already imported in 'df')"""
+        self.follower = TailReader(
+            filepath, self.file_sizes.get(filepath, 0), self.df.columns[1:].to_list()
+        )
+        self.df_buffer = ChannelBuffer(self.df)
+        self.df = self.df_buffer.frame()
+        if self.df_lt is not None:
+            self.df_lt.data = self.df  # same rows, the imported copy can be freed
+
+    def follow_stop(self):
+        """Stop following the log, 'df' keeps the read rows"""
+        self.follower = None
+        self.df_buffer = None
+
+    def follow_update(self) -> int:
+        """Append to 'df' the rows written since the last call and update
+        cycles, clean cycle data and distributions with the new rows only\n
+        Returns:
+            int: number of new rows"""
+        rows = self.follower.read_new()
+        rows = rows[rows.Date > self.df.Date.iloc[-1]]  # already imported
+        if rows.shape[0] == 0:
+            return 0
+        start = self.df.shape[0]
+        rows = rows.reindex(columns=self.df.columns).set_axis(
+            pd.RangeIndex(start, start + rows.shape[0])
+        )
+        self.df_buffer.append(rows)
+        self.df = self.df_buffer.frame()
+
+        if self.df_lt is not None:
+            cycle = self.cycle_data[self.lt_column]
+            known = len(cycle["on_index"]), len(cycle["off_index"])
+        for col in self.cycle_data:
+            self.__follow_cycle(col, start)
+        if self.df_lt is not None:
+            self.__follow_clean_cycle(start, *known)
+        return self.df.shape[0] - start
+
+    def __follow_cycle(self, col: str, start: int):
+        """Add ON/OFF found from row 'start' to 'cycle_data' and update cycles
+        and ON time with the new edges only. With hysteresis or dwell the
+        edges are found again on all rows (an ON/OFF started before 'start'
+        can be confirmed now): if the known ones change, all pairs are
+        summed again"""
+        cycle = self.cycle_data[col]
+        if self.__debounced(cycle):
+            spegnimenti, accensioni = self.__cycle_edges(col)
+            if not (
+                np.array_equal(spegnimenti[: len(cycle["off_index"])], cycle["off_index"])
+                and np.array_equal(accensioni[: len(cycle["on_index"])], cycle["on_index"])
+            ):
+                cycle.pop("paired", None)
+            cycle["off_index"], cycle["on_index"] = spegnimenti, accensioni
+        else:
+            data = self.df[col].to_numpy()[start - 1 :]  # previous row for the first edge
+            spegnimenti, accensioni = fnb.speg_acc_index(data, cycle["threshold"])
+            cycle["off_index"] = np.concatenate(
+                [cycle["off_index"], spegnimenti + start - 1]
+            ).astype(np.int64)
+            cycle["on_index"] = np.concatenate(
+                [cycle["on_index"], accensioni + start - 1]
+            ).astype(np.int64)
+        cycle["cycle"], cycle["time_on"] = self.__follow_cicli_time(cycle)
+
+    def __follow_clean_cycle(self, start: int, known_on: int, known_off: int):
+        """Retime (as 'clean_cycle') the rows from 'start', append the ON rows
+        to 'df_lt' and add their contribution to the distributions. If an
+        ON/OFF confirmed now starts before 'start' (minimum dwell) the
+        rows already in 'df_lt' change: all is computed again\n
+        Args:
+            start (int): first new row
+            known_on (int): ON found before the new rows
+            known_off (int): OFF found before the new rows"""
+        cycle = self.cycle_data[self.lt_column]
+        accensioni, spegnimenti = cycle["on_index"], cycle["off_index"]
+        if (accensioni[known_on:] < start).any() or (spegnimenti[known_off:] < start).any():
+            self.clean_cycle(self.lt_column)
+            for column_name in list(self.lifetest_analyzed["distr"]):
+                self.data_distribution(column_name, *self.distr_params[column_name])
+            return
+        date = self.df.Date.to_numpy().view("timedelta64[ns]")
+
+        # every new ON adds the OFF time before it to the offset
+        new_on = accensioni[known_on:]
+        before = np.searchsorted(spegnimenti, new_on) - 1
+        prev_off = np.zeros_like(new_on)  # no OFF before: start of the log
+        prev_off[before >= 0] = spegnimenti[before[before >= 0]]
+        offsets = np.concatenate(
+            [[self.lt_offset], self.lt_offset + np.cumsum(date[new_on] - date[prev_off])]
+        )
+        period = np.searchsorted(new_on, np.arange(start, date.shape[0]), side="right")
+        self.lt_offset = offsets[-1]
+
+        keep = self.__on_rows(self.lt_column, start)
+        lt_start = self.df_lt.size
+        self.df_lt.append(self.df, keep, (date[start:] - offsets[period])[keep])
+        if self.df_lt.size == lt_start:
+            return
+
+        # distributions: new rows and the previous one (its time step)
+        sec = np.timedelta64(1, "s")
+        for column_name, y in self.lifetest_analyzed["distr"].items():
+            y_new, y_nan = self.__distribution(
+                self.df_lt, column_name, *self.distr_params[column_name], start=max(lt_start - 1, 0)
+            )
+            y += y_new
+            self.lifetest_analyzed["NaN"][column_name] += y_nan / sec
+
+    ##########################################
+    # ########### THERMAL FUNCT ########### #
+    ##########################################
+    def smoothing(self, y: pd.Series | np.ndarray) -> np.ndarray:
+        """Smoothing dei dati tramite 'savgol_filter'\n
+        Args:
+            y (pd.Series|np.ndarray): Dati su cui eseguire lo smooothing
+
+        Returns:
+            np.ndarray: smoothing data"""
+        y = savgol_filter(y, 53, 3)  # window size used for filtering  # order of fitted polynomial
+        return y
+
+    def data_elaboration(self, data: str, index: list[int] = None) -> None:
+        """Elabora i dati\n
+        Args:
+            data (str): Nome della serie da elaborare
+            index (list[int], optional): lista con indice di partenza e indice
+            di fine per calcoli su zona specifica. Defaults to None.\n
+        Returns:
+            tuple[float,tuple[float],float,tuple[float]]: restituisce
+            'mean, max-min, mean(spec), max-min(spec)'"""
+        # mean = self.df[data][decim:].mean()
+        # max = self.df[data].max()
+        # min = self.df[data].min()
+
+        subdf = self.df.loc[:, self.df.columns != "Date"].copy()
+        subdf.replace(0, np.NaN, inplace=True)
+        subdf.interpolate(axis=0, method="linear", limit=3, inplace=True)
+        if index is not None:
+            mean_p = subdf[data][index[0] : index[1]].mean()
+            max_p = subdf[data][index[0] : index[1]].max()
+            min_p = subdf[data][index[0] : index[1]].min()
+        else:
+            mean_p = np.nan
+            max_p = np.nan
+            min_p = np.nan
+
+        self.span_data[data] = [mean_p, max_p, min_p]
+
+    def thermal_data(
+        self, index: list[int] | None = None
+    ) -> tuple[pd.DataFrame, pd.DataFrame, pd.DataFrame]:
+        """Return data to export, their mean and peak to peak\n
+        Args:
+            index (list[int] | None, optional): start and end index of the
+            selected span. Defaults to None: all data.\n
+        Returns:
+            tuple[pd.DataFrame, pd.DataFrame, pd.DataFrame]: data (Date
+            index), mean, max-min"""
+        try:
+            sub_data = self.df[index[0] : index[1]].copy()
+        except Exception:
+            sub_data = self.df.copy()
+        finally:
+            sub_data.set_index("Date", inplace=True)
+        data_mean = sub_data.mean().to_frame().transpose()
+        data_mean.set_index(pd.Series(sub_data.index.array[0]), inplace=True)
+        data_ptp = (sub_data.max() - sub_data.min()).to_frame().transpose()
+        data_ptp.set_index(pd.Series(sub_data.index.array[0]), inplace=True)
+        return sub_data, data_mean, data_ptp
+
+    def rainflow(self, column: str, index: list[int] | None = None, **bins) -> RainflowCount:
+        """Rainflow count of the thermal cycles of 'column' (range and mean
+        histograms, see 'RainflowCount')\n
+        Args:
+            column (str): channel, e.g. T_PFC_PM1
+            index (list[int] | None, optional): see 'thermal_data'. Defaults
+            to None: all data.
+            **bins: bins of 'RainflowCount'\n
+        Returns:
+            RainflowCount: cycles, to merge with the next files ('merge') or
+            save"""
+        data = self.df[column].to_numpy()
+        if index is not None:
+            data = data[index[0] : index[1]]
+        rainflow = RainflowCount(**bins)
+        rainflow.add(data)
+        return rainflow
+
+    def export_thermal_data(self, filename: str, index: list[int] | None = None, merge=False):
+        """Export data, mean and peak to peak (see 'thermal_data') in an
+        excel file\n
+        Args:
+            filename (str): excel file
+            index (list[int] | None, optional): see 'thermal_data'. Defaults
+            to None.
+            merge (bool, optional): append to the data already in 'filename'.
+            Defaults to False.
+        """
+        sub_data, data_mean, data_ptp = self.thermal_data(index)
+
+        if merge:
+            sheet = 0
+            to_merge_data = pd.read_excel(io=filename, sheet_name=sheet, index_col=0)
+            to_merge_mean = pd.read_excel(io=filename, sheet_name=sheet + 1, index_col=0)
+            to_merge_ptp = pd.read_excel(io=filename, sheet_name=sheet + 2, index_col=0)
+            sub_data = pd.concat([to_merge_data, sub_data])
+            data_mean = pd.concat([to_merge_mean, data_mean])
+            data_ptp = pd.concat([to_merge_ptp, data_ptp])
+
+        with pd.ExcelWriter(filename, engine="openpyxl") as writer:
+            sub_data.to_excel(writer, sheet_name="Data")
+            data_mean.to_excel(writer, sheet_name="Mean")
+            data_ptp.to_excel(writer, sheet_name="PtP")
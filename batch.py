@@ -0,0 +1,215 @@
+#!/usr/bin/env python
+"""
+Export LifeTest (cicli e distribuzioni) di tutti i test di una cartella,
+senza GUI, un processo per test.\n
+    python batch.py D:/prove --column Iout_PM1 --threshold 10 --preset THOR
+    python batch.py "D:/prove/*/2024-*" -c Temp -t 40 -w 2 -r 150 --smooth
+    python batch.py D:/prove -c Iout_PM1 -t 10 --off-threshold 8 --min-dwell 5
+"""
+import argparse
+import glob
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from os import path
+
+import yaml
+
+from analysis import APP_PATH, RAW_EXTENSIONS, Model, cycle_option
+from reader import clean_name
+
+
+def find_tests(source: str, exclude: str | None = None) -> dict[str, tuple[str]]:
+    """Tests in 'source' (directory or glob): every RAW file is a test,
+    every directory is a test with all its RAW files (imported together)\n
+    Args:
+        source (str): directory or glob pattern
+        exclude (str | None, optional): directory to skip (reports).
+        Defaults to None.\n
+    Returns:
+        dict[str, tuple[str]]: test name and its files"""
+    if path.isdir(source):
+        entries = [path.join(source, entry) for entry in os.listdir(source)]
+    else:
+        entries = glob.glob(source)
+
+    def raw_files(directory: str) -> tuple[str]:
+        files = (path.join(directory, file) for file in sorted(os.listdir(directory)))
+        return tuple(file for file in files if file.lower().endswith(RAW_EXTENSIONS))
+
+    tests = {}
+    for entry in sorted(entries):
+        if exclude is not None and path.abspath(entry) == path.abspath(exclude):
+            continue
+        name = path.splitext(path.basename(entry))[0]
+        if path.isdir(entry):
+            files = raw_files(entry)
+            if files:
+                tests[name] = files
+        elif entry.lower().endswith(RAW_EXTENSIONS):
+            tests[name] = (entry,)
+    return tests
+
+
+def preset_columns(name: str) -> list[str] | None:
+    """Columns of a LifeTest preset of 'preset.yaml' (None for 'ALL')"""
+    if name == "ALL":
+        return None
+    with open(path.join(APP_PATH, "preset.yaml"), "r") as f:
+        preset = yaml.safe_load(f)
+    if name not in preset["lifetest"]:
+        raise ValueError(f"Preset '{name}' not found: {', '.join(preset['lifetest'])}")
+    return [clean_name(col) for col in preset["lifetest"][name]]
+
+
+def export_test(name: str, files: tuple[str], options: dict) -> dict:
+    """Import a test and export its LifeTest report (run in a worker
+    process)\n
+    Args:
+        name (str): test name (report file name)
+        files (tuple[str]): test RAW files
+        options (dict): 'run' parameters\n
+    Returns:
+        dict: test, report file, rows, seconds, messages"""
+    start = time.perf_counter()
+    model = Model(None, options["cache_dir"])
+    model.read_workers = 1  # tests already run in parallel
+    column = options["column"]
+    columns = options["columns"]
+    if columns is not None:  # read only the preset channels
+        model.projection = [*columns, column]
+    model.load_files(files)
+    if column not in model.df.columns:
+        raise ValueError(f"Column '{column}' not found")
+    if columns is None:
+        distr_columns = model.df.columns[1:].to_list()
+    else:
+        distr_columns = [col for col in columns if col in model.df.columns]
+
+    new_file = path.join(options["output"], f"{name}.xlsx")
+    messages = model.lifetest_export(
+        new_file,
+        column,
+        options["threshold"],
+        distr_columns,
+        x_max=options["x_max"],
+        n_bin=options["n_bin"],
+        smooth=options["smooth"],
+        cycle_channels=distr_columns if options["cycle_table"] else None,
+    )
+    warnings = model.import_warnings
+    for key, label in (("obj_col", "mixed columns"), ("nan_col", "NaN columns"),
+                       ("overlap_files", "overlapping files")):
+        if warnings.get(key):
+            messages.append(f"{len(warnings[key])} {label}")
+    if warnings.get("date_rows"):
+        messages.append(f"{warnings['date_rows']} rows without date")
+    return {
+        "test": name,
+        "file": new_file,
+        "rows": model.df.shape[0],
+        "seconds": time.perf_counter() - start,
+        "messages": messages,
+    }
+
+
+def run(tests: dict[str, tuple[str]], options: dict, workers: int | None = None) -> list[dict]:
+    """Export all tests in parallel, print each result as it completes\n
+    Args:
+        tests (dict[str, tuple[str]]): see 'find_tests'
+        options (dict): column, threshold, x_max, n_bin, columns (None: all),
+        smooth, cycle_table, output, cache_dir
+        workers (int | None, optional): processes. Defaults to None: cpu
+        count.\n
+    Returns:
+        list[dict]: results (see 'export_test'), failed tests with 'error'"""
+    results = []
+    with ProcessPoolExecutor(max_workers=min(len(tests), workers or os.cpu_count() or 1)) as pool:
+        futures = {
+            pool.submit(export_test, name, files, options): name for name, files in tests.items()
+        }
+        for n_done, future in enumerate(as_completed(futures), start=1):
+            name = futures[future]
+            try:
+                result = future.result()
+            except Exception as error:
+                message = str(error).replace("\n", " ")
+                result = {"test": name, "error": f"{type(error).__name__}: {message}"}
+            results.append(result)
+            status = result.get("error") or f"{result['rows']:,} rows {result['seconds']:.1f} s"
+            print(f"[{n_done}/{len(tests)}] {name}: {status}", flush=True)
+    return results
+
+
+def summary(results: list[dict], seconds: float) -> str:
+    """Return timings of exported tests and errors of failed ones"""
+    done = sorted((r for r in results if "error" not in r), key=lambda r: -r["seconds"])
+    failed = [r for r in results if "error" in r]
+    lines = [f"\n{len(done)} exported, {len(failed)} failed in {seconds:.1f} s"]
+    for r in done:
+        notes = f"  ({'; '.join(r['messages'])})" if r["messages"] else ""
+        lines.append(f"  {r['test']:<30}{r['rows']:>12,} rows{r['seconds']:>9.1f} s{notes}")
+    if failed:
+        lines.append("FAILED:")
+        lines += [f"  {r['test']:<30}{r['error']}" for r in failed]
+    return "\n".join(lines)
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(
+        description="Export LifeTest distributions of every test in a directory"
+    )
+    parser.add_argument("source", help="directory of tests (files or folders) or glob")
+    parser.add_argument("-c", "--column", required=True, help="cycle column")
+    parser.add_argument("-t", "--threshold", type=float, required=True, help="cycle ON threshold")
+    parser.add_argument("--off-threshold", type=float, help="cycle OFF threshold (hysteresis)")
+    parser.add_argument(
+        "--min-dwell", type=float, default=0, help="ignore ON/OFF shorter than seconds"
+    )
+    parser.add_argument("-w", "--width", type=int, default=1, help="bar width (default 1)")
+    parser.add_argument("-r", "--range", type=int, default=150, help="x range (default 150)")
+    parser.add_argument("-p", "--preset", default="ALL", help="LifeTest preset (default ALL)")
+    parser.add_argument("--smooth", action="store_true", help="export timeseries too")
+    parser.add_argument(
+        "--cycle-table", action="store_true", help="export per-cycle stats of the columns too"
+    )
+    parser.add_argument("-o", "--output", help="report folder (default: 'export' in source)")
+    parser.add_argument("-j", "--workers", type=int, help="processes (default: cpu count)")
+    parser.add_argument("--cache-dir", help="import cache folder (default: APP_PATH/cache)")
+    args = parser.parse_args(argv)
+
+    source_dir = args.source if path.isdir(args.source) else os.getcwd()
+    output = args.output or path.join(source_dir, "export")
+    tests = find_tests(args.source, exclude=output)
+    if not tests:
+        parser.error(f"no test found in {args.source}")
+    os.makedirs(output, exist_ok=True)
+    n_bin = round(args.range / args.width)  # as LT_ExportOpt
+    threshold = args.threshold
+    if args.off_threshold is not None or args.min_dwell > 0:
+        off_threshold = args.threshold if args.off_threshold is None else args.off_threshold
+        threshold = (args.threshold, off_threshold, args.min_dwell)
+        try:
+            cycle_option(threshold)
+        except ValueError as error:
+            parser.error(str(error))
+    options = {
+        "column": clean_name(args.column),
+        "threshold": threshold,
+        "x_max": args.width * n_bin,
+        "n_bin": n_bin,
+        "columns": preset_columns(args.preset),
+        "smooth": args.smooth,
+        "cycle_table": args.cycle_table,
+        "output": output,
+        "cache_dir": args.cache_dir,
+    }
+
+    start = time.perf_counter()
+    results = run(tests, options, args.workers)
+    print(summary(results, time.perf_counter() - start))
+    return 1 if any("error" in result for result in results) else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,331 @@
+#!/usr/bin/env python
+"""
+Archivio su disco dei dati importati: un file .npy contiguo per canale,
+aperto con numpy memmap (nessuna lettura finché il canale non è usato)
+"""
+import json
+from pathlib import Path
+from typing import Callable
+
+import numpy as np
+import pandas as pd
+
+
+class ChannelStore:
+    """Test data saved in a folder as one contiguous '.npy' file per channel
+    (datetime channels as int64 ns) plus a 'meta.json' file.\n
+    Channels are opened with memmap in copy-on-write mode: they are read from
+    disk only when used, the numba kernels run directly on them and in place
+    changes never reach the files"""
+
+    META = "meta.json"  # written last: its presence marks a complete store
+
+    def __init__(self, directory: str):
+        """Open an existing store\n
+        Args:
+            directory (str): store folder\n
+        Raises:
+            FileNotFoundError: if the store is missing or incomplete"""
+        self.directory = Path(directory)
+        with open(self.directory / self.META, "r") as f:
+            self.meta: dict = json.load(f)
+
+    @property
+    def columns(self) -> list[str]:
+        """Channel names, in DataFrame order"""
+        return self.meta["columns"]
+
+    @property
+    def info(self) -> dict:
+        """Extra data saved with the store (e.g. import warnings)"""
+        return self.meta["info"]
+
+    @classmethod
+    def write(cls, directory: str, data: pd.DataFrame, info: dict | None = None) -> "ChannelStore":
+        """Save all DataFrame columns as channels and return the opened store\n
+        Args:
+            directory (str): store folder, created if missing
+            data (pd.DataFrame): data to save
+            info (dict | None, optional): extra json data. Defaults to None."""
+        directory = Path(directory)
+        directory.mkdir(parents=True, exist_ok=True)
+        dates = []
+        for i, col in enumerate(data.columns):
+            if cls._save_channel(directory, i, data[col]):
+                dates.append(col)
+        return cls._write_meta(directory, data.columns.to_list(), dates, info)
+
+    @classmethod
+    def from_parquet(
+        cls,
+        directory: str,
+        parquet_path: str,
+        columns: list[str],
+        info: dict | None = None,
+        transform: Callable[[pd.Series], pd.Series] | None = None,
+    ) -> "ChannelStore":
+        """Convert a parquet file one column at a time (bounded memory) and
+        return the opened store\n
+        Args:
+            directory (str): store folder, created if missing
+            parquet_path (str): parquet file to convert
+            columns (list[str]): columns to save
+            info (dict | None, optional): extra json data. Defaults to None.
+            transform (Callable[[pd.Series], pd.Series] | None, optional):
+            applied to every column before saving (e.g. dtype change).
+            Defaults to None."""
+        directory = Path(directory)
+        directory.mkdir(parents=True, exist_ok=True)
+        dates = []
+        for i, col in enumerate(columns):
+            series = pd.read_parquet(parquet_path, engine="fastparquet", columns=[col])[col]
+            if transform is not None:
+                series = transform(series)
+            if cls._save_channel(directory, i, series):
+                dates.append(col)
+        return cls._write_meta(directory, columns, dates, info)
+
+    @classmethod
+    def _save_channel(cls, directory: Path, index: int, series: pd.Series) -> bool:
+        """Save a channel as 'c<index>.npy'. Return True for a datetime channel"""
+        is_date = pd.api.types.is_datetime64_dtype(series.dtype)
+        if is_date:
+            array = series.to_numpy(dtype="datetime64[ns]").view("int64")
+        else:
+            array = series.to_numpy()
+        np.save(directory / f"c{index}.npy", np.ascontiguousarray(array))
+        return is_date
+
+    @classmethod
+    def _write_meta(
+        cls, directory: Path, columns: list[str], dates: list[str], info: dict | None
+    ) -> "ChannelStore":
+        meta = {"columns": columns, "dates": dates, "info": info or {}}
+        with open(directory / cls.META, "w") as f:
+            json.dump(meta, f)
+        return cls(directory)
+
+    def channel(self, name: str) -> np.ndarray:
+        """Return a zero-copy view of a channel (datetime64[ns] for dates)"""
+        file = self.directory / f"c{self.columns.index(name)}.npy"
+        try:
+            array = np.load(file, mmap_mode="c")
+        except ValueError:  # empty channel cannot be mapped
+            array = np.load(file)
+        if name in self.meta["dates"]:
+            return array.view("datetime64[ns]")
+        return array
+
+    def frame(self, columns: list[str] | None = None) -> pd.DataFrame:
+        """Return a DataFrame backed by the channel memmaps (one block per
+        column, no consolidation copy)\n
+        Args:
+            columns (list[str] | None, optional): channels to include.
+            Defaults to None: all channels."""
+        columns = self.columns if columns is None else columns
+        return pd.DataFrame({col: self.channel(col) for col in columns}, copy=False)
+
+    def nbytes(self) -> int:
+        """Disk size of the store"""
+        return sum(file.stat().st_size for file in self.directory.iterdir())
+
+
+class ChannelBuffer:
+    """In memory channels (and index) growing in place: capacity is doubled
+    when full, so appending rows costs (amortised) only the new rows and
+    'frame' returns zero-copy views"""
+
+    MIN_CAPACITY = 1024
+
+    def __init__(self, data: pd.DataFrame):
+        """Args:
+            data (pd.DataFrame): starting data, copied once in the buffer
+        """
+        self.columns = data.columns.to_list()
+        self.size = data.shape[0]
+        capacity = max(2 * self.size, self.MIN_CAPACITY)
+        self._channels: dict[str, np.ndarray] = {}
+        for col, array in [(None, data.index.to_numpy())] + [
+            (col, data[col].to_numpy()) for col in self.columns
+        ]:
+            self._channels[col] = np.empty(capacity, dtype=array.dtype)
+            self._channels[col][: self.size] = array
+
+    @property
+    def capacity(self) -> int:
+        return len(self._channels[None])
+
+    def append(self, rows: pd.DataFrame):
+        """Append rows (same columns of the buffer)"""
+        n_rows = rows.shape[0]
+        end = self.size + n_rows
+        if end > self.capacity:
+            capacity = max(2 * end, self.MIN_CAPACITY)
+            for col, channel in self._channels.items():
+                grown = np.empty(capacity, dtype=channel.dtype)
+                grown[: self.size] = channel[: self.size]
+                self._channels[col] = grown
+        for col, channel in self._channels.items():
+            array = rows.index.to_numpy() if col is None else rows[col].to_numpy()
+            if col is not None and not self._fits(array, channel.dtype):
+                channel = self._channels[col] = channel.astype(np.float64)
+            channel[self.size : end] = array.astype(channel.dtype, copy=False)
+        self.size = end
+
+    @staticmethod
+    def _fits(array: np.ndarray, dtype: np.dtype) -> bool:
+        """False if an integer (compact) channel can't hold the new values
+        (NaN, decimals or out of range)"""
+        if dtype.kind not in "iu" or array.dtype.kind in "iu" or array.size == 0:
+            return True
+        info = np.iinfo(dtype)
+        return bool(
+            np.isfinite(array).all()
+            and (array == np.round(array)).all()
+            and array.min() >= info.min
+            and array.max() <= info.max
+        )
+
+    def frame(self) -> pd.DataFrame:
+        """Return a DataFrame of views on the filled part of the buffer"""
+        return pd.DataFrame(
+            {col: self._channels[col][: self.size] for col in self.columns},
+            index=pd.Index(self._channels[None][: self.size], copy=False),
+            copy=False,
+        )
+
+
+class MaskedFrame:
+    """Rows of a DataFrame selected by a boolean mask, with their own
+    'Date', without copying the other channels: a channel is compressed
+    (only the kept rows) the first time it is asked for and then kept.\n
+    Compressed channels are kept up to 'MAX_BYTES' (least recently used
+    dropped first, 'Date' and index always kept) and can be released with
+    'drop'. Rows can be appended (follow mode): mask, dates and compressed
+    channels grow in place as in 'ChannelBuffer'. Used as a read only
+    DataFrame: 'columns', 'shape', 'index', 'Date' and data[column]"""
+
+    MIN_CAPACITY = 1024
+    MAX_BYTES = 1024**3  # compressed channels kept ('Date' and index excluded)
+
+    def __init__(self, data: pd.DataFrame, keep: np.ndarray, date: np.ndarray):
+        """Args:
+            data (pd.DataFrame): all rows ('Date' first, not used)
+            keep (np.ndarray): bool mask of the rows of 'data'
+            date (np.ndarray): 'Date' of the kept rows
+        """
+        self.data = data
+        self.rows = len(keep)  # rows of 'data' covered by the mask
+        self.size = len(date)  # kept rows
+        self._keep = keep
+        self._channels: dict[str | None, np.ndarray] = {"Date": date}
+
+    @property
+    def columns(self) -> pd.Index:
+        return self.data.columns
+
+    @property
+    def shape(self) -> tuple[int, int]:
+        return self.size, len(self.columns)
+
+    @property
+    def keep(self) -> np.ndarray:
+        """Bool mask of the rows of 'data'"""
+        return self._keep[: self.rows]
+
+    @property
+    def index(self) -> pd.Index:
+        """Index of the kept rows"""
+        return pd.Index(self.channel(None), copy=False)
+
+    @property
+    def Date(self) -> pd.Series:
+        return self["Date"]
+
+    def __getitem__(self, column: str) -> pd.Series:
+        return pd.Series(self.channel(column), index=self.index, name=column, copy=False)
+
+    def channel(self, column: str | None) -> np.ndarray:
+        """Return the kept rows of a channel (None: index), compressed now
+        if not asked for before"""
+        channel = self._channels.pop(column, None)
+        if channel is None:
+            if column is None:
+                array = self.data.index.to_numpy()
+            else:
+                array = self.data[column].to_numpy()
+            channel = array[: self.rows][self.keep]
+        self._channels[column] = channel  # last used at the end
+        self._trim()
+        return channel[: self.size]
+
+    def frame(self, columns: list[str] | None = None) -> pd.DataFrame:
+        """Return a DataFrame of the kept rows (channels compressed now are
+        kept too)\n
+        Args:
+            columns (list[str] | None, optional): channels to include.
+            Defaults to None: all channels."""
+        columns = self.columns if columns is None else columns
+        return pd.DataFrame(
+            {col: self.channel(col) for col in columns}, index=self.index, copy=False
+        )
+
+    def cached(self) -> list[str]:
+        """Channels already compressed"""
+        return [col for col in self._channels if col is not None]
+
+    def drop(self, columns: list[str] | None = None):
+        """Release compressed channels (compressed again when asked for)\n
+        Args:
+            columns (list[str] | None, optional): channels to release.
+            Defaults to None: all but 'Date'."""
+        columns = self.cached() if columns is None else columns
+        for col in columns:
+            if col != "Date":
+                self._channels.pop(col, None)
+
+    def _trim(self):
+        """Drop the least recently used channels over 'MAX_BYTES' (the last
+        used is kept)"""
+        lru = [col for col in self._channels if col not in (None, "Date")]
+        total = sum(self._channels[col].nbytes for col in lru)
+        for col in lru[:-1]:
+            if total <= self.MAX_BYTES:
+                break
+            total -= self._channels.pop(col).nbytes
+
+    def append(self, data: pd.DataFrame, keep: np.ndarray, date: np.ndarray):
+        """Extend the mask over the new rows of 'data' (the same rows plus
+        the new ones at the end) and add the 'Date' of the new kept rows.
+        Compressed channels are extended with the new kept rows only\n
+        Args:
+            data (pd.DataFrame): all rows
+            keep (np.ndarray): bool mask of the new rows
+            date (np.ndarray): 'Date' of the new kept rows"""
+        start = self.rows
+        self.data = data
+        self._keep = self._extend(self._keep, self.rows, keep)
+        self.rows += len(keep)
+        for col, channel in list(self._channels.items()):
+            if col == "Date":
+                new = date
+            else:
+                array = data.index.to_numpy() if col is None else data[col].to_numpy()
+                if array.dtype != channel.dtype:  # promoted in 'data': compressed again
+                    del self._channels[col]
+                    continue
+                new = array[start : self.rows][keep]
+            self._channels[col] = self._extend(channel, self.size, new)
+        self.size += len(date)
+
+    @classmethod
+    def _extend(cls, array: np.ndarray, size: int, new: np.ndarray) -> np.ndarray:
+        """Write 'new' after the first 'size' items of 'array', doubling
+        the capacity when full. Return the (maybe new) array"""
+        end = size + len(new)
+        if end > len(array):
+            grown = np.empty(max(2 * end, cls.MIN_CAPACITY), dtype=array.dtype)
+            grown[:size] = array[:size]
+            array = grown
+        array[size:end] = new
+        return array
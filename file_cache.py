@@ -0,0 +1,168 @@
+#!/usr/bin/env python
+"""
+Cache su disco dei dati importati (già riorganizzati da rearrange_file).
+Chiave: path, dimensione e mtime dei file RAW + versione dell'applicazione,
+versione della normalizzazione e opzioni di import
+"""
+import hashlib
+import json
+import os
+import shutil
+from pathlib import Path
+from typing import Callable
+
+import numpy as np
+import pandas as pd
+
+from channel_store import ChannelStore
+from pipeline import NORMALIZE_VERSION
+
+CACHE_MAX_BYTES = 5 * 1024**3  # default disk budget (5 GB)
+
+
+class FileCache:
+    """LRU cache of imported DataFrame saved as ChannelStore folders.\n
+    Every entry is a '<key>' folder whose store info holds the import
+    warnings; the store 'meta.json' mtime is the last access time.
+    Streaming imports write a '<key>.parquet' file first, converted to the
+    store by 'commit'. Results computed on the data (e.g. cycle edges) are
+    saved in the entry folder as '<name>.npz' ('put_result'), so they are
+    counted and removed with it"""
+
+    def __init__(self, directory: str, version: str, max_bytes: int = CACHE_MAX_BYTES):
+        """Args:
+            directory (str): cache folder, created if missing
+            version (str): application version, part of every key
+            max_bytes (int, optional): disk budget, least recently used
+            entries are removed above it. Defaults to CACHE_MAX_BYTES.
+        """
+        self.directory = Path(directory)
+        self.version = version
+        self.max_bytes = max_bytes
+
+    def key(self, filepaths: tuple[str], options: dict | None = None) -> str:
+        """Return the cache key of a file selection (entries of older
+        NORMALIZE_VERSION are never found again, evicted as LRU)\n
+        Args:
+            filepaths (tuple[str]): raw files path, in selection order
+            options (dict | None, optional): import options changing the
+            data (json serializable). Defaults to None."""
+        files = []
+        for filepath in filepaths:
+            stat = os.stat(filepath)
+            files.append([os.path.abspath(filepath), stat.st_size, stat.st_mtime_ns])
+        raw_key = json.dumps(
+            [self.version, NORMALIZE_VERSION, files, options or {}], sort_keys=True
+        )
+        return hashlib.sha1(raw_key.encode()).hexdigest()
+
+    def path(self, key: str) -> str:
+        """Return the parquet file used by streaming writers (see 'commit')"""
+        self.directory.mkdir(parents=True, exist_ok=True)
+        return str(self.directory / f"{key}.parquet")
+
+    def get(self, key: str) -> tuple[pd.DataFrame, dict] | None:
+        """Return cached data (backed by memmap, see ChannelStore) and import
+        warnings, None if not cached"""
+        try:
+            store = ChannelStore(self.directory / key)
+            data = store.frame()
+        except FileNotFoundError:
+            return None
+        except Exception:  # corrupted entry
+            self.remove(key)
+            return None
+        os.utime(store.directory / ChannelStore.META)  # update LRU order
+        return data, store.info["warnings"]
+
+    def put(self, key: str, data: pd.DataFrame, warnings: dict):
+        """Save data and import warnings, then apply the disk budget.
+        A failed write only means no cache for this selection"""
+        try:
+            ChannelStore.write(self.directory / key, data, {"warnings": warnings})
+        except Exception:
+            self.remove(key)
+            return
+        self.evict(keep=key)
+
+    def commit(
+        self,
+        key: str,
+        warnings: dict,
+        columns: list[str],
+        transform: Callable[[pd.Series], pd.Series] | None = None,
+    ):
+        """Convert the parquet file written by a streaming import to the
+        cache entry, then apply the disk budget\n
+        Args:
+            key (str): cache key
+            warnings (dict): import warnings
+            columns (list[str]): columns to keep
+            transform (Callable[[pd.Series], pd.Series] | None, optional):
+            see ChannelStore.from_parquet. Defaults to None.
+        """
+        parquet_path = self.path(key)
+        try:
+            ChannelStore.from_parquet(self.directory / key, parquet_path, columns,
+                                      {"warnings": warnings}, transform)
+        finally:
+            Path(parquet_path).unlink(missing_ok=True)
+        self.evict(keep=key)
+
+    def put_result(self, key: str, name: str, arrays: dict[str, np.ndarray], info: dict):
+        """Save arrays and json data computed on the entry 'key' (skipped if
+        the entry is not complete). Written to a temporary file and renamed,
+        so other processes never read a partial file"""
+        entry = self.directory / key
+        if not (entry / ChannelStore.META).exists():
+            return
+        temp = entry / f"{name}.{os.getpid()}.tmp"
+        try:
+            with open(temp, "wb") as f:
+                np.savez(f, info=json.dumps(info), **arrays)
+            os.replace(temp, entry / f"{name}.npz")
+        except OSError:  # entry removed meanwhile: no result saved
+            temp.unlink(missing_ok=True)
+
+    def get_result(self, key: str, name: str) -> tuple[dict[str, np.ndarray], dict] | None:
+        """Return arrays and json data saved with 'put_result', None if
+        missing"""
+        try:
+            with np.load(self.directory / key / f"{name}.npz") as data:
+                arrays = {array: data[array] for array in data.files if array != "info"}
+                return arrays, json.loads(str(data["info"]))
+        except (OSError, ValueError, KeyError):
+            return None
+
+    def remove(self, key: str):
+        """Remove a cache entry. Entries still mapped by another import may
+        not be removable, they are left for the next eviction"""
+        shutil.rmtree(self.directory / key, ignore_errors=True)
+        try:
+            (self.directory / f"{key}.parquet").unlink(missing_ok=True)
+        except OSError:
+            pass
+
+    def evict(self, keep: str | None = None):
+        """Remove least recently used entries until the cache fits in
+        'max_bytes'\n
+        Args:
+            keep (str | None, optional): key never removed (the entry just
+            written). Defaults to None.
+        """
+        # other processes (batch workers) can remove entries meanwhile: skipped
+        entries = {}
+        for meta in self.directory.glob(f"*/{ChannelStore.META}"):
+            try:
+                entries[meta.parent] = (meta.stat().st_mtime, ChannelStore(meta.parent).nbytes())
+            except (OSError, ValueError):
+                continue
+        sizes = {entry: size for entry, (_, size) in entries.items()}
+        used = sum(sizes.values())
+        for entry in sorted(entries, key=lambda entry: entries[entry][0]):
+            if used <= self.max_bytes:
+                break
+            if entry.name == keep:
+                continue
+            used -= sizes[entry]
+            self.remove(entry.name)
@@ -2,7 +2,7 @@
 import numpy as np
 import numpy.typing as npt
 # import pandas as pd
-from numba import boolean, float64, int32, int64, njit, types
+from numba import float64, int32, int64, njit, types
 
 
 # not used
@@ -15,21 +15,346 @@ def rms_jit(data: npt.NDArray[np.float64]) -> float:
     return rms1
 
 
-@njit(cache=True)
-def speg_acc_index(data: npt.NDArray[np.float64], soglia: int) ->\
+# ON/OFF edges in one pass into preallocated index arrays (edges of a kind
+# are at least 2 rows apart). OFF: from > soglia to < soglia or NaN,
+# ON: from < soglia or NaN to > soglia; values equal to soglia are neither.
+# nogil: columns are scanned in parallel threads (Model.find_cycle)
+@njit(cache=True, nogil=True)
+def speg_acc_index(data: npt.NDArray[np.float64], soglia: float) ->\
                                                  tuple[np.ndarray, np.ndarray]:
-    spegnimenti = []
-    accensioni = []
-    for i in range(len(data)-1):
-        if ((data[i+1] < soglia or np.isnan(data[i+1])) and data[i] > soglia):
-            spegnimenti.append(i+1)
-            # np.append(spegnimenti,i+1)
-        if (data[i+1] > soglia and (data[i] < soglia or np.isnan(data[i]))):
-            accensioni.append(i+1)
-            # np.append(accensioni,i+1)
-    spegnimenti = np.array(spegnimenti)
-    accensioni = np.array(accensioni)
-    return spegnimenti, accensioni
+    n = len(data)
+    size = n // 2 + 2  # + 1 for the branchless write after the last edge
+    spegnimenti = np.empty(size, dtype=np.int64)
+    accensioni = np.empty(size, dtype=np.int64)
+    n_off = 0
+    n_on = 0
+    if n == 0:
+        return spegnimenti[:0], accensioni[:0]
+    prev_on = data[0] > soglia
+    prev_low = not data[0] >= soglia  # < soglia or NaN
+    for i in range(1, n):
+        x = data[i]
+        on = x > soglia
+        low = not x >= soglia
+        # always written, kept only if an edge (no branch misprediction)
+        spegnimenti[n_off] = i
+        accensioni[n_on] = i
+        n_off += low & prev_on
+        n_on += on & prev_low
+        prev_on = on
+        prev_low = low
+    return spegnimenti[:n_off].copy(), accensioni[:n_on].copy()
+
+
+# ON/OFF edges with hysteresis and minimum dwell in one pass: ON above
+# 'soglia_on', OFF below 'soglia_off' or NaN, in between the state doesn't
+# change. A new state is confirmed (edge at its first row) only when it lasts
+# 'min_dwell' (time units), shorter ones are dropped; a state not yet
+# confirmed at the end is dropped too, so found edges never change when
+# rows are appended
+@njit(cache=True, nogil=True)
+def cycle_edges_jit(data: npt.NDArray[np.float64], time: npt.NDArray[np.int64],
+                    soglia_on: float, soglia_off: float,
+                    min_dwell: int) -> tuple[np.ndarray, np.ndarray]:
+    n = len(data)
+    size = n // 2 + 1
+    spegnimenti = np.empty(size, dtype=np.int64)
+    accensioni = np.empty(size, dtype=np.int64)
+    n_off = 0
+    n_on = 0
+    state = 0  # confirmed state: 1 ON, -1 OFF, 0 not known yet
+    level = 0  # last state outside the hysteresis band
+    since = -1  # first row of the state to confirm
+    for i in range(n):
+        x = data[i]
+        if x > soglia_on:
+            level = 1
+        elif not x >= soglia_off:  # < soglia_off or NaN
+            level = -1
+        if level == 0:
+            continue
+        if state == 0:  # first state, not an edge
+            state = level
+        elif level == state:
+            since = -1  # dropped: shorter than min_dwell
+        else:
+            if since == -1:
+                since = i
+            if time[i] - time[since] >= min_dwell:
+                if level == 1:
+                    accensioni[n_on] = since
+                    n_on += 1
+                else:
+                    spegnimenti[n_off] = since
+                    n_off += 1
+                state = level
+                since = -1
+    return spegnimenti[:n_off].copy(), accensioni[:n_on].copy()
+
+
+# cycles and ON time (ns) from ON/OFF edges and int64 ns timestamps, in one
+# pass. An OFF before the first ON ends a cycle started before the data, an
+# ON after the last OFF lasts until the last row; the other ON are paired by
+# position with the following OFF (edges alternate, except around values
+# equal to the threshold)
+@njit(cache=True, nogil=True)
+def cicli_time_jit(accensioni: npt.NDArray[np.int64], spegnimenti: npt.NDArray[np.int64],
+                   time: npt.NDArray[np.int64]) -> tuple[int, int]:
+    n_on = len(accensioni)
+    n_off = len(spegnimenti)
+    if n_on + n_off == 0 or len(time) == 0:
+        return 0, 0
+    start_on = n_on == 0 or (n_off > 0 and spegnimenti[0] < accensioni[0])
+    end_on = n_off == 0 or (n_on > 0 and accensioni[-1] > spegnimenti[-1])
+    time_on = 0
+    if start_on:
+        time_on += time[spegnimenti[0]] - time[0]
+    if end_on:
+        time_on += time[-1] - time[accensioni[-1]]
+    for i in range(min(n_on - end_on, n_off - start_on)):
+        time_on += time[spegnimenti[i + start_on]] - time[accensioni[i]]
+    return n_on + start_on, time_on
+
+
+# cycle periods [start, end) from ON/OFF edges, paired as cicli_time_jit: the
+# first cycle starts at row 0 if an OFF comes first, the last one ends at
+# row n if an ON comes last; ON without OFF (not alternating) are skipped
+@njit(cache=True, nogil=True)
+def cycle_bounds_jit(accensioni: npt.NDArray[np.int64], spegnimenti: npt.NDArray[np.int64],
+                     n: int) -> tuple[np.ndarray, np.ndarray]:
+    n_on = len(accensioni)
+    n_off = len(spegnimenti)
+    if n_on + n_off == 0 or n == 0:
+        return np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.int64)
+    start_on = n_on == 0 or (n_off > 0 and spegnimenti[0] < accensioni[0])
+    end_on = n_off == 0 or (n_on > 0 and accensioni[-1] > spegnimenti[-1])
+    n_pair = min(n_on - end_on, n_off - start_on)
+    size = n_pair + start_on + end_on
+    starts = np.empty(size, dtype=np.int64)
+    ends = np.empty(size, dtype=np.int64)
+    k = 0
+    if start_on:
+        starts[0] = 0
+        ends[0] = spegnimenti[0]
+        k = 1
+    for i in range(n_pair):
+        starts[k] = accensioni[i]
+        ends[k] = spegnimenti[i + start_on]
+        k += 1
+    if end_on:
+        starts[k] = accensioni[-1]
+        ends[k] = n
+    return starts, ends
+
+
+# min, mean and max of 'data' in each cycle [starts, ends) in one pass over
+# the cycle rows, NaN skipped (NaN if a cycle has no values)
+@njit(cache=True, nogil=True)
+def cycle_stats_jit(data: np.ndarray, starts: npt.NDArray[np.int64],
+                    ends: npt.NDArray[np.int64]) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    k = len(starts)
+    c_min = np.full(k, np.nan)
+    c_mean = np.full(k, np.nan)
+    c_max = np.full(k, np.nan)
+    for c in range(k):
+        lo = np.inf
+        hi = -np.inf
+        total = 0.0
+        count = 0
+        for i in range(starts[c], ends[c]):
+            x = np.float64(data[i])
+            if np.isnan(x):
+                continue
+            lo = min(lo, x)
+            hi = max(hi, x)
+            total += x
+            count += 1
+        if count > 0:
+            c_min[c] = lo
+            c_mean[c] = total / count
+            c_max[c] = hi
+    return c_min, c_mean, c_max
+
+
+@njit(cache=True)
+def _next_free(parent: np.ndarray, j: int) -> int:
+    # union-find with path halving: first index >= j not assigned yet
+    while parent[j] != j:
+        parent[j] = parent[parent[j]]
+        j = parent[j]
+    return j
+
+
+@njit(cache=True)
+def _count_below(soglie: np.ndarray, x: float, j: int) -> int:
+    # thresholds < x, searched from the guess 'j': galloping, then bisection
+    k = len(soglie)
+    if j < k and soglie[j] < x:  # up: answer in (j, k]
+        lo = j + 1
+        hi = lo
+        step = 1
+        while hi < k and soglie[hi] < x:
+            lo = hi + 1
+            hi = lo + step
+            step *= 2
+        hi = min(hi, k)
+    elif j > 0 and soglie[j - 1] >= x:  # down: answer in [0, j - 1]
+        hi = j - 1
+        step = 1
+        while True:
+            lo = hi - step
+            if lo < 0:
+                lo = 0
+                break
+            if soglie[lo] < x:
+                lo += 1
+                break
+            hi = lo
+            step *= 2
+    else:
+        return j
+    while lo < hi:
+        mid = (lo + hi) >> 1
+        if soglie[mid] < x:
+            lo = mid + 1
+        else:
+            hi = mid
+    return lo
+
+
+@njit(cache=True)
+def _assign(parent: np.ndarray, first_off: np.ndarray, lo: int, hi: int, off: int) -> int:
+    # first edge of the thresholds [lo, hi) still without one, return how many
+    n = 0
+    j = _next_free(parent, lo)
+    while j < hi:
+        first_off[j] = off
+        parent[j] = j + 1
+        n += 1
+        j = _next_free(parent, j + 1)
+    return n
+
+
+# cycles and ON time (ns) for every threshold of the sorted grid 'soglie' in
+# one pass, edges as speg_acc_index. A row pair is an ON edge for the
+# thresholds between the two values (an OFF edge if decreasing): edge counts
+# by difference arrays, kind of the first edge by union-find (each threshold
+# assigned once). ON time: every row above a threshold adds its time step
+# (as cicli_time_jit when edges alternate, i.e. no value equal to a
+# threshold). Position of a value in the grid: guess from a table of 4
+# buckets per threshold, then _count_below
+@njit(cache=True, nogil=True)
+def threshold_sweep_jit(data: np.ndarray, time: npt.NDArray[np.int64],
+                        soglie: npt.NDArray[np.float64]) -> tuple[np.ndarray, np.ndarray]:
+    n = len(data)
+    k = len(soglie)
+    d_edges = np.zeros(k + 1, dtype=np.int64)
+    d_on = np.zeros(k + 1, dtype=np.int64)
+    d_time = np.zeros(k + 1, dtype=np.int64)
+    first_off = np.zeros(k, dtype=np.int64)  # 1 if the first edge is OFF
+    parent = np.arange(k + 1)
+    n_free = k
+    n_bucket = 4 * k
+    span = soglie[-1] - soglie[0] if k > 0 else 0.0
+    scale = n_bucket / span if span > 0 else 0.0
+    guess = np.zeros(n_bucket + 1, dtype=np.int64)  # thresholds < bucket start
+    for b in range(1, n_bucket + 1):
+        guess[b] = _count_below(soglie, soglie[0] + b / scale, guess[b - 1]) if span > 0 else 0
+    prev_nan = True
+    prev_lt = 0  # thresholds < previous value
+    prev_le = 0  # thresholds <= previous value
+    for i in range(n):
+        x = np.float64(data[i])
+        x_nan = np.isnan(x)
+        x_lt = 0
+        if x_nan or k == 0 or x <= soglie[0]:
+            x_lt = 0
+        elif x > soglie[-1]:
+            x_lt = k
+        else:
+            x_lt = guess[min(int((x - soglie[0]) * scale), n_bucket)]
+            if x_lt < k and soglie[x_lt] < x:  # usually at most one step
+                x_lt = _count_below(soglie, x, x_lt + 1) if soglie[x_lt + 1] < x else x_lt + 1
+            elif x_lt > 0 and soglie[x_lt - 1] >= x:
+                x_lt = _count_below(soglie, x, x_lt)
+        x_le = x_lt + 1 if x_lt < k and soglie[x_lt] == x else x_lt  # unique grid
+        # row ON for thresholds < x: its time step
+        dt = time[i + 1] - time[i] if i < n - 1 else 0
+        d_time[0] += dt
+        d_time[x_lt] -= dt
+        if i > 0:
+            # ON for prev < s < x, OFF for x < s < prev (NaN: below all);
+            # empty ranges (hi <= lo) add and remove at the same index
+            on_lo = 0 if prev_nan else prev_le
+            on_hi = max(on_lo, 0 if x_nan else x_lt)
+            off_lo = 0 if x_nan else x_le
+            off_hi = max(off_lo, 0 if prev_nan else prev_lt)
+            d_edges[on_lo] += 1
+            d_edges[on_hi] -= 1
+            d_on[on_lo] += 1
+            d_on[on_hi] -= 1
+            d_edges[off_lo] += 1
+            d_edges[off_hi] -= 1
+            if n_free > 0:
+                n_free -= _assign(parent, first_off, on_lo, on_hi, 0)
+                n_free -= _assign(parent, first_off, off_lo, off_hi, 1)
+        prev_nan = x_nan
+        prev_lt = x_lt
+        prev_le = x_le
+    edges = np.cumsum(d_edges)[:k]
+    cicli = np.cumsum(d_on)[:k] + first_off
+    time_on = np.cumsum(d_time)[:k]
+    for j in range(k):
+        if edges[j] == 0:  # as cicli_time_jit
+            cicli[j] = 0
+            time_on[j] = 0
+    return cicli, time_on
+
+
+# turning points (peaks and valleys) of 'data' for rainflow counting: NaN
+# skipped, plateaus and monotone runs reduced to one point, first and last
+# value kept
+@njit(cache=True, nogil=True)
+def turning_points_jit(data: np.ndarray) -> npt.NDArray[np.float64]:
+    points = np.empty(len(data), dtype=np.float64)
+    m = 0
+    for i in range(len(data)):
+        x = np.float64(data[i])
+        if np.isnan(x) or (m > 0 and x == points[m - 1]):
+            continue
+        if m >= 2 and (x > points[m - 1]) == (points[m - 1] > points[m - 2]):
+            points[m - 1] = x  # same direction: extend
+        else:
+            points[m] = x
+            m += 1
+    return points[:m].copy()
+
+
+# rainflow counting (4-point method, same full cycles of ASTM E1049) of
+# alternating turning points: B-C is a full cycle when its range is not
+# larger than A-B and C-D. Cycles added to 'counts' (range x mean bins, out
+# of range cycles in the edge bins). Returns the residual stack: counting
+# residual + next points gives the same cycles of the whole series
+@njit(cache=True, nogil=True)
+def rainflow_jit(points: npt.NDArray[np.float64], counts: np.ndarray, range_width: float,
+                 mean_min: float, mean_width: float) -> npt.NDArray[np.float64]:
+    n_range, n_mean = counts.shape
+    stack = np.empty(len(points), dtype=np.float64)
+    m = 0
+    for p in points:
+        stack[m] = p
+        m += 1
+        while m >= 4:
+            x = abs(stack[m - 2] - stack[m - 3])
+            if x > abs(stack[m - 3] - stack[m - 4]) or x > abs(stack[m - 1] - stack[m - 2]):
+                break
+            mean = (stack[m - 2] + stack[m - 3]) / 2
+            r_bin = min(int(x / range_width), n_range - 1)
+            m_bin = min(max(int(np.floor((mean - mean_min) / mean_width)), 0), n_mean - 1)
+            counts[r_bin, m_bin] += 1
+            stack[m - 3] = stack[m - 1]
+            m -= 2
+    return stack[:m].copy()
 
 
 @njit(cache=True)
@@ -80,8 +405,9 @@ def distribution_jit2(current_column: npt.NDArray[np.float64 | np.int64],
     return y, y_na
 
 
-@njit(boolean(float64[:], int32), fastmath=True, cache=True)
-def index_check_jit(data: npt.NDArray[np.float64], i: int):
+# no explicit signature: compiled also for compact (float32/int16) channels
+@njit(fastmath=True, cache=True)
+def index_check_jit(data: npt.NDArray[np.float64 | np.float32 | np.int16], i: int):
     for j in range(10):
         if data[i+j] != 0:
             break
@@ -99,11 +425,10 @@ def correct_index_jit(data: np.ndarray) -> list[int]:
     return index
 
 
-@njit(types.UniTuple(types.List(int64), 3)(float64[:], float64[:], float64[:], int32, int32),
-      fastmath=True, cache=True)
-def module_check_index_jit(data1: npt.NDArray[np.float64],
-                           data2: npt.NDArray[np.float64],
-                           data3: npt.NDArray[np.float64],
+@njit(fastmath=True, cache=True)
+def module_check_index_jit(data1: npt.NDArray[np.float64 | np.float32 | np.int16],
+                           data2: npt.NDArray[np.float64 | np.float32 | np.int16],
+                           data3: npt.NDArray[np.float64 | np.float32 | np.int16],
                            iteration: int, n: int) -> tuple[list[int], list[int], list[int]]:
     error_data1, error_data2, error_data3 = [], [], []
     for i in range(iteration-10):
@@ -182,55 +507,37 @@ def retime_jit1(base_date, date, P_off, P_on):
     return date
 
 
-# @njit(typeof(np.timedelta64(1,'ns'))[:](typeof(np.timedelta64(1,'ns'))[:],types.Array(int64,1,'C')),cache=True)
-@njit(types.NPTimedelta('ns')[:](types.NPTimedelta('ns')[:], int64[:], int64[:]),
-      cache=True)
-def retime_jit2(date: npt.NDArray[np.timedelta64],
-                P_off: list[int], P_on: list[int]):
-    shape = len(date)
-    # 1
-    if P_off[0] > P_on[0] and P_on[-1] < P_off[-1]:
-        offset = date[P_on[0]]
-        for k in range(0, P_off[0], 1):
-            date[k] -= offset
-        for i in range(len(P_on)-1):
-            offset = offset+(date[P_on[i+1]]-date[P_off[i]])
-            for j in range(P_off[i], P_off[i+1], 1):
-                date[j] -= offset
-    # 2
-    elif (P_off[0] > P_on[0] and P_on[-1] > P_off[-1]):
-        offset = date[P_on[0]]
-        for k in range(0, P_off[0], 1):
-            date[k] -= offset
-        for i in range(len(P_on)-2):
-            offset = offset+(date[P_on[i+1]]-date[P_off[i]])
-            for j in range(P_off[i], P_off[i+1], 1):
-                date[j] -= offset
-        offset = offset+(date[P_on[-1]]-date[P_off[-1]])
-        for ii in range(P_off[-1], shape, 1):
-            date[ii] -= offset
-    # 3
-    elif (P_off[0] < P_on[0] and P_on[-1] > P_off[-1]):
-        offset = date[0]
-        for k in range(0, P_off[0], 1):
-            date[k] -= offset
-        for i in range(len(P_on)-1):
-            offset = offset+(date[P_on[i]]-date[P_off[i]])
-            for j in range(P_off[i], P_off[i+1], 1):
-                date[j] -= offset
-        offset = offset+(date[P_on[-1]]-date[P_off[-1]])
-        for ii in range(P_off[-1], shape, 1):
-            date[ii] -= offset
-    # 4
-    elif (P_off[0] < P_on[0] and P_on[-1] < P_off[-1]):
-        offset = date[0]
-        for k in range(0, P_off[0], 1):
-            date[k] -= offset
-        for i in range(len(P_on)-0):
-            offset = offset+(date[P_on[i]]-date[P_off[i]])
-            for j in range(P_off[i], P_off[i+1], 1):
-                date[j] -= offset
-    return date
+# removal of the OFF time (clean_cycle) in closed form: rows are split in
+# segments by the OFF indexes, each segment is shifted by the start of the
+# first ON plus the prefix sum of the OFF gaps (OFF to next ON) before it;
+# without a first ON the start is the first row. Rows after a last OFF not
+# followed by an ON are not shifted. One pass, int64 ns
+@njit(cache=True, nogil=True)
+def retime_jit(date: npt.NDArray[np.int64], P_off: npt.NDArray[np.int64],
+               P_on: npt.NDArray[np.int64]) -> npt.NDArray[np.int64]:
+    n = len(date)
+    n_on = len(P_on)
+    n_off = len(P_off)
+    retimed = np.empty(n, dtype=np.int64)
+    if n == 0:
+        return retimed
+    on_first = n_on > 0 and (n_off == 0 or P_on[0] < P_off[0])
+    offset = date[P_on[0]] if on_first else date[0]
+    start = 0
+    j = 0  # next ON
+    for s in range(n_off + 1):
+        end = P_off[s] if s < n_off else n
+        for i in range(start, end):
+            retimed[i] = date[i] - offset
+        if s < n_off:
+            while j < n_on and P_on[j] < P_off[s]:
+                j += 1
+            if j < n_on:
+                offset += date[P_on[j]] - date[P_off[s]]
+            else:
+                offset = 0
+        start = end
+    return retimed
 
 
 @njit(cache=True, fastmath=True)
@@ -243,3 +550,120 @@ def hms(series2: npt.NDArray[np.float64]) -> list[str]:
         sec = (totsec % 3600) % 60
         series1.append(f"{h}:{m}:{sec}")
     return series1
+
+
+# import normalisation: zero back-fill (limit 1) and pad interpolation
+# (limit 'pad_limit') fused in one in place pass. The zeros to back fill
+# are the cells in 'zeros' (raw zeros of a coerced column, not its text
+# cells), all the zeros of 'data' if None.
+# Return (any valid value before the fill, as 'dropna(how="all")' did
+# first, any NaN left)
+@njit(cache=True)
+def fill_channel_jit(data: npt.NDArray[np.float64 | np.int64], pad_limit: int,
+                     zeros: npt.NDArray[np.bool_] | None) -> tuple[bool, bool]:
+    n = len(data)
+    has_value = False
+    has_nan = False
+    filled = False  # valid value to pad with
+    last = data[0]
+    run = 0
+    for i in range(n):
+        x = data[i]
+        if not np.isnan(x):
+            has_value = True
+        # last zero of a run gets the next raw value (also NaN)
+        if zeros is None:
+            back_fill = x == 0 and i + 1 < n and data[i + 1] != 0
+        else:
+            back_fill = zeros[i] and i + 1 < n and not zeros[i + 1]
+        if back_fill:
+            x = data[i + 1]
+            data[i] = x
+        if np.isnan(x):
+            if filled and run < pad_limit:
+                data[i] = last
+            else:
+                has_nan = True
+            run += 1
+        else:
+            last = x
+            filled = True
+            run = 0
+    return has_value, has_nan
+
+
+# min heap of runs on (head value, run index): ties in run order
+@njit(cache=True)
+def _run_less(head, a, b) -> bool:
+    return head[a] < head[b] or (head[a] == head[b] and a < b)
+
+
+@njit(cache=True)
+def _sift_down(heap, size, i, head):
+    while True:
+        child = 2 * i + 1
+        if child >= size:
+            break
+        if child + 1 < size and _run_less(head, heap[child + 1], heap[child]):
+            child += 1
+        if not _run_less(head, heap[child], heap[i]):
+            break
+        heap[i], heap[child] = heap[child], heap[i]
+        i = child
+
+
+# k-way merge of the sorted runs values[bounds[r]:bounds[r + 1]]: the
+# smallest run is emitted until it passes the second smallest one, so runs
+# overlapping only at the edges are copied almost linearly.
+# Return (merge order, rows equal to the previous row of another run)
+@njit(cache=True)
+def merge_runs_jit(values: npt.NDArray[np.int64],
+                   bounds: npt.NDArray[np.int64]) -> tuple[npt.NDArray[np.int64], int]:
+    k = len(bounds) - 1
+    order = np.empty(bounds[k] - bounds[0], dtype=np.int64)
+    pos = bounds[:k].copy()
+    head = np.zeros(k, dtype=np.int64)  # current value of each run
+    heap = np.empty(k, dtype=np.int64)
+    size = 0
+    for r in range(k):
+        if pos[r] < bounds[r + 1]:  # empty runs out of the heap
+            head[r] = values[pos[r]]
+            heap[size] = r
+            size += 1
+    for i in range(size // 2 - 1, -1, -1):  # heapify
+        _sift_down(heap, size, i, head)
+
+    n_dup = 0
+    i = 0
+    last = 0
+    last_run = -1
+    while size > 0:
+        r = heap[0]
+        s = -1  # second smallest run
+        if size == 2:
+            s = heap[1]
+        elif size > 2:
+            s = heap[1] if _run_less(head, heap[1], heap[2]) else heap[2]
+        # only the stretch start can be equal to the last row of another run
+        if last_run != -1 and last_run != r and head[r] == last:
+            n_dup += 1
+        j = pos[r]
+        end = bounds[r + 1]
+        while j < end:
+            x = values[j]
+            if s != -1 and (x > head[s] or (x == head[s] and s < r)):
+                break
+            order[i] = j
+            i += 1
+            j += 1
+        last = values[j - 1]
+        last_run = r
+        pos[r] = j
+        if j == end:  # run exhausted
+            size -= 1
+            heap[0] = heap[size]
+        else:
+            head[r] = values[j]
+        if size > 1:
+            _sift_down(heap, size, 0, head)
+    return order, n_dup
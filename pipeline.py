@@ -0,0 +1,208 @@
+#!/usr/bin/env python
+"""
+Pipeline di normalizzazione dei dati importati (passi di rearrange_file)
+eseguita a stadi, in place o su viste, con profilo di tempo e memoria
+"""
+import time
+import tracemalloc
+from contextlib import contextmanager
+
+import numpy as np
+import pandas as pd
+
+import func_numba as fnb
+from reader import (DROP_COLUMNS, PAD_LIMIT, clean_columns, coerce_values, compact_columns,
+                    date_report, extract_date, overlapping_runs)
+
+# version of the normalised data (cache key): bump it whenever 'normalize_raw'
+# (or the streaming import) gives different data for the same files
+NORMALIZE_VERSION = 6
+
+
+class ImportProfiler:
+    """Wall time and peak memory of each import stage.\n
+    Peak memory is traced with tracemalloc (numpy buffers included) only
+    with 'memory', since tracing slows down every allocation"""
+
+    def __init__(self, memory: bool = False):
+        """Args:
+            memory (bool, optional): trace peak memory. Defaults to False.
+        """
+        self.memory = memory
+        self.stages: list[dict] = []
+
+    @contextmanager
+    def stage(self, name: str):
+        """Profile the code in the 'with' block as stage 'name'"""
+        started = self.memory and not tracemalloc.is_tracing()
+        if started:
+            tracemalloc.start()
+        if self.memory:
+            tracemalloc.reset_peak()
+            base = tracemalloc.get_traced_memory()[0]
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            seconds = time.perf_counter() - start
+            peak = None
+            if self.memory:
+                peak = (tracemalloc.get_traced_memory()[1] - base) / 1024**2
+            if started:
+                tracemalloc.stop()
+            self.add(name, seconds, peak)
+
+    def add(self, name: str, seconds: float, peak_mb: float | None = None):
+        """Add a stage measured elsewhere (e.g. file reading)"""
+        self.stages.append({"stage": name, "seconds": seconds, "peak_mb": peak_mb})
+
+    def report(self) -> str:
+        """Return a table with time and peak memory of each stage"""
+        lines = [f"{'stage':<10}{'seconds':>10}{'peak MB':>10}"]
+        for stage in self.stages:
+            peak = "-" if stage["peak_mb"] is None else f"{stage['peak_mb']:.1f}"
+            lines.append(f"{stage['stage']:<10}{stage['seconds']:>10.3f}{peak:>10}")
+        total = sum(stage["seconds"] for stage in self.stages)
+        lines.append(f"{'total':<10}{total:>10.3f}")
+        return "\n".join(lines)
+
+
+def merge_runs(dates: np.ndarray, runs: list[int]) -> tuple[np.ndarray | None, dict]:
+    """Order of the rows of concatenated files (runs) by date. Each file is
+    usually already sorted: files not overlapping are only reordered as
+    blocks, overlapping ones are merged (k-way merge, O(n log k)). The
+    full sort is used only if a file is not sorted. Equal timestamps keep
+    the files order\n
+    Args:
+        dates (np.ndarray): datetime64 of all files, concatenated
+        runs (list[int]): rows of each file\n
+    Returns:
+        tuple[np.ndarray | None, dict]: rows order (None if already sorted)
+        and report: 'overlap_files' (index of the files whose time span
+        overlaps another file) and 'dup_rows' (timestamps already found in
+        another file)"""
+    values = dates.view(np.int64)
+    bounds = np.concatenate(([0], np.cumsum(runs))).astype(np.int64)
+    spans = [(i, values[start:end]) for i, (start, end) in enumerate(zip(bounds, bounds[1:]))
+             if end > start]
+    is_sorted = all((run[1:] >= run[:-1]).all() for _, run in spans)
+    first = {i: run.min() for i, run in spans}
+    overlap = overlapping_runs({i: (first[i], run.max()) for i, run in spans})
+    report = {"overlap_files": overlap, "dup_rows": 0}
+
+    if not is_sorted:  # fallback: full sort
+        order = np.argsort(values, kind="stable")
+        run_id = np.repeat(np.arange(len(runs)), runs)[order]
+        sorted_values = values[order]
+        report["dup_rows"] = int(
+            ((sorted_values[1:] == sorted_values[:-1]) & (run_id[1:] != run_id[:-1])).sum()
+        )
+        return order, report
+    if overlap != []:
+        order, report["dup_rows"] = fnb.merge_runs_jit(values, bounds)
+        return order, report
+    blocks = sorted(first, key=first.get)  # not overlapping: files order
+    if blocks == sorted(blocks):
+        return None, report
+    return np.concatenate([np.arange(bounds[i], bounds[i + 1]) for i in blocks]), report
+
+
+def normalize_raw(
+    data: pd.DataFrame,
+    compact: bool = False,
+    profiler: ImportProfiler | None = None,
+    runs: list[int] | None = None,
+) -> tuple[pd.DataFrame, dict]:
+    """rearrange_file steps as a stage pipeline. 'data' is modified in
+    place and never copied as a whole:
+    - columns: clean names (only the Index)
+    - date: parse 'Date' (see 'extract_date')
+    - sort: rows order of the merged files, each already sorted (see
+      'merge_runs'), without the rows with unparsable timestamps
+    - coerce: all kept object columns in one 'pd.to_numeric' pass, then
+      the rows order applied only to 'Date' and the kept channels
+    - fill: zero back-fill (only numeric cells, as on raw values) and pad
+      interpolation fused in one pass per channel (fill_channel_jit), that
+      also finds all NaN and NaN columns
+    - build: new DataFrame of the kept channels, no copy
+    - compact: narrowest dtypes (only with 'compact')\n
+    Args:
+        data (pd.DataFrame): raw data (fresh read, modified in place)
+        compact (bool, optional): see 'compact_dtype'. Defaults to False.
+        profiler (ImportProfiler | None, optional): where to record stages.
+        Defaults to None.
+        runs (list[int] | None, optional): rows of each concatenated file.
+        Defaults to None: a single file.\n
+    Returns:
+        tuple[pd.DataFrame, dict]: normalised data and import warnings"""
+    profiler = profiler or ImportProfiler()
+
+    runs = runs or [data.shape[0]]
+    with profiler.stage("columns"):
+        clean_columns(data)
+        data.index = pd.RangeIndex(data.shape[0])  # row position of the bad dates
+    with profiler.stage("date"):
+        data, _, bad_dates = extract_date(data, drop=False)
+    with profiler.stage("sort"):
+        dates = data["Date"].to_numpy()
+        rows = None  # rows of 'data' in the final order, None: all, as read
+        if bad_dates.shape[0] > 0:  # not removed by 'extract_date'
+            valid = np.ones(dates.shape[0], dtype=bool)
+            valid[bad_dates.index.to_numpy()] = False
+            rows = np.flatnonzero(valid)
+            bounds = np.concatenate(([0], np.cumsum(valid)))[np.cumsum([0, *runs])]
+            runs = np.diff(bounds).tolist()
+            dates = dates[rows]
+        order, merge = merge_runs(dates, runs)
+        if order is not None:
+            dates = dates[order]
+            rows = order if rows is None else rows[order]
+        channels = [col for col in data.columns if col != "Date" and col not in DROP_COLUMNS]
+
+    with profiler.stage("coerce"):
+        arrays = {col: data[col].to_numpy() for col in channels}
+        obj_col = [col for col in channels if arrays[col].dtype == object]
+        obj_nan, zeros = {}, {}
+        if obj_col != []:
+            # from the column views: 'data[obj_col]' consolidates the whole frame
+            raw = np.stack([arrays[col] for col in obj_col], axis=1)
+            values, coerced = coerce_values(raw)
+            for i, col in enumerate(obj_col):
+                arrays[col] = values[:, i]
+                # text cells were never back filled, zeros of numeric files were
+                zeros[col] = raw[:, i] == 0
+                obj_nan[col] = int(coerced[i])
+            del raw
+        if rows is not None:
+            arrays = {col: array[rows] for col, array in arrays.items()}
+            zeros = {col: mask[rows] for col, mask in zeros.items()}
+
+    with profiler.stage("fill"):
+        kept, nan_col = [], []
+        for col in channels:
+            array = arrays[col]
+            if array.dtype.kind not in "fiu":
+                continue  # not numeric
+            has_value, has_nan = fnb.fill_channel_jit(array, PAD_LIMIT, zeros.get(col))
+            if has_value or col in obj_nan:  # coerced columns were always kept
+                kept.append(col)
+                if has_nan:
+                    nan_col.append(col)
+
+    with profiler.stage("build"):
+        temp_data = pd.DataFrame(
+            {"Date": dates, **{col: arrays[col] for col in kept}},
+            copy=False,
+        )
+    if compact:
+        with profiler.stage("compact"):
+            compact_columns(temp_data)
+
+    obj_nan = {col: n_nan for col, n_nan in obj_nan.items() if col in kept}
+    return temp_data, {
+        "obj_col": list(obj_nan),
+        "obj_nan": obj_nan,
+        "nan_col": nan_col,
+        **date_report(bad_dates),
+        **merge,
+    }
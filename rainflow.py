@@ -0,0 +1,117 @@
+#!/usr/bin/env python
+"""
+Conteggio rainflow dei cicli termici (ampiezza e valor medio) per la stima
+di vita: istogrammi range/mean cumulabili tra più file senza ricontare
+"""
+import numpy as np
+import pandas as pd
+
+import func_numba as fnb
+
+
+class RainflowCount:
+    """Rainflow histogram (range x mean) of one or more series.\n
+    Full cycles are counted with the 4-point method (rainflow_jit); the
+    residual turning points (half cycles not closed yet) are kept, so a
+    series counted in pieces ('add' or 'merge' in time order) gives the same
+    cycles of the whole series"""
+
+    def __init__(
+        self,
+        range_width: float = 1,
+        range_max: float = 150,
+        mean_width: float = 5,
+        mean_min: float = -50,
+        mean_max: float = 150,
+    ):
+        """Args:
+            range_width (float, optional): range bin width. Defaults to 1.
+            range_max (float, optional): range of the last bin (larger ones
+            are added to it). Defaults to 150.
+            mean_width (float, optional): mean bin width. Defaults to 5.
+            mean_min (float, optional): mean of the first bin (lower ones
+            are added to it). Defaults to -50.
+            mean_max (float, optional): mean of the last bin (higher ones
+            are added to it). Defaults to 150.
+        """
+        self.range_width = range_width
+        self.mean_width = mean_width
+        self.mean_min = mean_min
+        self.range_bins = np.arange(0, range_max, range_width)
+        self.mean_bins = np.arange(mean_min, mean_max, mean_width)
+        self.counts = np.zeros((len(self.range_bins), len(self.mean_bins)))  # full cycles
+        self.residual = np.zeros(0)  # turning points not closed
+
+    def add(self, data: np.ndarray):
+        """Count the cycles of 'data', the series following the ones
+        already counted (NaN skipped)"""
+        points = fnb.turning_points_jit(data)
+        if len(self.residual) > 0:  # the junction can extend the last point
+            points = fnb.turning_points_jit(np.concatenate([self.residual, points]))
+        self.residual = fnb.rainflow_jit(
+            points, self.counts, self.range_width, self.mean_min, self.mean_width
+        )
+
+    def merge(self, other: "RainflowCount"):
+        """Add the cycles of 'other', counted on the series following this
+        one, without counting its data again\n
+        Raises:
+            ValueError: if the bins are different"""
+        if not (
+            np.array_equal(self.range_bins, other.range_bins)
+            and np.array_equal(self.mean_bins, other.mean_bins)
+        ):
+            raise ValueError("Rainflow: bin diversi")
+        self.counts += other.counts
+        self.add(other.residual)
+
+    def half_cycles(self) -> np.ndarray:
+        """Histogram of the residual half cycles (0.5 each)"""
+        half = np.zeros_like(self.counts)
+        if len(self.residual) > 1:
+            ranges = np.abs(np.diff(self.residual))
+            means = (self.residual[:-1] + self.residual[1:]) / 2
+            r_bin = np.minimum((ranges / self.range_width).astype(np.int64), len(self.range_bins) - 1)
+            m_bin = np.clip(
+                np.floor((means - self.mean_min) / self.mean_width).astype(np.int64),
+                0,
+                len(self.mean_bins) - 1,
+            )
+            np.add.at(half, (r_bin, m_bin), 0.5)
+        return half
+
+    def histogram(self, half: bool = True) -> pd.DataFrame:
+        """Cycles by range (index) and mean (columns) bin\n
+        Args:
+            half (bool, optional): add the residual half cycles. Defaults to
+            True."""
+        counts = self.counts + self.half_cycles() if half else self.counts
+        return pd.DataFrame(counts, index=self.range_bins, columns=self.mean_bins)
+
+    def range_histogram(self, half: bool = True) -> pd.Series:
+        """Cycles by range bin (all means)"""
+        return self.histogram(half).sum(axis=1)
+
+    def save(self, filename: str):
+        """Save bins, cycles and residual ('.npz'), to merge with the next
+        files later"""
+        np.savez(
+            filename,
+            widths=[self.range_width, self.mean_width, self.mean_min],
+            range_bins=self.range_bins,
+            mean_bins=self.mean_bins,
+            counts=self.counts,
+            residual=self.residual,
+        )
+
+    @classmethod
+    def load(cls, filename: str) -> "RainflowCount":
+        """Rainflow count saved with 'save'"""
+        with np.load(filename) as data:
+            rainflow = cls()
+            rainflow.range_bins = data["range_bins"]
+            rainflow.mean_bins = data["mean_bins"]
+            rainflow.counts = data["counts"]
+            rainflow.residual = data["residual"]
+            rainflow.range_width, rainflow.mean_width, rainflow.mean_min = data["widths"]
+        return rainflow
@@ -0,0 +1,611 @@
+#!/usr/bin/env python
+"""
+Lettura dei file RAW delle prove (monitor log *.txt/*.log/*.csv, Excel).
+Nessuna dipendenza GUI: importabile dai processi di lettura paralleli
+"""
+import io
+import os
+import time
+from functools import partial
+from pathlib import Path
+from typing import Callable
+
+import fastparquet
+import numpy as np
+import pandas as pd
+
+tab_csv = partial(pd.read_csv,
+                  sep="\t",
+                  header=0,
+                  index_col=False,
+                  skipinitialspace=False,
+                  skip_blank_lines=False,
+                  keep_default_na=True,
+                  encoding="cp1252",
+                  encoding_errors="ignore",
+                  # parse_dates=[["Date", "Time"]],
+                  # dayfirst=True,
+                  on_bad_lines="skip",
+                  engine="c",
+                  low_memory=False,
+                  )
+comma_csv = partial(pd.read_csv,
+                    sep=',',
+                    index_col=False,
+                    skipinitialspace=True,
+                    skip_blank_lines=False,
+                    encoding="cp1252",
+                    encoding_errors="ignore",
+                    # parse_dates=[["Date", "Time"]],
+                    # dayfirst=True,
+                    # on_bad_lines='skip',
+                    engine="c",
+                    low_memory=False,
+                    )
+excel_xlsx = partial(pd.read_excel,
+                     sheet_name=0,
+                     # parse_dates=[["Date", "Time"]],
+                     engine=None,
+                     )
+read_functions = {"tab": tab_csv, "comma": comma_csv, "excel": excel_xlsx}
+read_separators = {"tab": "\t", "comma": ","}
+
+SNIFF_MAX = 16 * 1024**2  # safety limit of the header line read to detect the format
+EXCEL_MAGIC = (b"PK\x03\x04",  # xlsx, xlsm, xlsb, ods (zip container)
+               b"\xd0\xcf\x11\xe0\xa1\xb1\x1a\xe1",  # xls (OLE2 container)
+               )
+NOT_FLOAT_COLUMNS = ("Date", "Time", "DateTime", "RelTime", "Condition")
+KEEP_COLUMNS = ("Date", "Time", "DateTime", "Condition")  # always read by a projection
+
+
+def sniff_format(filepath: str) -> tuple[str, list[str]]:
+    """Detect the file format looking only at the first line (magic bytes,
+    header delimiter and 'Condition' column, at most SNIFF_MAX bytes)
+    instead of trying a full read with every reader\n
+    Args:
+        filepath (str): raw file path\n
+    Raises:
+        ValueError: if the header has no 'Condition' column\n
+    Returns:
+        tuple[str, list[str]]: key of 'read_functions' and header columns
+        as named by the reader (empty for excel files)"""
+    with open(filepath, "rb") as f:
+        head = f.readline(SNIFF_MAX)
+    if head.startswith(EXCEL_MAGIC):
+        return "excel", []
+
+    text = head.decode("cp1252", errors="ignore")
+    header = text.splitlines()[0] if text else ""
+    for name, sep in read_separators.items():
+        columns = header.split(sep)
+        if "Condition" in (col.strip() for col in columns):
+            if read_functions[name].keywords.get("skipinitialspace"):
+                columns = [col.lstrip() for col in columns]
+            return name, columns
+    raise ValueError(f"Unknown file format: {Path(filepath).name}\n"
+                     "'Condition' column not found in header")
+
+
+def float_channels(data: pd.DataFrame):
+    """Cast in place the integer channels read by the C parser to float64.
+    Channel types are inferred in the same pass as the parsing (as fast as
+    an explicit float schema), so a non numeric cell only makes its own
+    column object (coerced by 'normalize_raw') and the file is read once"""
+    ints = [
+        col for col in data.columns
+        if col.strip() not in NOT_FLOAT_COLUMNS and data[col].dtype.kind in "iu"
+    ]
+    if ints:
+        data[ints] = data[ints].astype(np.float64)
+
+
+def clean_name(name: str) -> str:
+    """Return a column name as renamed by 'clean_columns'"""
+    return (str(name).strip().replace(" ", "_").replace("(", "")
+            .replace(")", "").replace(",", ""))
+
+
+def header_channels(filepath: str) -> list[str]:
+    """Return the channel names (cleaned, without date and dropped columns)
+    in the header of a text file, empty for excel files"""
+    _, header = sniff_format(filepath)
+    not_channels = set(NOT_FLOAT_COLUMNS)
+    return [clean_name(col) for col in header if clean_name(col) not in not_channels]
+
+
+def column_filter(columns: list[str] | None) -> Callable[[str], bool] | None:
+    """Return the 'usecols' filter of a projection: date columns,
+    'Condition' and the given channels (cleaned names). None means all
+    columns"""
+    if columns is None:
+        return None
+    keep = {clean_name(col) for col in columns} | set(KEEP_COLUMNS)
+    return lambda name: clean_name(name) in keep
+
+
+def read_raw_file(filepath: str, columns: list[str] | None = None) -> tuple[pd.DataFrame, float]:
+    """Read a RAW file with the reader detected by 'sniff_format'.
+    Module level function, so it can run in a process pool\n
+    Args:
+        filepath (str): raw file path
+        columns (list[str] | None, optional): channels to read (projection,
+        see 'column_filter'). Defaults to None: all columns.\n
+    Raises:
+        ValueError: if the file has no 'Condition' column\n
+    Returns:
+        tuple[pd.DataFrame, float]: read data and read time in seconds"""
+    file_format, _ = sniff_format(filepath)
+    reader = partial(read_functions[file_format], usecols=column_filter(columns))
+    start = time.perf_counter()
+    temp_df = reader(filepath)
+    if file_format != "excel":
+        float_channels(temp_df)
+    if "Condition" not in temp_df.columns:  # Check correct reading
+        raise ValueError(f"Invalid file: {Path(filepath).name}\n"
+                         "'Condition' column not found")
+    return temp_df, time.perf_counter() - start
+
+
+# ----- Normalisation (rearrange_file steps) ----- #
+DROP_COLUMNS = ("Time", "RelTime", "Condition")
+PAD_LIMIT = 3  # max consecutive NaN filled with the previous value
+CHUNK_ROWS = 500_000  # rows per chunk in streaming import
+DATE_SAMPLE = 200  # values (from head and tail) used to infer the date format
+DATE_REPORT_MAX = 10  # unparsable timestamps listed in the import report
+DATE_FORMATS = ("%Y-%m-%d %H:%M:%S.%f", "%Y-%m-%d %H:%M:%S", "%Y-%m-%dT%H:%M:%S.%f",
+                "%Y-%m-%dT%H:%M:%S", "%Y/%m/%d %H:%M:%S.%f", "%Y/%m/%d %H:%M:%S")
+DAYFIRST_FORMATS = ("%d/%m/%Y %H:%M:%S.%f", "%d/%m/%Y %H:%M:%S", "%d/%m/%Y %H:%M",
+                    "%d.%m.%Y %H:%M:%S.%f", "%d.%m.%Y %H:%M:%S", "%d-%m-%Y %H:%M:%S",
+                    "%d/%m/%Y", "%d.%m.%Y", "%d-%m-%Y")
+MONTHFIRST_FORMATS = ("%m/%d/%Y %H:%M:%S.%f", "%m/%d/%Y %H:%M:%S", "%m/%d/%Y %I:%M:%S %p",
+                      "%m/%d/%Y %H:%M", "%m/%d/%Y")
+COMPACT_DECIMALS = 6  # max decimals (logged resolution) of a float32 channel
+COMPACT_INTS = (np.int8, np.int16)  # integer dtypes for flag/counter channels
+
+
+def clean_columns(data: pd.DataFrame):
+    """Update column names in place (no ' ', '(', ')', ',')"""
+    data.columns = (
+        data.columns.str.strip()
+        .str.replace(" ", "_", regex=True)
+        .str.replace("(", "", regex=True)
+        .str.replace(")", "", regex=True)
+        .str.replace(",", "", regex=True)
+    )
+
+
+def infer_date_format(values: pd.Series, dayfirst: bool = False) -> str | None:
+    """Return the format parsing most of a sample of 'values' (DATE_SAMPLE
+    from head and tail), None if no format parses at least half of it\n
+    Args:
+        values (pd.Series): timestamps as str
+        dayfirst (bool, optional): try day first formats (old monitor file)
+        instead of month first ones. Defaults to False."""
+    sample = pd.concat([values.iloc[:DATE_SAMPLE], values.iloc[-DATE_SAMPLE:]]).dropna()
+    best_format, best_parsed = None, sample.shape[0] / 2
+    for date_format in DATE_FORMATS + (DAYFIRST_FORMATS if dayfirst else MONTHFIRST_FORMATS):
+        parsed = pd.to_datetime(sample, format=date_format, errors="coerce").notna().sum()
+        if parsed > best_parsed:
+            best_format, best_parsed = date_format, parsed
+        if parsed == sample.shape[0]:
+            break
+    return best_format
+
+
+def extract_date(
+    data: pd.DataFrame, date_format: str | None = None, drop: bool = True
+) -> tuple[pd.DataFrame, str | None, pd.Series]:
+    """Return data with the correct 'Date' column (old Date/Time files and new
+    DateTime files, set in place), parsed in one vectorized pass with
+    'date_format' (inferred with 'infer_date_format' if None). Rows not
+    matching the format are parsed again element by element, the ones still
+    failing are removed\n
+    Args:
+        data (pd.DataFrame): raw data
+        date_format (str | None, optional): format found on a previous chunk
+        of the same file. Defaults to None.
+        drop (bool, optional): remove the rows with unparsable timestamps
+        (NaT otherwise, the caller removes them). Defaults to True.\n
+    Returns:
+        tuple[pd.DataFrame, str | None, pd.Series]: data, format used and raw
+        timestamps of the removed rows"""
+    if {"Date", "Time"}.issubset(set(data.columns)):  # old monitor file
+        dayfirst = True
+        raw = data["Date"]
+        if raw.dtype != object and not pd.api.types.is_datetime64_any_dtype(raw):
+            raw = raw.astype(str)
+        if raw.dtype == object and not raw.iloc[:DATE_SAMPLE].str.contains(":", na=False).any():
+            # date only, time in 'Time' column
+            raw = raw.str.cat(data["Time"].astype(str), sep=" ")
+    else:  # new monitor file
+        dayfirst = False
+        data.columns = ["Date" if col == "DateTime" else col for col in data.columns]
+        raw = data["Date"]
+
+    if pd.api.types.is_datetime64_any_dtype(raw):  # already parsed (excel)
+        return data, date_format, raw.iloc[:0]
+    if date_format is None:
+        date_format = infer_date_format(raw, dayfirst)
+    if date_format is None:  # unknown format, per element parsing
+        parsed = pd.to_datetime(raw, dayfirst=dayfirst, errors="coerce")
+    else:
+        parsed = pd.to_datetime(raw, format=date_format, errors="coerce")
+    failed = parsed.isna().to_numpy()
+    if failed.any() and date_format is not None:
+        # sibling formats (e.g. no '.%f', other day/month order): per element
+        parsed[failed] = pd.to_datetime(
+            raw[failed], dayfirst=dayfirst, errors="coerce"
+        ).to_numpy()
+        failed = parsed.isna().to_numpy()
+    data["Date"] = parsed
+
+    if drop and failed.any():
+        data = data.loc[~failed]
+    return data, date_format, raw[failed]
+
+
+def first_date(filepath: str) -> pd.Timestamp:
+    """Return the first timestamp of a RAW file (earliest of its first
+    DATE_SAMPLE rows), NaT if none is valid"""
+    file_format, _ = sniff_format(filepath)
+    head = read_functions[file_format](filepath, nrows=DATE_SAMPLE, usecols=column_filter([]))
+    clean_columns(head)
+    head, _, _ = extract_date(head)
+    return head["Date"].min()
+
+
+def overlapping_runs(spans: dict[int, tuple]) -> list[int]:
+    """Return the runs (files) whose time span overlaps another one\n
+    Args:
+        spans (dict[int, tuple]): first and last timestamp of each run"""
+    return sorted({
+        i for i, (first_i, last_i) in spans.items() for j, (first_j, last_j) in spans.items()
+        if i != j and first_j <= last_i and first_i <= last_j
+    })
+
+
+def date_report(bad_dates: pd.Series, report: dict | None = None) -> dict:
+    """Return (or update) the import report of unparsable timestamps\n
+    Args:
+        bad_dates (pd.Series): raw timestamps of the removed rows
+        report (dict | None, optional): report to update. Defaults to None.\n
+    Returns:
+        dict: 'date_rows' (removed rows) and 'date_values' (first
+        DATE_REPORT_MAX timestamps)"""
+    report = report or {"date_rows": 0, "date_values": []}
+    report["date_rows"] += int(bad_dates.shape[0])
+    missing = DATE_REPORT_MAX - len(report["date_values"])
+    report["date_values"] += bad_dates.iloc[:missing].astype(str).tolist()
+    return report
+
+
+def coerce_object_columns(data: pd.DataFrame) -> dict[str, int]:
+    """Replace in place str value in object columns (mixed type) with float
+    (or NaN). All object columns are converted together, with a single
+    vectorized 'pd.to_numeric' on their stacked values\n
+    Returns:
+        dict[str, int]: coerced columns and their cells coerced to NaN"""
+    obj_col = data.select_dtypes("object").columns.to_list()
+    if obj_col == []:
+        return {}
+    values, coerced = coerce_values(data[obj_col].to_numpy(dtype=object))
+    data[obj_col] = values
+    return {col: int(n_nan) for col, n_nan in zip(obj_col, coerced)}
+
+
+def coerce_values(raw: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    """Convert a 2D object array (one column per channel) to float with a
+    single 'pd.to_numeric' pass\n
+    Returns:
+        tuple[np.ndarray, np.ndarray]: float values (Fortran order, every
+        column contiguous) and cells coerced to NaN for each column"""
+    values = pd.to_numeric(raw.ravel(order="F"), errors="coerce").astype(np.float64)
+    values = values.reshape(raw.shape, order="F")
+    coerced = (np.isnan(values) & pd.notna(raw)).sum(axis=0)
+    return values, coerced
+
+
+def channel_decimals(values: np.ndarray) -> int | None:
+    """Return the decimals a float channel was logged with (finite values),
+    None if more than COMPACT_DECIMALS"""
+    for decimals in range(COMPACT_DECIMALS + 1):
+        if (np.round(values, decimals) == values).all():
+            return decimals
+    return None
+
+
+def compact_dtype(values: np.ndarray) -> np.dtype:
+    """Return the narrowest dtype able to hold a float channel:
+    - int8/int16 if all values are integer, without NaN, and in range
+    - float32 if every value rounded back to the channel decimals (see
+      'channel_decimals') is the logged one
+    - otherwise (or for not float channels) the current dtype"""
+    if values.dtype.kind != "f":
+        return values.dtype
+    finite = np.isfinite(values)
+    if values.size and finite.all() and (values == np.round(values)).all():
+        for dtype in COMPACT_INTS:
+            info = np.iinfo(dtype)
+            if values.min() >= info.min and values.max() <= info.max:
+                return np.dtype(dtype)
+    with np.errstate(over="ignore"):
+        narrow = values.astype(np.float32)
+    if not np.array_equal(np.isfinite(narrow), finite):
+        return values.dtype
+    logged = values[finite]
+    decimals = channel_decimals(logged)
+    if decimals is not None and (
+        np.round(narrow[finite].astype(np.float64), decimals) == logged
+    ).all():
+        return np.dtype(np.float32)
+    return values.dtype
+
+
+def compact_series(series: pd.Series) -> pd.Series:
+    """Return the series cast to its 'compact_dtype'"""
+    return series.astype(compact_dtype(series.to_numpy()), copy=False)
+
+
+def compact_columns(data: pd.DataFrame) -> dict[str, str]:
+    """Cast in place every channel to its 'compact_dtype'\n
+    Returns:
+        dict[str, str]: new dtype of the changed columns"""
+    changed = {}
+    for col in data.columns:
+        compact = compact_series(data[col])
+        if compact.dtype != data[col].dtype:
+            data[col] = compact
+            changed[col] = str(compact.dtype)
+    return changed
+
+
+class ChunkNormalizer:
+    """rearrange_file normalisation applied chunk by chunk.\n
+    The rows needed across chunk boundaries are carried over: the last row
+    (its zeros are filled with the first row of the next chunk) and the last
+    PAD_LIMIT rows before pad interpolation. Chunks of more files ('run')
+    must follow each other in time: files touching at the edges are
+    reported as in 'merge_runs'"""
+
+    def __init__(self):
+        self.columns: list[str] | None = None
+        self.obj_col: dict[str, int] = {}  # coerced columns and NaN cells
+        self.valid_col: set[str] = set()
+        self.nan_col: set[str] = set()
+        self.date_format: str | None = None
+        self.dates = date_report(pd.Series([], dtype=object))
+        self.run = 0  # file of the pushed chunks
+        self.spans: dict[int, list] = {}  # first and last 'Date' of each run
+        self.dup_rows = 0  # first rows equal to the last row of another run
+        self._pending: pd.DataFrame | None = None  # last row, zeros not filled
+        self._history: pd.DataFrame | None = None  # last rows, not interpolated
+        self._last_date = None
+        self._last_run = None
+
+    def push(self, chunk: pd.DataFrame) -> pd.DataFrame:
+        """Normalise a raw chunk\n
+        Args:
+            chunk (pd.DataFrame): raw data read from file\n
+        Raises:
+            ValueError: if columns differ from first chunk or data are not
+            time ordered\n
+        Returns:
+            pd.DataFrame: normalised rows ready to be stored"""
+        clean_columns(chunk)
+        chunk, self.date_format, bad_dates = extract_date(chunk, self.date_format)
+        date_report(bad_dates, self.dates)
+        chunk.drop(list(DROP_COLUMNS), axis=1, inplace=True, errors="ignore")
+        chunk.sort_values("Date", axis=0, ignore_index=True, inplace=True)
+        if self.columns is None:
+            self.columns = chunk.columns.to_list()
+        elif chunk.columns.to_list() != self.columns:
+            raise ValueError("Streaming import: all files must have the same columns")
+        if chunk.shape[0] == 0:
+            return chunk
+
+        first, last = chunk.Date.iloc[0], chunk.Date.iloc[-1]
+        if self._last_date is not None:
+            if first < self._last_date:
+                raise ValueError("Streaming import: data are not time ordered.\n"
+                                 "Files overlapping in time can't be imported chunk by chunk")
+            if first == self._last_date and self.run != self._last_run:
+                self.dup_rows += 1
+        self._last_date, self._last_run = last, self.run
+        self.spans.setdefault(self.run, [first, last])[1] = last
+
+        # all NaN columns are dropped on raw values (before the zero fill)
+        self.valid_col.update(chunk.columns[chunk.notna().any()])
+        if self._pending is not None:
+            chunk = pd.concat([self._pending, chunk], ignore_index=True)
+        # replace value equal to 0 value with bfill, limit 1 consecutive
+        chunk.replace(0, None, method="bfill", limit=1, inplace=True)
+        self._pending = chunk.iloc[-1:]
+        return self._finalize(chunk.iloc[:-1].copy())
+
+    def flush(self) -> pd.DataFrame:
+        """Return the carried over last row"""
+        if self._pending is None:
+            return pd.DataFrame(columns=self.columns)
+        last, self._pending = self._pending.copy(), None
+        return self._finalize(last)
+
+    def _finalize(self, rows: pd.DataFrame) -> pd.DataFrame:
+        """Numeric coercion and pad interpolation of rows whose zeros are
+        already filled"""
+        for col, n_nan in coerce_object_columns(rows).items():
+            self.obj_col[col] = self.obj_col.get(col, 0) + n_nan
+        channels = [col for col in rows.columns if col != "Date"]
+        rows = rows.astype({col: "float64" for col in channels})
+
+        n_history = 0 if self._history is None else self._history.shape[0]
+        if n_history:
+            rows = pd.concat([self._history, rows], ignore_index=True)
+        self._history = rows.iloc[-PAD_LIMIT:].copy()
+        # interpolate columns NaN, max 3, with backward value
+        rows.interpolate(axis=0, method="pad", limit=PAD_LIMIT, inplace=True)
+        rows = rows.iloc[n_history:]
+
+        self.nan_col.update(rows.columns[rows.isna().any()])
+        return rows
+
+    def result(self) -> tuple[list[str], dict]:
+        """Return columns to keep (all NaN columns dropped) and import
+        warnings"""
+        columns = [col for col in self.columns or [] if col in self.valid_col]
+        warnings = {
+            "obj_col": [col for col in columns if col in self.obj_col],
+            "obj_nan": {col: self.obj_col[col] for col in columns if col in self.obj_col},
+            "nan_col": [col for col in columns if col in self.nan_col],
+            **self.dates,
+            "overlap_files": overlapping_runs(self.spans),
+            "dup_rows": self.dup_rows,
+        }
+        return columns, warnings
+
+
+def stream_raw_files(
+    filepaths: tuple[str],
+    store_path: str,
+    chunk_rows: int = CHUNK_ROWS,
+    callback: Callable[[int, int, str], None] | None = None,
+    columns: list[str] | None = None,
+) -> tuple[list[str], dict]:
+    """Import RAW files chunk by chunk into a parquet store, so peak memory
+    doesn't depend on file size. Files are imported in order of their
+    first timestamp (see 'first_date') and must not overlap in time.\n
+    As the in memory import, zeros are back filled only in the files where
+    a channel is numeric: if a channel read as numbers (with zeros) in a
+    chunk is text in another chunk of the same file, the import is repeated
+    reading it as text in that file\n
+    Args:
+        filepaths (tuple[str]): raw files path
+        store_path (str): parquet file to write
+        chunk_rows (int, optional): rows per chunk. Defaults to CHUNK_ROWS.
+        callback (Callable[[int, int, str], None] | None, optional): called
+        as callback(n_read, n_files, filepath) every time a file is read.
+        Defaults to None.
+        columns (list[str] | None, optional): channels to read (projection,
+        see 'column_filter'). Defaults to None: all columns.\n
+    Returns:
+        tuple[list[str], dict]: columns to load (all NaN columns excluded)
+        and import warnings ('overlap_files' as index of 'filepaths')"""
+    dates = np.array([first_date(filepath) for filepath in filepaths], dtype="datetime64[ns]")
+    runs = np.argsort(dates, kind="stable").tolist()  # files without dates last
+    text: dict[int, list[str]] = {}
+    while True:
+        normalizer, mixed = _stream_runs(filepaths, runs, store_path, chunk_rows, callback,
+                                         columns, text)
+        if mixed == {}:
+            return normalizer.result()
+        for run, cols in mixed.items():
+            text[run] = text.get(run, []) + cols
+
+
+def _stream_runs(
+    filepaths: tuple[str],
+    runs: list[int],
+    store_path: str,
+    chunk_rows: int,
+    callback: Callable[[int, int, str], None] | None,
+    columns: list[str] | None,
+    text: dict[int, list[str]],
+) -> tuple[ChunkNormalizer, dict[int, list[str]]]:
+    """An import pass of 'stream_raw_files' over the files in 'runs' order,
+    reading as text the raw columns in 'text' (by file index). Return the
+    normalizer and the raw columns of each file read both as numbers with
+    zeros and as text (empty if none)"""
+    normalizer = ChunkNormalizer()
+    n_written = 0
+    mixed = {}
+
+    def write(rows: pd.DataFrame):
+        nonlocal n_written
+        if rows.shape[0] == 0:
+            return
+        fastparquet.write(store_path, rows, write_index=False, append=n_written > 0)
+        n_written += rows.shape[0]
+
+    for n_read, run in enumerate(runs, start=1):
+        filepath = filepaths[run]
+        normalizer.date_format = None  # each file can have its own format
+        normalizer.run = run
+        file_format, _ = sniff_format(filepath)
+        reader = partial(read_functions[file_format], usecols=column_filter(columns))
+        if file_format == "excel":  # no chunked reader
+            chunks = [reader(filepath)]
+            if "Condition" not in chunks[0].columns:  # Check correct reading
+                raise ValueError(f"Invalid file: {Path(filepath).name}\n"
+                                 "'Condition' column not found")
+        else:
+            dtype = dict.fromkeys(text.get(run, []), object)
+            chunks = reader(filepath, chunksize=chunk_rows, dtype=dtype)
+        text_col, zero_col = set(), set()
+        for chunk in chunks:
+            text_col.update(chunk.columns[chunk.dtypes == object])
+            numbers = [col for col in chunk.select_dtypes("number").columns if col not in zero_col]
+            zero_col.update(chunk[numbers].columns[(chunk[numbers] == 0).any()])
+            write(normalizer.push(chunk))
+        if text_col & zero_col:
+            mixed[run] = sorted(text_col & zero_col)
+        if callback:
+            callback(n_read, len(filepaths), filepath)
+    write(normalizer.flush())
+    return normalizer, mixed
+
+
+class TailReader:
+    """Read only the rows appended to a growing RAW text log (monitor file
+    still written by the test bench), normalised by a ChunkNormalizer.\n
+    Only complete lines are parsed, a partial last line is read at the next
+    call. The last normalised row is returned one call later (see
+    ChunkNormalizer)"""
+
+    def __init__(self, filepath: str, offset: int = 0, columns: list[str] | None = None):
+        """Args:
+            filepath (str): raw text file path
+            offset (int, optional): bytes already imported. Defaults to 0.
+            columns (list[str] | None, optional): channels to read
+            (projection, see 'column_filter'). Defaults to None: all
+            columns.\n
+        Raises:
+            ValueError: if the file is not a text log"""
+        file_format, self.header = sniff_format(filepath)
+        if file_format == "excel":
+            raise ValueError(f"Follow mode: {Path(filepath).name} is not a text log")
+        self.filepath = filepath
+        self.reader = partial(read_functions[file_format], usecols=column_filter(columns))
+        self.offset = offset
+        self.normalizer = ChunkNormalizer()
+        self._skip_partial = offset > 0 and not self._line_start(offset)
+
+    def _line_start(self, offset: int) -> bool:
+        """True if 'offset' is the start of a line"""
+        with open(self.filepath, "rb") as f:
+            f.seek(offset - 1)
+            return f.read(1) == b"\n"
+
+    def read_new(self) -> pd.DataFrame:
+        """Return the normalised rows appended since the last call (empty if
+        nothing new)\n
+        Raises:
+            ValueError: if the file was truncated or replaced"""
+        size = os.path.getsize(self.filepath)
+        if size < self.offset:
+            raise ValueError(f"Follow mode: {Path(self.filepath).name} was truncated")
+        with open(self.filepath, "rb") as f:
+            f.seek(self.offset)
+            data = f.read(size - self.offset)
+        end = data.rfind(b"\n") + 1
+        with_header = self.offset == 0
+        self.offset += end
+        data = data[:end]
+        if self._skip_partial and end:  # line already started at import time
+            data = data[data.find(b"\n") + 1 :]
+            self._skip_partial = False
+        if not data:
+            return pd.DataFrame(columns=self.normalizer.columns)
+
+        kwargs = {} if with_header else {"header": None, "names": self.header}
+        chunk = self.reader(io.BytesIO(data), **kwargs)
+        float_channels(chunk)
+        return self.normalizer.push(chunk)
@@ -0,0 +1,37 @@
+"""
+Export LifeTest da riga di comando (batch)
+"""
+import numpy as np
+import pandas as pd
+
+import batch
+
+
+def test_export_reads_preset_channels(tmp_path, monkeypatch):
+    """With a preset only Date, the cycle column and the preset channels
+    are read from the RAW files"""
+    n = 600
+    pd.DataFrame({
+        "DateTime": pd.date_range("2024-01-01", periods=n, freq="s").strftime("%Y-%m-%d %H:%M:%S"),
+        "Condition": 1,
+        "Iout_PM1": np.where(np.arange(n) // 60 % 2, 20.0, 0.5),
+        "T_PFC_PM1": 40 + np.arange(n) % 30,
+        "T_LLC_PM1": 50 + np.arange(n) % 20,
+    }).to_csv(tmp_path / "test.txt", sep="\t", index=False)
+    models = []
+
+    class Model(batch.Model):
+        def load_files(self, *args, **kwargs):
+            models.append(self)
+            return super().load_files(*args, **kwargs)
+
+    monkeypatch.setattr(batch, "Model", Model)
+    options = {
+        "column": "Iout_PM1", "threshold": 10.0, "x_max": 150, "n_bin": 150,
+        "columns": ["T_PFC_PM1", "Missing"], "smooth": False, "cycle_table": False,
+        "output": str(tmp_path), "cache_dir": str(tmp_path / "cache"),
+    }
+    result = batch.export_test("test", (str(tmp_path / "test.txt"),), options)
+    assert result["rows"] == n and "error" not in result
+    assert models[0].df.columns.to_list() == ["Date", "Iout_PM1", "T_PFC_PM1"]
+    assert "T_LLC_PM1" in models[0].columns_available
@@ -0,0 +1,46 @@
+"""
+Vista LifeTest (MaskedFrame): canali compressi tenuti con un limite e
+colonne caricate dopo l'import
+"""
+import numpy as np
+import pandas as pd
+
+from analysis import Model
+from channel_store import MaskedFrame
+
+
+def test_masked_frame_limit(monkeypatch):
+    """Least recently used channels over 'MAX_BYTES' are released, 'Date',
+    index and the last used channel are kept"""
+    data = pd.DataFrame({col: np.arange(100.0) for col in "ABCD"})
+    keep = np.arange(100) % 2 == 0
+    view = MaskedFrame(data, keep, np.arange(50))
+    monkeypatch.setattr(MaskedFrame, "MAX_BYTES", 2 * 50 * 8)
+    for col in "ABC":
+        view.channel(col)
+    assert view.cached() == ["Date", "B", "C"]
+    view.channel("B")
+    view.index
+    view.channel("D")
+    assert view.cached() == ["Date", "B", "D"] and None in view._channels
+    np.testing.assert_array_equal(view["A"], np.arange(0.0, 100.0, 2))
+    monkeypatch.setattr(MaskedFrame, "MAX_BYTES", 0)
+    assert view.channel("C").shape == (50,) and view.cached() == ["Date", "C"]
+    view.drop()
+    assert view.cached() == ["Date"]
+
+
+def test_load_columns_lifetest(tmp_path):
+    """Channels loaded after 'clean_cycle' are visible in 'df_lt'"""
+    rows = ["DateTime\tCondition\tP\tT"]
+    rows += [f"2024-01-01 00:00:{s:02d}\t1\t{5 * (s // 10 % 2)}\t{s}" for s in range(40)]
+    raw_file = tmp_path / "log.txt"
+    raw_file.write_text("\n".join(rows) + "\n")
+    model = Model(None, str(tmp_path / "cache"))
+    model.projection = ["P"]
+    model.load_files([str(raw_file)])
+    model.find_cycle(("P", 1.0))
+    model.clean_cycle("P")
+    assert model.load_columns(["T"]) == ["T"]
+    assert model.df_lt.data is model.df
+    np.testing.assert_array_equal(model.df_lt["T"], model.df["T"].to_numpy()[model.df_lt.keep])
@@ -0,0 +1,102 @@
+"""
+Conteggio cicli e tempo di ON (find_cycle), tabella dei cicli
+"""
+import datetime as dt
+
+import numpy as np
+import pandas as pd
+import pytest
+
+import func_numba as fnb
+from analysis import Model
+
+
+def test_time_on_exact(tmp_path):
+    """ON time of a long test comes from the int64 ns total, truncated to
+    the microsecond (no rounding through float seconds)"""
+    step = np.timedelta64(300 * 24 * 3600 * 10**9 + 1_999, "ns")  # 300 days + 1.999 us
+    model = Model(None, str(tmp_path))
+    model.df = pd.DataFrame({
+        "Date": np.datetime64("2000-01-01T00:00:00", "ns") + step * np.arange(5),
+        "P": [5.0, 0.0, 5.0, 0.0, 0.0],
+    })
+    cicli, time_on = model.find_cycle(("P", 1.0))["P"]
+    assert cicli == 2
+    assert time_on == dt.timedelta(days=600, microseconds=3)
+
+
+def test_cycle_cache_shared(tmp_path, monkeypatch):
+    """Edges saved in the import cache entry are used by the next Model on
+    the same files; after 'rearrange_file' nothing is reused"""
+    level = np.where((np.arange(600) // 50) % 2 == 1, 30.0, 5.0)
+    raw_file = tmp_path / "log.txt"
+    pd.DataFrame({
+        "DateTime": pd.date_range("2024-01-01", periods=600, freq="s").strftime("%Y-%m-%d %H:%M:%S"),
+        "Condition": 1,
+        "Iout_PM1": level,
+    }).to_csv(raw_file, sep="\t", index=False)
+    calls = []
+    speg_acc_index = fnb.speg_acc_index
+    monkeypatch.setattr(fnb, "speg_acc_index", lambda *args: calls.append(1) or speg_acc_index(*args))
+
+    results = []
+    for _ in range(2):
+        model = Model(None, str(tmp_path / "cache"))
+        model.load_files([str(raw_file)])
+        results.append(model.find_cycle(("Iout_PM1", 10.0)))
+    assert len(calls) == 1 and results[0] == results[1]
+    np.testing.assert_array_equal(model.cycle_data["Iout_PM1"]["on_index"], np.arange(50, 600, 100))
+
+    data = model.df.copy()
+    data["Iout_PM1"] = 30.0 - data["Iout_PM1"]  # same rows, other data
+    model.rearrange_file(data.rename(columns={"Date": "DateTime"}).assign(Condition=1))
+    assert model.find_cycle(("Iout_PM1", 10.0)) != results[0]
+    assert len(calls) == 2
+
+
+@pytest.mark.parametrize("threshold", [2.0, (2.5, 1.5, 0)])
+def test_cycle_table_time_on(tmp_path, threshold):
+    """Cycle durations sum to the ON time of 'find_cycle' (also cycles
+    cut by the data bounds), statistics as pandas on the cycle rows"""
+    rng = np.random.default_rng(0)
+    for it in range(100):
+        n = int(rng.integers(2, 300))
+        level = np.repeat(rng.random(n // 10 + 1) * 4, 10)[:n]
+        level[rng.random(n) < 0.05] = np.nan
+        model = Model(None, str(tmp_path))
+        model.df = pd.DataFrame({
+            "Date": np.datetime64("2024-01-01", "ns") + np.cumsum(rng.integers(1, 10**10, n)),
+            "P": level,
+            "T": rng.random(n) * 100,
+        })
+        _, time_on = model.find_cycle(("P", threshold))["P"]
+        table = model.cycle_table("P", ["T"])
+        total = np.timedelta64(int(round(table["Duration(s)"].sum() * 10**9)), "ns")
+        assert abs(pd.Timedelta(total) - pd.Timedelta(time_on)) < pd.Timedelta(1, "us")
+        for row in table.itertuples():
+            rows = model.df["T"].iloc[row.Start : row.End + 1]
+            assert (row.T_min, row.T_max) == (rows.min(), rows.max())
+            assert row.T_mean == pytest.approx(rows.mean())
+
+
+@pytest.mark.parametrize("on_grid", [False, True])
+def test_threshold_sweep_single_thresholds(on_grid):
+    """Each threshold of the sweep as speg_acc_index + cicli_time_jit; ON
+    time compared only without values equal to a threshold"""
+    rng = np.random.default_rng(on_grid)
+    for _ in range(300):
+        n = int(rng.integers(0, 200))
+        data = np.repeat(rng.random(n // 3 + 1) * 10, rng.integers(1, 4))[:n]
+        data[rng.random(len(data)) < 0.1] = np.nan
+        time = np.cumsum(rng.integers(1, 10**10, len(data))).astype(np.int64)
+        soglie = np.unique(rng.random(int(rng.integers(1, 30))) * 12 - 1)
+        if on_grid:
+            data = np.round(data)
+            soglie = np.unique(np.round(soglie))
+        cicli, time_on = fnb.threshold_sweep_jit(data, time, soglie)
+        for j, soglia in enumerate(soglie):
+            spegnimenti, accensioni = fnb.speg_acc_index(data, soglia)
+            expected = fnb.cicli_time_jit(accensioni, spegnimenti, time)
+            assert cicli[j] == expected[0]
+            if not on_grid:
+                assert time_on[j] == expected[1]
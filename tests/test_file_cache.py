@@ -0,0 +1,28 @@
+"""
+Cache su disco condivisa tra processi (batch)
+"""
+import shutil
+
+import numpy as np
+import pandas as pd
+
+import file_cache
+from file_cache import FileCache
+
+
+def test_evict_skips_removed_entries(tmp_path, monkeypatch):
+    """An entry removed by another worker during eviction is skipped"""
+    cache = FileCache(str(tmp_path), "test", max_bytes=0)
+    data = pd.DataFrame({"Date": pd.date_range("2024", periods=10, freq="s"), "A": np.arange(10.0)})
+    for key in ("a", "b", "c"):
+        file_cache.ChannelStore.write(tmp_path / key, data, {"warnings": {}})
+    nbytes = file_cache.ChannelStore.nbytes
+
+    def removed_meanwhile(store):
+        if store.directory.name == "b":
+            shutil.rmtree(store.directory)
+        return nbytes(store)
+
+    monkeypatch.setattr(file_cache.ChannelStore, "nbytes", removed_meanwhile)
+    cache.evict(keep="c")
+    assert sorted(entry.name for entry in tmp_path.iterdir()) == ["c"]
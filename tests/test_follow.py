@@ -0,0 +1,78 @@
+"""
+Follow mode: cicli, tempo di ON e dati LifeTest aggiornati solo con le
+nuove righe, confrontati con l'import completo dello stesso log
+"""
+import numpy as np
+import pandas as pd
+import pytest
+
+from analysis import Model
+
+
+def log_lines(level: np.ndarray) -> list[str]:
+    """Lines of a monitor log with 'Iout_PM1' = level, one row per second"""
+    rows = pd.DataFrame({
+        "DateTime": pd.date_range("2024-01-01", periods=len(level), freq="s").strftime(
+            "%Y-%m-%d %H:%M:%S"
+        ),
+        "Condition": 1,
+        "Iout_PM1": level,
+        "T_PFC_PM1": 40 + np.arange(len(level)) % 20,
+    })
+    return rows.to_csv(sep="\t", index=False).splitlines(True)
+
+
+def follow(tmp_path, level: np.ndarray, threshold, cut: int, step: int) -> tuple[Model, Model]:
+    """Model following the log from row 'cut' and model importing all of it
+    (the last row is read by the next update, not in both)"""
+    lines = log_lines(level)
+    live, full = tmp_path / "live.txt", tmp_path / "full.txt"
+    live.write_text("".join(lines[: cut + 1]))
+    full.write_text("".join(lines[:-1]))
+    models = []
+    for filepath in (live, full):
+        model = Model(None, str(tmp_path / "cache"))
+        model.load_files([str(filepath)])
+        model.find_cycle(("Iout_PM1", threshold))
+        model.clean_cycle("Iout_PM1")
+        model.data_distribution("T_PFC_PM1", None, 0, 150, 150)
+        models.append(model)
+    models[0].follow_start(str(live))
+    for row in range(cut + 1, len(lines), step):
+        with open(live, "a") as f:
+            f.writelines(lines[row : row + step])
+        models[0].follow_update()
+    return models[0], models[1]
+
+
+def assert_same(followed: Model, full: Model):
+    a, b = followed.cycle_data["Iout_PM1"], full.cycle_data["Iout_PM1"]
+    np.testing.assert_array_equal(a["on_index"], b["on_index"])
+    np.testing.assert_array_equal(a["off_index"], b["off_index"])
+    assert (a["cycle"], a["time_on"]) == (b["cycle"], b["time_on"])
+    np.testing.assert_array_equal(followed.df_lt.index, full.df_lt.index)
+    np.testing.assert_array_equal(followed.df_lt.Date, full.df_lt.Date)
+    np.testing.assert_allclose(
+        followed.lifetest_analyzed["distr"]["T_PFC_PM1"],
+        full.lifetest_analyzed["distr"]["T_PFC_PM1"],
+    )
+
+
+@pytest.mark.parametrize("threshold", [10.0, (20.0, 15.0, 5)])
+def test_follow_cycles(tmp_path, threshold):
+    """Cycles, ON time and LifeTest data as the full import"""
+    level = np.where((np.arange(3000) // 100) % 2 == 1, 30.0, 5.0)
+    level[1000:1003] = 17.0  # inside the hysteresis band
+    followed, full = follow(tmp_path, level, threshold, cut=450, step=237)
+    assert_same(followed, full)
+
+
+@pytest.mark.parametrize("first", ["on", "off"])
+def test_follow_without_edges(tmp_path, first):
+    """Log ON (or OFF) from its first row: no edge at import, the first
+    ones arrive with the new rows"""
+    level = np.full(1200, 30.0 if first == "on" else 5.0)
+    level[500:700] = 5.0 if first == "on" else 30.0
+    level[900:] = level[600]
+    followed, full = follow(tmp_path, level, 10.0, cut=300, step=150)
+    assert_same(followed, full)
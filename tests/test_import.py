@@ -0,0 +1,79 @@
+"""
+Import dei file grezzi del Model: lettura parallela dei file e import a
+blocchi (streaming) confrontato con quello in memoria
+"""
+from functools import partial
+
+import numpy as np
+import pandas as pd
+import pytest
+
+import analysis
+from analysis import Model
+from reader import read_raw_file, stream_raw_files
+
+
+def write_logs(tmp_path, rows: list[int]) -> list[str]:
+    """Monitor logs with consecutive timestamps (one row per second), a
+    file for each item of 'rows'"""
+    filepaths = []
+    start = pd.Timestamp("2024-01-01")
+    for i, n in enumerate(rows):
+        data = pd.DataFrame({
+            "DateTime": pd.date_range(start, periods=n, freq="s").strftime("%Y-%m-%d %H:%M:%S"),
+            "Condition": 1,
+            "Iout_PM1": np.arange(n) % 7 + i,
+            "T_PFC_PM1": np.linspace(20, 60, n),
+        })
+        start += pd.Timedelta(seconds=n)
+        filepath = tmp_path / f"log_{i}.txt"
+        data.to_csv(filepath, sep="\t", index=False)
+        filepaths.append(str(filepath))
+    return filepaths
+
+
+@pytest.mark.parametrize("workers", [1, 3])
+def test_read_files_serial_concat(tmp_path, workers):
+    """Parallel (or single process) read as the serial concat, in the
+    selection order"""
+    filepaths = write_logs(tmp_path, [50, 1, 120, 80])
+    filepaths.reverse()
+    model = Model(None, str(tmp_path / "cache"))
+    model.read_workers = workers
+    read = []
+    data = model.read_files(filepaths, callback=lambda n, total, file: read.append(file))
+    frames = [read_raw_file(filepath)[0] for filepath in filepaths]
+    pd.testing.assert_frame_equal(data, pd.concat(frames, ignore_index=True))
+    assert model.read_runs == [frame.shape[0] for frame in frames]
+    assert sorted(read) == sorted(filepaths)
+
+
+def test_stream_as_in_memory(tmp_path, monkeypatch):
+    """Streaming import of files selected out of time order, touching at
+    the edges, with a channel that is text in a chunk of a file (its zeros
+    are back filled only in the other file): same data and warnings of the
+    in memory import for any chunk size"""
+    level = np.tile([0.0, 0.0, 3.0, 0.0, np.nan, np.nan, 5.0, 0.0, 1.0, 2.0], 6)
+    rows = [
+        f"2024-01-01 00:{i // 60:02d}:{i % 60:02d}\t1\t{x}\t{'err' if i == 25 else x}"
+        for i, x in enumerate(level)
+    ]
+    later = rows[-1:] + [  # the last row again, 'X' numeric in this file
+        f"2024-01-01 00:01:{i:02d}\t1\t{i % 4}\t{i % 3}" for i in range(1, 40)
+    ]
+    filepaths = []
+    for name, lines in (("later.txt", later), ("first.txt", rows)):
+        filepaths.append(str(tmp_path / name))
+        (tmp_path / name).write_text("\n".join(["DateTime\tCondition\tY\tX", *lines]) + "\n")
+
+    full = Model(None, str(tmp_path / "full"))
+    full.load_files(filepaths, stream=False)
+    assert full.import_warnings["overlap_files"] == [0, 1]
+    assert full.import_warnings["dup_rows"] == 1
+    assert full.import_warnings["obj_col"] == ["X"]
+    for chunk_rows in (7, 10, 100):
+        monkeypatch.setattr(analysis, "stream_raw_files", partial(stream_raw_files, chunk_rows=chunk_rows))
+        streamed = Model(None, str(tmp_path / f"stream_{chunk_rows}"))
+        streamed.load_files(filepaths, stream=True)
+        pd.testing.assert_frame_equal(streamed.df, full.df)
+        assert streamed.import_warnings == full.import_warnings
@@ -0,0 +1,108 @@
+"""
+Pipeline di normalizzazione (normalize_raw) confrontata con i passi
+pandas del vecchio rearrange_file, merge dei file con un sort stabile
+"""
+import numpy as np
+import pandas as pd
+import pytest
+
+import func_numba as fnb
+from pipeline import merge_runs, normalize_raw
+from reader import read_raw_file
+
+
+def rearrange_reference(data: pd.DataFrame) -> pd.DataFrame:
+    """Previous rearrange_file steps (pandas, on a copy), rows with
+    unparsable timestamps removed"""
+    data = data.rename(columns={"DateTime": "Date"})
+    data["Date"] = pd.to_datetime(data["Date"], errors="coerce")
+    data = data.dropna(subset=["Date"]).sort_values("Date", kind="stable", ignore_index=True)
+    data = data.drop(columns=["Condition"]).dropna(axis=1, how="all")
+    data.replace(0, None, method="bfill", limit=1, inplace=True)
+    for col in data.select_dtypes("object").columns:
+        data[col] = data[col].apply(pd.to_numeric, errors="coerce").astype(float)
+    data.interpolate(axis=0, method="pad", limit=3, inplace=True)
+    return data
+
+
+def write_log(filepath, start: str, x: list, y: list) -> str:
+    dates = pd.date_range(start, periods=len(x), freq="s").strftime("%Y-%m-%d %H:%M:%S")
+    lines = ["DateTime\tCondition\tX\tY"]
+    lines += [f"{d}\t1\t{a}\t{b}" for d, a, b in zip(dates, x, y)]
+    filepath.write_text("\n".join(lines) + "\n")
+    return str(filepath)
+
+
+def test_mixed_column_across_files(tmp_path):
+    """A channel that is text in a file and numeric in another one: zeros
+    of the numeric file are back filled, as on raw values"""
+    numeric = write_log(tmp_path / "b.txt", "2024-01-01 01:00:00",
+                        [0, 1, 0, 0, 2, "", 0, "", "", "", "", 5, 0],
+                        [0, 0, 3, "", "", "", "", 1, 0, 2, 0, 0, 4])
+    text = write_log(tmp_path / "a.txt", "2024-01-01 00:00:00",
+                     [0, 3, "err", 0, 0, "7", "", 0, "", 2, 0, 0, 4],
+                     [1, 0, 2, 0, 0, 0, 3, "", "", "", "", "", 0])
+    frames = [read_raw_file(filepath)[0] for filepath in (numeric, text)]
+    frames[1].loc[4, "DateTime"] = "not a date"
+    assert frames[0].X.dtype == np.float64 and frames[1].X.dtype == object
+    data = pd.concat(frames, ignore_index=True)
+    expected = rearrange_reference(data.copy())
+    normalized, warnings = normalize_raw(data, runs=[frame.shape[0] for frame in frames])
+    pd.testing.assert_frame_equal(normalized, expected)
+    assert warnings["obj_col"] == ["X"] and warnings["date_rows"] == 1
+    assert normalized.X.iloc[12:16].tolist() == [1.0, 1.0, 0.0, 2.0]  # zeros of "b"
+
+
+def sorted_reference(values: np.ndarray, runs: list[int]) -> tuple[np.ndarray, int]:
+    """Stable sort of the concatenated runs and rows equal to the previous
+    row of another run"""
+    order = np.argsort(values, kind="stable")
+    run_id = np.repeat(np.arange(len(runs)), runs)[order]
+    same = (values[order][1:] == values[order][:-1]) & (run_id[1:] != run_id[:-1])
+    return order, int(same.sum())
+
+
+def random_runs(rng, sort: bool) -> tuple[np.ndarray, list[int]]:
+    """Runs (also empty) of few distinct values, many ties across runs"""
+    runs = rng.integers(0, 12, int(rng.integers(1, 6))).tolist()
+    base = rng.integers(0, 5)
+    values = [base + rng.integers(0, 8, n) for n in runs]
+    if sort:
+        values = [np.sort(run) for run in values]
+    return np.concatenate(values).astype(np.int64), runs
+
+
+def test_merge_runs_jit_stable_sort():
+    """k-way merge of sorted runs as a stable sort, same duplicates"""
+    rng = np.random.default_rng(0)
+    for _ in range(2000):
+        values, runs = random_runs(rng, sort=True)
+        bounds = np.concatenate(([0], np.cumsum(runs))).astype(np.int64)
+        order, dup_rows = fnb.merge_runs_jit(values, bounds)
+        np.testing.assert_array_equal(order, sorted_reference(values, runs)[0])
+        assert dup_rows == sorted_reference(values, runs)[1]
+
+
+@pytest.mark.parametrize("sort", [True, False])
+def test_merge_runs_stable_sort(sort):
+    """Rows order (block reorder, merge or full sort) and report of
+    merge_runs as a stable sort of the dates"""
+    rng = np.random.default_rng(sort)
+    for it in range(2000):
+        values, runs = random_runs(rng, sort)
+        if it % 3 == 0:  # not overlapping, any files order
+            starts = rng.permutation(len(runs)) * 100
+            values = values + np.repeat(starts, runs)
+        dates = (values * 10**9).astype("datetime64[ns]")
+        order, report = merge_runs(dates, runs)
+        expected, dup_rows = sorted_reference(values, runs)
+        np.testing.assert_array_equal(np.arange(len(values)) if order is None else order, expected)
+        assert report["dup_rows"] == dup_rows
+        spans = {
+            i: (run.min(), run.max())
+            for i, run in enumerate(np.split(values, np.cumsum(runs)[:-1])) if run.size
+        }
+        assert report["overlap_files"] == [
+            i for i, (first, last) in spans.items()
+            if any(j != i and start <= last and first <= end for j, (start, end) in spans.items())
+        ]
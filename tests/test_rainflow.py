@@ -0,0 +1,82 @@
+"""
+Conteggio rainflow confrontato con un conteggio a 4 punti riga per riga
+"""
+import numpy as np
+import pytest
+
+from rainflow import RainflowCount
+
+
+def turning_points(data: np.ndarray) -> list[float]:
+    """Peaks and valleys (NaN and repeated values skipped), first and last
+    value kept"""
+    values = [x for x in data if not np.isnan(x)]
+    values = [x for i, x in enumerate(values) if i == 0 or x != values[i - 1]]
+    return [
+        x for i, x in enumerate(values)
+        if i in (0, len(values) - 1) or (x - values[i - 1]) * (values[i + 1] - x) < 0
+    ]
+
+
+def four_point(points: list[float]) -> tuple[list[tuple[float, float]], list[float]]:
+    """Full cycles (range, mean) and residual of the 4-point method"""
+    cycles, stack = [], []
+    for point in points:
+        stack.append(point)
+        while len(stack) >= 4:
+            a, b, c, d = stack[-4:]
+            if abs(c - b) > abs(b - a) or abs(c - b) > abs(d - c):
+                break
+            cycles.append((abs(c - b), (b + c) / 2))
+            del stack[-3:-1]
+    return cycles, stack
+
+
+def histogram(rainflow: RainflowCount, cycles: list[tuple[float, float]], weight: float = 1):
+    """Cycles in the bins of 'rainflow' (out of range in the edge bins)"""
+    counts = np.zeros_like(rainflow.counts)
+    for x, mean in cycles:
+        r_bin = min(int(x / rainflow.range_width), len(rainflow.range_bins) - 1)
+        m_bin = int(np.floor((mean - rainflow.mean_min) / rainflow.mean_width))
+        counts[r_bin, min(max(m_bin, 0), len(rainflow.mean_bins) - 1)] += weight
+    return counts
+
+
+def test_rainflow_four_point():
+    """Full cycles, residual and half cycles as the reference, also counting
+    the series in pieces"""
+    rng = np.random.default_rng(0)
+    for it in range(300):
+        n = int(rng.integers(0, 300))
+        data = np.round(np.cumsum(rng.standard_normal(n)) * 20 + 50)
+        data[rng.random(n) < 0.05] = np.nan
+        cycles, residual = four_point(turning_points(data))
+
+        rainflow = RainflowCount(range_width=2, range_max=100, mean_width=10, mean_min=0, mean_max=100)
+        cuts = np.sort(rng.integers(0, n + 1, it % 4))
+        for piece in np.split(data, cuts):
+            rainflow.add(piece)
+        np.testing.assert_array_equal(rainflow.counts, histogram(rainflow, cycles))
+        np.testing.assert_array_equal(rainflow.residual, residual)
+        half = [(abs(b - a), (a + b) / 2) for a, b in zip(residual, residual[1:])]
+        np.testing.assert_array_equal(rainflow.half_cycles(), histogram(rainflow, half, 0.5))
+
+
+@pytest.mark.parametrize("data, residual", [
+    ([], []),
+    ([3.0, 3.0, np.nan], [3.0]),
+    ([0.0, 4.0, 10.0], [0.0, 10.0]),
+    ([10.0, np.nan, 2.0, 2.0], [10.0, 2.0]),
+])
+def test_rainflow_residual_points(data, residual):
+    """Series without full cycles: 0, 1 or 2 residual points, a half cycle
+    only for 2 points"""
+    rainflow = RainflowCount()
+    rainflow.add(np.array(data))
+    np.testing.assert_array_equal(rainflow.residual, residual)
+    assert rainflow.counts.sum() == 0
+    assert rainflow.histogram().to_numpy().sum() == 0.5 * (len(residual) == 2)
+    if len(residual) == 2:
+        r_bin = int(abs(residual[1] - residual[0]))
+        m_bin = int((np.mean(residual) - rainflow.mean_min) // rainflow.mean_width)
+        assert rainflow.half_cycles()[r_bin, m_bin] == 0.5
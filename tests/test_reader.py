@@ -0,0 +1,100 @@
+"""
+Lettura dei file grezzi: formato, date e colonne non numeriche
+"""
+from functools import partial
+
+import numpy as np
+import pandas as pd
+
+import reader
+from pipeline import normalize_raw
+from reader import compact_dtype, extract_date, read_raw_file, sniff_format, stream_raw_files
+
+
+def test_extract_date_sibling_formats():
+    """Rows not matching the inferred format are parsed element by element,
+    only the unparsable ones are removed"""
+    values = [f"2024-01-01 00:00:{s:02d}.500" for s in range(50)]
+    values += ["2024-01-01 00:01:00", "garbage", None, "2024-01-01T00:01:01"]
+    data, date_format, bad = extract_date(pd.DataFrame({"DateTime": values, "x": range(54)}))
+    assert date_format == "%Y-%m-%d %H:%M:%S.%f"
+    assert bad.tolist() == ["garbage", None]
+    assert data.shape[0] == 52
+    assert data.Date.iloc[-2:].tolist() == [
+        pd.Timestamp("2024-01-01 00:01:00"),
+        pd.Timestamp("2024-01-01 00:01:01"),
+    ]
+
+
+def test_extract_date_dayfirst_fallback():
+    """Old monitor file: a row without seconds keeps the day first order"""
+    dates = ["13/01/2024 10:00:00"] * 30 + ["14/01/2024 10:00"]
+    data, date_format, bad = extract_date(pd.DataFrame({"Date": dates, "Time": "", "x": 1}))
+    assert date_format == "%d/%m/%Y %H:%M:%S"
+    assert bad.empty
+    assert data.Date.iloc[-1] == pd.Timestamp("2024-01-14 10:00")
+
+
+def test_zero_then_nan_column_kept(tmp_path):
+    """A channel with only zeros and NaN is kept (all NaN after the zero
+    fill), as 'dropna(how="all")' ran on raw values"""
+    rows = ["DateTime\tCondition\tA\tB"]
+    rows += [f"2024-01-01 00:00:{s:02d}\t1\t{s}\t{'0' if s == 0 else ''}" for s in range(20)]
+    raw_file = tmp_path / "zero.txt"
+    raw_file.write_text("\n".join(rows) + "\n")
+    data, warnings = normalize_raw(read_raw_file(str(raw_file))[0])
+    assert data.columns.to_list() == ["Date", "A", "B"]
+    assert data.B.isna().all() and "B" in warnings["nan_col"]
+
+    store = tmp_path / "store.parquet"
+    columns, stream_warnings = stream_raw_files((str(raw_file),), str(store), chunk_rows=7)
+    assert columns == ["Date", "A", "B"]
+    assert stream_warnings["nan_col"] == warnings["nan_col"]
+
+
+def test_sniff_wide_header(tmp_path):
+    """Header longer than a read block: 'Condition' at the end is found and
+    the last column name is complete"""
+    channels = [f"Channel_with_a_long_name_{i}" for i in range(400)]
+    raw_file = tmp_path / "wide.txt"
+    raw_file.write_text("\t".join(["DateTime", *channels, "Condition"]) + "\r\n1\t2\r\n")
+    file_format, header = sniff_format(str(raw_file))
+    assert file_format == "tab"
+    assert header[-2:] == [channels[-1], "Condition"] and len(header) == 402
+
+
+def test_read_mixed_column_once(tmp_path, monkeypatch):
+    """A non numeric cell makes only its column object, the file is parsed
+    once and the integer channels are float64 as with a float schema"""
+    rows = ["DateTime\tCondition\tA\tB\tC"]
+    rows += [f"2024-01-01 00:00:{s:02d}\t1\t{s}\t{'x' if s == 5 else s / 2}\t{s / 4}" for s in range(20)]
+    raw_file = tmp_path / "mixed.txt"
+    raw_file.write_text("\n".join(rows) + "\n")
+    calls = []
+
+    def read_csv(*args, **kwargs):
+        calls.append(args)
+        return pd.read_csv(*args, **kwargs)
+
+    monkeypatch.setitem(reader.read_functions, "tab", partial(read_csv, **reader.tab_csv.keywords))
+    data, _ = read_raw_file(str(raw_file))
+    assert len(calls) == 1
+    assert data.dtypes[["A", "B", "C"]].tolist() == [np.float64, object, np.float64]
+    normalized, warnings = normalize_raw(data)
+    assert warnings["obj_col"] == ["B"] and normalized.B.dtype == np.float64
+
+
+def test_compact_dtype_precision():
+    """float32 only if every value keeps its logged decimals: counters above
+    2**24 and high resolution channels stay float64"""
+    counter = 2.0**24 + np.arange(1000)
+    counter[::100] = np.nan
+    assert compact_dtype(counter) == np.float64
+    assert compact_dtype(np.array([1234567.891, 0.5])) == np.float64
+    assert compact_dtype(np.random.default_rng(0).random(100)) == np.float64
+    temperature = np.round(np.linspace(-40, 150, 1001), 2)
+    temperature[::7] = np.nan
+    assert compact_dtype(temperature) == np.float32
+    narrow = temperature.astype(np.float32).astype(np.float64)
+    np.testing.assert_array_equal(np.round(narrow, 2), temperature)
+    assert compact_dtype(np.array([0.0, 2.0, 300.0])) == np.int16
@@ -0,0 +1,161 @@
+"""
+retime_jit (clean_cycle) confrontato con il vecchio retime_jit2 a quattro
+casi e con un riferimento riga per riga per i casi senza ON/OFF
+"""
+import numpy as np
+import pandas as pd
+import pytest
+
+import func_numba as fnb
+from analysis import Model
+
+
+def retime_jit2(date, P_off, P_on):
+    """Previous four-branch kernel (plain python, on a copy), defined only
+    with at least one ON and one OFF"""
+    date = date.copy()
+    shape = len(date)
+    # 1
+    if P_off[0] > P_on[0] and P_on[-1] < P_off[-1]:
+        offset = date[P_on[0]]
+        for k in range(0, P_off[0], 1):
+            date[k] -= offset
+        for i in range(len(P_on)-1):
+            offset = offset+(date[P_on[i+1]]-date[P_off[i]])
+            for j in range(P_off[i], P_off[i+1], 1):
+                date[j] -= offset
+    # 2
+    elif (P_off[0] > P_on[0] and P_on[-1] > P_off[-1]):
+        offset = date[P_on[0]]
+        for k in range(0, P_off[0], 1):
+            date[k] -= offset
+        for i in range(len(P_on)-2):
+            offset = offset+(date[P_on[i+1]]-date[P_off[i]])
+            for j in range(P_off[i], P_off[i+1], 1):
+                date[j] -= offset
+        offset = offset+(date[P_on[-1]]-date[P_off[-1]])
+        for ii in range(P_off[-1], shape, 1):
+            date[ii] -= offset
+    # 3
+    elif (P_off[0] < P_on[0] and P_on[-1] > P_off[-1]):
+        offset = date[0]
+        for k in range(0, P_off[0], 1):
+            date[k] -= offset
+        for i in range(len(P_on)-1):
+            offset = offset+(date[P_on[i]]-date[P_off[i]])
+            for j in range(P_off[i], P_off[i+1], 1):
+                date[j] -= offset
+        offset = offset+(date[P_on[-1]]-date[P_off[-1]])
+        for ii in range(P_off[-1], shape, 1):
+            date[ii] -= offset
+    # 4
+    elif (P_off[0] < P_on[0] and P_on[-1] < P_off[-1]):
+        offset = date[0]
+        for k in range(0, P_off[0], 1):
+            date[k] -= offset
+        for i in range(len(P_on)-0):
+            offset = offset+(date[P_on[i]]-date[P_off[i]])
+            for j in range(P_off[i], P_off[i+1], 1):
+                date[j] -= offset
+    return date
+
+
+def retime_rows(date, P_off, P_on):
+    """Row by row reference: offset of a row = start (first ON, or first
+    row) plus the OFF gaps (OFF to next ON) of the OFF before it; 0 after
+    an OFF not followed by an ON"""
+    start = date[P_on[0]] if len(P_on) and (not len(P_off) or P_on[0] < P_off[0]) else date[0]
+    retimed = np.empty_like(date)
+    for i in range(len(date)):
+        offset = start
+        for off in P_off[P_off <= i]:
+            next_on = P_on[P_on >= off]
+            if len(next_on) == 0:
+                offset = 0
+                break
+            offset += date[next_on[0]] - date[off]
+        retimed[i] = date[i] - offset
+    return retimed
+
+
+def edges(rng, n: int, on_first: bool, n_edges: int) -> tuple[np.ndarray, np.ndarray]:
+    """Alternating OFF and ON indexes ('n_edges' in 1..n-1)"""
+    index = np.sort(rng.choice(np.arange(1, n), n_edges, replace=False)).astype(np.int64)
+    first, second = index[0::2], index[1::2]
+    return (second, first) if on_first else (first, second)
+
+
+def dates(rng, n: int) -> np.ndarray:
+    return np.cumsum(rng.integers(1, 10**10, n)).astype(np.int64) + 10**18
+
+
+@pytest.mark.parametrize("on_first", [True, False])
+@pytest.mark.parametrize("on_last", [True, False])
+def test_four_cases(on_first, on_last):
+    """Same result of retime_jit2 for every first/last ON/OFF combination"""
+    rng = np.random.default_rng([on_first, on_last])
+    for _ in range(300):
+        n = int(rng.integers(4, 60))
+        n_edges = int(rng.integers(2, n))
+        # alternating: the last edge is ON for odd counts when ON is first
+        if (n_edges % 2 == 1) != (on_first == on_last):
+            n_edges -= 1
+        if n_edges < 2:
+            continue
+        P_off, P_on = edges(rng, n, on_first, n_edges)
+        date = dates(rng, n)
+        assert (P_on[0] < P_off[0]) == on_first and (P_on[-1] > P_off[-1]) == on_last
+        retimed = fnb.retime_jit(date, P_off, P_on)
+        np.testing.assert_array_equal(retimed, retime_jit2(date, P_off, P_on))
+        np.testing.assert_array_equal(retimed, retime_rows(date, P_off, P_on))
+
+
+@pytest.mark.parametrize("case", ["no ON", "no OFF", "no edge"])
+def test_missing_edges(case):
+    """Empty ON or OFF indexes (a single edge) and no edge at all"""
+    rng = np.random.default_rng(len(case))
+    for _ in range(100):
+        n = int(rng.integers(2, 40))
+        edge = np.array([rng.integers(1, n)], dtype=np.int64)
+        empty = np.zeros(0, dtype=np.int64)
+        P_off, P_on = {"no ON": (edge, empty), "no OFF": (empty, edge), "no edge": (empty, empty)}[case]
+        date = dates(rng, n)
+        retimed = fnb.retime_jit(date, P_off, P_on)
+        np.testing.assert_array_equal(retimed, retime_rows(date, P_off, P_on))
+    assert fnb.retime_jit(np.zeros(0, dtype=np.int64), empty, empty).shape == (0,)
+
+
+def test_generated_edges():
+    """Edges of real signals (speg_acc_index, cycle_edges_jit)"""
+    rng = np.random.default_rng(0)
+    for it in range(500):
+        n = int(rng.integers(2, 80))
+        x = rng.random(n) * 4
+        date = dates(rng, n)
+        if it % 2:
+            x[rng.random(n) < 0.1] = np.nan
+            P_off, P_on = fnb.speg_acc_index(x, 2.0)
+        else:
+            P_off, P_on = fnb.cycle_edges_jit(x, date, 2.5, 1.5, int(rng.integers(0, 3 * 10**10)))
+        retimed = fnb.retime_jit(date, P_off, P_on)
+        np.testing.assert_array_equal(retimed, retime_rows(date, P_off, P_on))
+        if len(P_on) and len(P_off):
+            np.testing.assert_array_equal(retimed, retime_jit2(date, P_off, P_on))
+
+
+@pytest.mark.parametrize("level", [5.0, 0.5])
+def test_clean_cycle_without_edges(tmp_path, level):
+    """A column always ON (all rows kept) or always OFF (no row kept)"""
+    model = Model(None, str(tmp_path))
+    model.df = pd.DataFrame(
+        {"Date": pd.date_range("2024-01-01", periods=10, freq="s"), "P": np.full(10, level)}
+    )
+    assert model.find_cycle(("P", 1.0))["P"] == [0, 0]
+    model.clean_cycle("P")
+    assert model.lt_offset == model.df.Date.to_numpy()[0].astype("timedelta64[ns]")
+    if level > 1:
+        assert model.df_lt.shape == (10, 2)
+        assert model.df_lt.Date.iloc[0] == pd.Timedelta(0)
+        assert model.df_lt.Date.iloc[-1] == pd.Timedelta(seconds=9)
+    else:
+        assert model.df_lt.shape == (0, 2)
@@ -10,11 +10,9 @@ import shutil
 import textwrap
 import tkinter as tk
 from ctypes import Structure, byref, sizeof, windll, wintypes
-from functools import partial
-from pathlib import Path, PureWindowsPath
+from pathlib import Path
 from typing import TYPE_CHECKING, Any, Callable
 
-import pandas as pd
 import tksvg
 import ttkbootstrap as ttk
 import ttkbootstrap.dialogs as ttk_dial
@@ -25,46 +23,14 @@ from ttkbootstrap.localization import MessageCatalog
 from ttkbootstrap.style import Bootstyle
 from ttkbootstrap.themes import user
 
+from analysis import APP_PATH, APP_VERSION
+
 if TYPE_CHECKING:
     from Test_Analysis import Controller
 
 # from tkinter import font  # ttk
 # from tkinter import messagebox
 
-APP_PATH = f"{PureWindowsPath(__file__).parent}"
-
-tab_csv = partial(pd.read_csv,
-                  sep="\t",
-                  header=0,
-                  index_col=False,
-                  skipinitialspace=False,
-                  skip_blank_lines=False,
-                  keep_default_na=True,
-                  encoding="cp1252",
-                  encoding_errors="ignore",
-                  # parse_dates=[["Date", "Time"]],
-                  # dayfirst=True,
-                  on_bad_lines="skip",
-                  engine="python",
-                  )
-comma_csv = partial(pd.read_csv,
-                    sep=',',
-                    index_col=False,
-                    skipinitialspace=True,
-                    skip_blank_lines=False,
-                    encoding="cp1252",
-                    encoding_errors="ignore",
-                    # parse_dates=[["Date", "Time"]],
-                    # dayfirst=True,
-                    # on_bad_lines='skip',
-                    engine="python"
-                    )
-excel_xlsx = partial(pd.read_excel,
-                     sheet_name=0,
-                     # parse_dates=[["Date", "Time"]],
-                     engine=None,
-                     )
-read_functions = {tab_csv, comma_csv, excel_xlsx}
 
 
 def import_user_themes():
@@ -143,6 +109,12 @@ class Menubar:
             accelerator="Ctrl+Alt+O",
             command=self.file_select_file,
         )
+        self.follow = tk.BooleanVar(value=False)
+        file_dropdown.add_checkbutton(
+            label="Follow Active File",
+            variable=self.follow,
+            command=self.file_follow,
+        )
         file_dropdown.add_separator()
         file_dropdown.add_command(
             label="Chiudi", accelerator="Ctrl+Esc", command=self.destroy
@@ -228,6 +200,23 @@ class Menubar:
                                        value=1, command=self.change_theme)
         option_dropdown.add_cascade(label="Preset", menu=preset_dropdown)
         option_dropdown.add_cascade(label="Theme", menu=theme_dropdown)
+        self.import_preset = tk.StringVar(value="")
+        self.import_dropdown = ttk.Menu(
+            option_dropdown, font=fontMenu, tearoff=0, postcommand=self.update_import_preset
+        )
+        option_dropdown.add_cascade(label="Import Preset", menu=self.import_dropdown)
+        self.compact = tk.BooleanVar(value=False)
+        option_dropdown.add_checkbutton(
+            label="Compact Import (float32/int16)",
+            variable=self.compact,
+            command=self.compact_import,
+        )
+        self.profile = tk.BooleanVar(value=False)
+        option_dropdown.add_checkbutton(
+            label="Import Profiler",
+            variable=self.profile,
+            command=self.profile_import,
+        )
         # menubar
         menubar.add_cascade(label="File", menu=file_dropdown)
         menubar.add_cascade(label="Export", menu=export_dropdown)
@@ -244,6 +233,11 @@ class Menubar:
         if self.controller:
             self.controller.select_files()
 
+    def file_follow(self):
+        """Segue il file attivo (log in scrittura)"""
+        if self.controller:
+            self.controller.follow_file(self.follow.get())
+
     def destroy(self):
         """Destroy all item"""
         for child in self.parent.winfo_children():
@@ -261,7 +255,7 @@ class Menubar:
     def show_release_notes(self):
         """Show Release Note"""
         box_title = "Note di Rilascio"
-        box_message = "Version 1.0 - ReView"
+        box_message = f"Version {APP_VERSION} - ReView"
         Messagebox.show_info(title=box_title, message=box_message)
 
     def export_distribution_click(self):
@@ -313,6 +307,35 @@ class Menubar:
         else:
             self.parent.style.theme_use("abbtheme")
 
+    def update_import_preset(self):
+        """Aggiorna la lista dei preset (preset.yaml) per l'import"""
+        self.import_dropdown.delete(0, tk.END)
+        self.import_dropdown.add_radiobutton(
+            label="All columns", value="", variable=self.import_preset,
+            command=self.import_preset_click,
+        )
+        if self.controller:
+            for preset_name in self.controller.preset_names():
+                self.import_dropdown.add_radiobutton(
+                    label=preset_name, value=preset_name, variable=self.import_preset,
+                    command=self.import_preset_click,
+                )
+
+    def import_preset_click(self):
+        """Import solo delle colonne del preset selezionato"""
+        if self.controller:
+            self.controller.import_preset(self.import_preset.get())
+
+    def compact_import(self):
+        """Import dei canali con dtype ridotto (float32/int16)"""
+        if self.controller:
+            self.controller.compact_import(self.compact.get())
+
+    def profile_import(self):
+        """Tempo e memoria di ogni fase dell'import"""
+        if self.controller:
+            self.controller.profile_import(self.profile.get())
+
     def select_th_preset(self):
         if self.controller:
             self.controller.select_preset()